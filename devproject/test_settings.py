@@ -27,6 +27,11 @@ MISAGO_NEW_REGISTRATIONS_VALIDATORS = ("misago.users.validators.validate_gmail_e
 # Store mails in memory
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
+# Send notifications, update usernames and categories trees during request
+MISAGO_DEFER_NOTIFICATIONS = False
+MISAGO_DEFER_USERNAME_CHANGES = False
+MISAGO_DEFER_CATEGORIES_TREES_UPDATES = False
+
 # Use MD5 password hashing to speed up test suite
 PASSWORD_HASHERS = ("django.contrib.auth.hashers.MD5PasswordHasher",)
 
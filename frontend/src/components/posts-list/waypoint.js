@@ -5,6 +5,63 @@ import ajax from "misago/services/ajax"
 import snackbar from "misago/services/snackbar"
 import store from "misago/services/store"
 
+const READ_FLUSH_DELAY = 2000
+
+let readQueue = null
+
+// Coalesce posts read in short succession into single API call
+export function queueRead(readThread, readPost) {
+  if (readQueue && readQueue.thread.id !== readThread.id) {
+    flushReads()
+  }
+
+  if (!readQueue) {
+    readQueue = {
+      thread: readThread,
+      posts: [],
+      timeout: window.setTimeout(flushReads, READ_FLUSH_DELAY)
+    }
+  }
+
+  readQueue.posts.push(readPost.id)
+}
+
+export function flushReads(isPageHidden = false) {
+  if (!readQueue) return
+
+  const { thread: readThread, posts, timeout } = readQueue
+  window.clearTimeout(timeout)
+  readQueue = null
+
+  // page is going away, so there's nothing to update with API's response
+  if (isPageHidden && sendReadsBeacon(readThread, posts)) return
+
+  ajax.post(readThread.api.posts.read, { posts }).then(
+    data => {
+      store.dispatch(
+        thread.update(readThread, {
+          is_read: data.thread_is_read
+        })
+      )
+    },
+    rejection => {
+      snackbar.apiError(rejection)
+    }
+  )
+}
+
+// Beacon is sent even if page is unloaded before request completes
+function sendReadsBeacon(readThread, posts) {
+  if (!navigator.sendBeacon || !window.FormData) return false
+
+  const data = new FormData()
+  data.append("csrfmiddlewaretoken", ajax.getCsrfToken())
+  posts.forEach(id => data.append("posts", id))
+  return navigator.sendBeacon(readThread.api.posts.read, data)
+}
+
+window.addEventListener("pagehide", () => flushReads(true))
+
 export default class extends React.Component {
   /*
   Super naive and de-facto placeholder implementation for reading posts on scroll
@@ -34,25 +91,18 @@ export default class extends React.Component {
             })
           )
 
-          // call API to let it know we have unread post
-          ajax.post(this.props.post.api.read).then(
-            data => {
-              store.dispatch(
-                thread.update(this.props.thread, {
-                  is_read: data.thread_is_read
-                })
-              )
-            },
-            rejection => {
-              snackbar.apiError(rejection)
-            }
-          )
+          // queue post to be sent to API with other posts read in meantime
+          queueRead(this.props.thread, this.props.post)
         }, 1000)
       },
       offset: "bottom-in-view"
     })
   }
 
+  componentWillUnmount() {
+    flushReads()
+  }
+
   render() {
     return (
       <div
@@ -1,3 +1,15 @@
+import json
+from threading import Lock
+
+# Sums of roles permissions are memoized by roles and their permissions, so
+# they are reused by ACL builds for other roles sets and after ACL cache is
+# invalidated, as long as roles permissions haven't changed
+SUMS_MEMO_SIZE = 10000
+
+_sums_lock = Lock()
+_sums = {}
+
+
 def _roles_acls(key_name, roles):
     acls = []
     for role in roles:
@@ -39,6 +51,40 @@ def sum_acls(result_acl, acls=None, roles=None, key=None, **permissions):
     return result_acl
 
 
+def sum_roles_acls(default_acl, roles, key, **permissions):
+    """Returns new dict with roles permissions summed like sum_acls does
+
+    Result is memoized for default ACL, permissions of roles and comparisons,
+    so it's computed only once for all categories that have same roles.
+    """
+    memo_key = (
+        key,
+        tuple(sorted(default_acl.items())),
+        tuple(_role_key(role, key) for role in roles),
+        tuple(permissions.items()),
+    )
+
+    with _sums_lock:
+        result_acl = _sums.get(memo_key)
+    if result_acl is None:
+        result_acl = sum_acls(default_acl.copy(), roles=roles, key=key, **permissions)
+        with _sums_lock:
+            if len(_sums) >= SUMS_MEMO_SIZE:
+                _sums.clear()
+            _sums[memo_key] = result_acl
+
+    return result_acl.copy()
+
+
+def _role_key(role, key_name):
+    return (role.pk, json.dumps(role.permissions.get(key_name), sort_keys=True))
+
+
+def clear_sums_memo():
+    with _sums_lock:
+        _sums.clear()
+
+
 # Common comparisions
 def greater(a, b):
     return a if a > b else b
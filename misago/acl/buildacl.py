@@ -1,15 +1,31 @@
+from threading import local
+
 from .providers import providers
 
+_build = local()
+
 
 def build_acl(roles):
     """build ACL for given roles"""
     acl = {}
 
-    for extension, module in providers.list():
-        try:
-            acl = module.build_acl(acl, roles, extension)
-        except AttributeError:
-            message = "%s has to define build_acl function" % extension
-            raise AttributeError(message)
+    _build.memo = {}
+    try:
+        for extension, module in providers.list():
+            try:
+                acl = module.build_acl(acl, roles, extension)
+            except AttributeError:
+                message = "%s has to define build_acl function" % extension
+                raise AttributeError(message)
+    finally:
+        _build.memo = None
 
     return acl
+
+
+def get_build_memo():
+    """Returns dict that providers can use to share data during ACL build"""
+    memo = getattr(_build, "memo", None)
+    if memo is None:
+        return {}
+    return memo
@@ -14,6 +14,16 @@ def set_acl_cache(user, cache_versions, user_acl):
     cache.set(key, user_acl)
 
 
+def acquire_build_lock(user, cache_versions, timeout):
+    key = "%s_lock" % get_cache_key(user, cache_versions)
+    return cache.add(key, True, timeout)
+
+
+def release_build_lock(user, cache_versions):
+    key = "%s_lock" % get_cache_key(user, cache_versions)
+    cache.delete(key)
+
+
 def get_cache_key(user, cache_versions):
     return "acl_%s_%s" % (user.acl_key, cache_versions[ACL_CACHE])
 
@@ -0,0 +1,116 @@
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from ... import ACL_CACHE
+from ...buildacl import build_acl
+from ...cache import get_acl_cache, set_acl_cache
+from ...useracl import (
+    clear_roles_acls,
+    get_user_acl,
+    serialize_acl,
+    serialize_user_acl,
+)
+from ....users.models import AnonymousUser
+
+BENCHMARK_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmarks getting and serializing user's ACL"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "categories",
+            help="number of categories in ACL",
+            nargs="?",
+            type=int,
+            default=500,
+        )
+        parser.add_argument(
+            "--requests", help="number of requests to simulate", type=int, default=1000
+        )
+
+    def handle(self, *args, **options):
+        user = SimpleNamespace(
+            id=1,
+            acl_key="benchmark",
+            is_authenticated=True,
+            is_anonymous=False,
+            is_staff=False,
+            is_superuser=False,
+        )
+        cache_versions = {ACL_CACHE: "benchmark"}
+        requests = range(options["requests"])
+
+        with override_settings(CACHES=BENCHMARK_CACHES):
+            set_acl_cache(
+                user, cache_versions, get_benchmark_acl(options["categories"])
+            )
+            clear_roles_acls()
+
+            self.stdout.write(
+                "Getting ACL with %s categories...\n" % options["categories"]
+            )
+
+            start_time = time.perf_counter()
+            for _ in requests:
+                get_user_acl_from_cache(user, cache_versions)
+            cache_time = (time.perf_counter() - start_time) / len(requests)
+            self.stdout.write("Shared cache: %.4f ms/request" % (cache_time * 1000))
+
+            start_time = time.perf_counter()
+            for _ in requests:
+                get_user_acl(user, cache_versions)
+            memory_time = (time.perf_counter() - start_time) / len(requests)
+            self.stdout.write("Process memory: %.4f ms/request" % (memory_time * 1000))
+            self.stdout.write("Speedup: %.2fx\n" % (cache_time / memory_time))
+
+            self.stdout.write("Serializing ACL...\n")
+            user_acl = get_user_acl(user, cache_versions)
+
+            start_time = time.perf_counter()
+            for _ in requests:
+                serialize_acl(user_acl)
+            copy_time = (time.perf_counter() - start_time) / len(requests)
+            self.stdout.write("Unmemoized: %.4f ms/request" % (copy_time * 1000))
+
+            start_time = time.perf_counter()
+            for _ in requests:
+                serialize_user_acl(user_acl)
+            memoized_time = (time.perf_counter() - start_time) / len(requests)
+            self.stdout.write("Memoized: %.4f ms/request" % (memoized_time * 1000))
+            self.stdout.write("Speedup: %.2fx" % (copy_time / memoized_time))
+
+            clear_roles_acls()
+
+
+def get_benchmark_acl(categories):
+    """Returns anonymous user's ACL with its category permissions repeated"""
+    acl = build_acl(AnonymousUser().get_roles())
+    category_acl = next(iter(acl["categories"].values()), {"can_see": 1})
+    category_acl = dict(category_acl, can_see=1, can_browse=1)
+
+    categories_ids = list(range(1, categories + 1))
+    acl["categories"] = {
+        category_id: category_acl.copy() for category_id in categories_ids
+    }
+    acl["visible_categories"] = categories_ids
+    acl["browseable_categories"] = categories_ids
+    return acl
+
+
+def get_user_acl_from_cache(user, cache_versions):
+    """Gets user's ACL like getter did before ACLs were kept in process memory"""
+    user_acl = get_acl_cache(user, cache_versions)
+    user_acl["user_id"] = user.id
+    user_acl["is_authenticated"] = bool(user.is_authenticated)
+    user_acl["is_anonymous"] = bool(user.is_anonymous)
+    user_acl["is_staff"] = user.is_staff
+    user_acl["is_superuser"] = user.is_superuser
+    user_acl["cache_versions"] = cache_versions.copy()
+    return user_acl
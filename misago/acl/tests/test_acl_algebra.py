@@ -74,3 +74,62 @@ def test_acls_are_be_added_together():
     assert acl["max_speed"] == 80
     assert acl["min_age"] == 16
     assert acl["speed_limit"] == 0
+
+
+class Role:
+    def __init__(self, pk, permissions):
+        self.pk = pk
+        self.permissions = {"test": permissions}
+
+
+def test_roles_acls_are_summed():
+    roles = [Role(1, {"can_see": 1, "max_speed": 10}), Role(2, {"max_speed": 40})]
+    acl = algebra.sum_roles_acls(
+        {"can_see": 0, "max_speed": 30},
+        roles=roles,
+        key="test",
+        can_see=algebra.greater,
+        max_speed=algebra.greater,
+    )
+
+    assert acl == {"can_see": 1, "max_speed": 40}
+
+
+def test_roles_acls_sum_is_memoized_for_same_roles_permissions(mocker):
+    sum_acls = mocker.spy(algebra, "sum_acls")
+    algebra.clear_sums_memo()
+
+    for _ in range(3):
+        acl = algebra.sum_roles_acls(
+            {"can_see": 0},
+            roles=[Role(1, {"can_see": 1})],
+            key="test",
+            can_see=algebra.greater,
+        )
+        acl["can_see"] = "modified"
+
+    sum_acls.assert_called_once()
+    assert algebra.sum_roles_acls(
+        {"can_see": 0},
+        roles=[Role(1, {"can_see": 1})],
+        key="test",
+        can_see=algebra.greater,
+    ) == {"can_see": 1}
+
+
+def test_roles_acls_sum_is_not_reused_when_roles_permissions_change():
+    acl = algebra.sum_roles_acls(
+        {"can_see": 0},
+        roles=[Role(1, {"can_see": 1})],
+        key="test",
+        can_see=algebra.greater,
+    )
+    assert acl["can_see"] == 1
+
+    acl = algebra.sum_roles_acls(
+        {"can_see": 0},
+        roles=[Role(1, {"can_see": 0})],
+        key="test",
+        can_see=algebra.greater,
+    )
+    assert acl["can_see"] == 0
@@ -0,0 +1,15 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from ..management.commands import benchmarkacl
+
+
+def test_command_benchmarks_getting_and_serializing_acl(db):
+    out = StringIO()
+    call_command(benchmarkacl.Command(), "10", requests=5, stdout=out)
+    command_output = out.getvalue()
+
+    assert "Getting ACL with 10 categories" in command_output
+    assert "Serializing ACL" in command_output
+    assert command_output.count("Speedup:") == 2
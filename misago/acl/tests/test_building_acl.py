@@ -0,0 +1,61 @@
+from ..buildacl import build_acl, get_build_memo
+from ..useracl import build_roles_acl
+
+
+def test_build_memo_is_available_only_during_build(mocker, user):
+    memos = []
+
+    def build_provider_acl(acl, roles, key_name):
+        memo = get_build_memo()
+        memo["test"] = True
+        memos.append(memo)
+        return acl
+
+    provider = mocker.Mock(build_acl=build_provider_acl)
+    mocker.patch(
+        "misago.acl.buildacl.providers.list",
+        return_value=[("first", provider), ("second", provider)],
+    )
+
+    build_acl(user.get_roles())
+    assert memos[0] is memos[1]
+    assert get_build_memo() == {}
+
+
+def test_categories_are_queried_once_during_build(django_assert_num_queries, user):
+    roles = list(user.get_roles())
+    build_acl(roles)  # warm up memoized sums of roles permissions
+
+    # one query for each of categories, categories roles and private threads
+    # category, run once by categories, threads and best answers providers
+    with django_assert_num_queries(4):
+        build_acl(roles)
+
+
+def test_only_one_process_builds_acl_for_roles(mocker, cache_versions, user):
+    mocker.patch("misago.acl.useracl.acquire_build_lock", return_value=False)
+    mocker.patch("misago.acl.useracl.sleep")
+    mocker.patch("misago.acl.useracl.get_acl_cache", side_effect=[None, {"built": 1}])
+    build = mocker.patch("misago.acl.buildacl.build_acl")
+
+    assert build_roles_acl(user, cache_versions) == {"built": 1}
+    build.assert_not_called()
+
+
+def test_acl_is_built_if_other_process_didnt_build_it_in_time(
+    mocker, cache_versions, user
+):
+    mocker.patch("misago.acl.useracl.acquire_build_lock", return_value=False)
+    mocker.patch("misago.acl.useracl.BUILD_WAIT_TIMEOUT", 0)
+    release_lock = mocker.patch("misago.acl.useracl.release_build_lock")
+    build = mocker.patch("misago.acl.buildacl.build_acl", return_value={"built": 1})
+
+    assert build_roles_acl(user, cache_versions) == {"built": 1}
+    build.assert_called_once()
+    release_lock.assert_not_called()
+
+
+def test_build_lock_is_released_after_acl_is_built(mocker, cache_versions, user):
+    release_lock = mocker.patch("misago.acl.useracl.release_build_lock")
+    build_roles_acl(user, cache_versions)
+    release_lock.assert_called_once()
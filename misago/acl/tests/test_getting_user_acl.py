@@ -1,3 +1,6 @@
+import pytest
+from django.test import override_settings
+
 from ..useracl import get_user_acl
 
 
@@ -102,3 +105,74 @@ def test_getter_is_not_setting_new_cache_if_cache_is_set(
 
     get_user_acl(anonymous_user, cache_versions)
     cache_set.assert_not_called()
+
+
+def test_getter_keeps_acl_in_process_memory(mocker, db, cache_versions, user):
+    cache_get = mocker.patch("django.core.cache.cache.get", return_value=dict())
+    get_user_acl(user, cache_versions)
+    get_user_acl(user, cache_versions)
+    cache_get.assert_called_once()
+
+
+def test_getter_shares_acl_in_process_memory_between_users_with_same_roles(
+    mocker, cache_versions, user, other_user
+):
+    cache_get = mocker.patch("django.core.cache.cache.get", return_value=dict())
+    user_acl = get_user_acl(user, cache_versions)
+    other_user_acl = get_user_acl(other_user, cache_versions)
+    cache_get.assert_called_once()
+
+    assert user_acl["user_id"] == user.id
+    assert other_user_acl["user_id"] == other_user.id
+
+
+def test_getter_gets_acl_from_cache_when_acl_cache_version_changes(
+    mocker, db, cache_versions, user
+):
+    cache_get = mocker.patch("django.core.cache.cache.get", return_value=dict())
+    get_user_acl(user, cache_versions)
+    get_user_acl(user, dict(cache_versions, acl="changed"))
+    assert cache_get.call_count == 2
+
+
+@override_settings(MISAGO_ACL_CACHE_SIZE=1)
+def test_getter_removes_least_recently_used_acl_from_process_memory(
+    mocker, cache_versions, user, superuser
+):
+    cache_get = mocker.patch("django.core.cache.cache.get", return_value=dict())
+    get_user_acl(user, cache_versions)
+    get_user_acl(superuser, cache_versions)
+    get_user_acl(user, cache_versions)
+    assert cache_get.call_count == 3
+
+
+@override_settings(MISAGO_ACL_CACHE_SIZE=0)
+def test_getter_doesnt_keep_acl_in_process_memory_if_its_disabled(
+    mocker, db, cache_versions, user
+):
+    cache_get = mocker.patch("django.core.cache.cache.get", return_value=dict())
+    get_user_acl(user, cache_versions)
+    get_user_acl(user, cache_versions)
+    assert cache_get.call_count == 2
+
+
+def test_user_acl_permissions_are_frozen(cache_versions, user, other_user):
+    acl = get_user_acl(user, cache_versions)
+    category_id = acl["visible_categories"][0]
+
+    with pytest.raises(TypeError):
+        acl["categories"][category_id]["can_browse"] = 0
+    with pytest.raises(AttributeError):
+        acl["visible_categories"].append(0)
+
+    other_user_acl = get_user_acl(other_user, cache_versions)
+    assert other_user_acl["categories"][category_id]["can_browse"]
+    assert 0 not in other_user_acl["visible_categories"]
+
+
+def test_user_acl_permissions_can_be_replaced(cache_versions, user, other_user):
+    acl = get_user_acl(user, cache_versions)
+    acl["visible_categories"] = []
+
+    other_user_acl = get_user_acl(other_user, cache_versions)
+    assert other_user_acl["visible_categories"]
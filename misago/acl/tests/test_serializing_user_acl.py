@@ -1,5 +1,6 @@
 import json
 
+from .. import useracl
 from ..useracl import get_user_acl, serialize_user_acl
 
 
@@ -12,3 +13,30 @@ def test_user_acl_is_json_serializeable(cache_versions, user):
     acl = get_user_acl(user, cache_versions)
     serialized_acl = serialize_user_acl(acl)
     assert json.dumps(serialized_acl)
+
+
+def test_serialized_user_acl_is_memoized(mocker, cache_versions, user):
+    acl = get_user_acl(user, cache_versions)
+    thaw_acl = mocker.spy(useracl, "thaw_acl")
+    assert serialize_user_acl(acl) == serialize_user_acl(acl)
+    thaw_acl.assert_called_once_with(useracl.get_unmodified_roles_acl(acl).acl)
+
+
+def test_memoized_serialized_acl_includes_user_specific_keys(
+    cache_versions, user, other_user
+):
+    user_acl = serialize_user_acl(get_user_acl(user, cache_versions))
+    other_user_acl = serialize_user_acl(get_user_acl(other_user, cache_versions))
+
+    assert user_acl["user_id"] == user.id
+    assert other_user_acl["user_id"] == other_user.id
+    assert "cache_versions" not in other_user_acl
+    assert "acl_key" not in other_user_acl
+
+
+def test_modified_user_acl_is_not_memoized(cache_versions, user):
+    acl = get_user_acl(user, cache_versions)
+    serialize_user_acl(acl)
+
+    acl["can_rename_users"] = "modified"
+    assert serialize_user_acl(acl)["can_rename_users"] == "modified"
@@ -1,15 +1,61 @@
-import copy
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic, sleep
+from types import MappingProxyType
 
-from . import buildacl
-from .cache import get_acl_cache, set_acl_cache
+from ..conf import settings
+from . import ACL_CACHE, buildacl
+from .cache import (
+    acquire_build_lock,
+    get_acl_cache,
+    release_build_lock,
+    set_acl_cache,
+)
 from .providers import providers
 
+# Keys set on every user's ACL that are not part of ACL built from user's roles
+USER_ACL_KEYS = (
+    "acl_key",
+    "user_id",
+    "is_authenticated",
+    "is_anonymous",
+    "is_staff",
+    "is_superuser",
+    "cache_versions",
+)
+
+# How long (in seconds) process waits for ACL built by other process
+BUILD_WAIT_TIMEOUT = 10
+BUILD_WAIT_INTERVAL = 0.05
+
+_lock = Lock()
+_roles_acls = OrderedDict()
+
+
+class RolesACL:
+    """ACL built for roles set, shared by all users with same acl_key.
+
+    It's kept in process memory and frozen, so attempts to mutate it raise
+    errors instead of changing other users permissions. Its serialized
+    version is computed on first use and reused after that, and memo dict can
+    be used to keep other values computed from it.
+    """
+
+    __slots__ = ("acl", "serialized", "memo")
+
+    def __init__(self, acl):
+        self.acl = freeze_acl(acl)
+        self.serialized = None
+        self.memo = {}
+
 
 def get_user_acl(user, cache_versions):
-    user_acl = get_acl_cache(user, cache_versions)
-    if user_acl is None:
-        user_acl = buildacl.build_acl(user.get_roles())
-        set_acl_cache(user, cache_versions, user_acl)
+    roles_acl = get_roles_acl(user, cache_versions)
+
+    # Shallow copy shares frozen permissions with other users, only
+    # user-specific keys are set on it
+    user_acl = roles_acl.acl.copy()
+    user_acl["acl_key"] = user.acl_key
     user_acl["user_id"] = user.id
     user_acl["is_authenticated"] = bool(user.is_authenticated)
     user_acl["is_anonymous"] = bool(user.is_anonymous)
@@ -19,12 +65,137 @@ def get_user_acl(user, cache_versions):
     return user_acl
 
 
+def get_roles_acl(user, cache_versions):
+    key = (user.acl_key, cache_versions[ACL_CACHE])
+
+    with _lock:
+        roles_acl = _roles_acls.get(key)
+        if roles_acl:
+            _roles_acls.move_to_end(key)
+            return roles_acl
+
+    acl = get_acl_cache(user, cache_versions)
+    if acl is None:
+        acl = build_roles_acl(user, cache_versions)
+
+    roles_acl = RolesACL(acl)
+    cache_size = settings.MISAGO_ACL_CACHE_SIZE
+    if cache_size:
+        with _lock:
+            _roles_acls[key] = roles_acl
+            while len(_roles_acls) > cache_size:
+                _roles_acls.popitem(last=False)
+
+    return roles_acl
+
+
+def build_roles_acl(user, cache_versions):
+    """Builds ACL for user's roles, or waits for other process that builds it
+
+    Only one process builds ACL for same roles after ACL cache is invalidated,
+    others wait for its result to appear in cache instead of building it too.
+    """
+    lock_acquired = acquire_build_lock(user, cache_versions, BUILD_WAIT_TIMEOUT)
+    if not lock_acquired:
+        wait_until = monotonic() + BUILD_WAIT_TIMEOUT
+        while monotonic() < wait_until:
+            sleep(BUILD_WAIT_INTERVAL)
+            acl = get_acl_cache(user, cache_versions)
+            if acl is not None:
+                return acl
+
+    try:
+        acl = buildacl.build_acl(user.get_roles())
+        set_acl_cache(user, cache_versions, acl)
+    finally:
+        if lock_acquired:
+            release_build_lock(user, cache_versions)
+
+    return acl
+
+
+def clear_roles_acls():
+    with _lock:
+        _roles_acls.clear()
+
+
+def get_user_acl_memo(user_acl):
+    """Returns dict for values computed from ACL shared by users with same roles
+
+    If user's ACL was modified after it was got, new dict is returned every time.
+    """
+    roles_acl = get_unmodified_roles_acl(user_acl)
+    if roles_acl:
+        return roles_acl.memo
+    return {}
+
+
 def serialize_user_acl(user_acl):
     """serialize authenticated user's ACL"""
-    serialized_acl = copy.deepcopy(user_acl)
-    serialized_acl.pop("cache_versions")
+    roles_acl = get_unmodified_roles_acl(user_acl)
+    if not roles_acl:
+        return serialize_acl(user_acl)
+
+    if roles_acl.serialized is None:
+        roles_acl.serialized = serialize_acl(roles_acl.acl)
+
+    serialized_acl = roles_acl.serialized.copy()
+    for key in USER_ACL_KEYS:
+        if key in user_acl:
+            serialized_acl[key] = user_acl[key]
+    serialized_acl.pop("cache_versions", None)
+    serialized_acl.pop("acl_key", None)
+    return serialized_acl
+
+
+def serialize_acl(user_acl):
+    serialized_acl = thaw_acl(user_acl)
+    serialized_acl.pop("cache_versions", None)
+    serialized_acl.pop("acl_key", None)
 
     for serializer in providers.get_user_acl_serializers():
         serializer(serialized_acl)
 
     return serialized_acl
+
+
+def freeze_acl(value):
+    """Returns copy of ACL with dicts, lists and sets replaced by read-only types"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: freeze_acl(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_acl(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def thaw_acl(value):
+    """Returns mutable copy of (frozen) ACL"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: thaw_acl(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw_acl(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return set(value)
+    return value
+
+
+def get_unmodified_roles_acl(user_acl):
+    """Returns shared roles ACL if user's ACL wasn't modified after it was got"""
+    cache_versions = user_acl.get("cache_versions")
+    if not cache_versions:
+        return None
+
+    key = (user_acl.get("acl_key"), cache_versions.get(ACL_CACHE))
+    with _lock:
+        roles_acl = _roles_acls.get(key)
+
+    if not roles_acl or len(user_acl) != len(roles_acl.acl) + len(USER_ACL_KEYS):
+        return None
+
+    for name, value in roles_acl.acl.items():
+        if user_acl.get(name) is not value:
+            return None
+
+    return roles_acl
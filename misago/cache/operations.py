@@ -1,5 +1,7 @@
 from django.db.migrations import RunPython
 
+from .versions import bump_cache_versions_generation
+
 
 class StartCacheVersioning(RunPython):
     def __init__(self, cache):
@@ -19,6 +21,7 @@ def start_cache_versioning(cache):
     def migration_operation(apps, _):
         CacheVersion = apps.get_model("misago_cache", "CacheVersion")
         CacheVersion.objects.create(cache=cache)
+        bump_cache_versions_generation()
 
     return migration_operation
 
@@ -27,5 +30,6 @@ def stop_cache_versioning(cache):
     def migration_operation(apps, _):
         CacheVersion = apps.get_model("misago_cache", "CacheVersion")
         CacheVersion.objects.filter(cache=cache).delete()
+        bump_cache_versions_generation()
 
     return migration_operation
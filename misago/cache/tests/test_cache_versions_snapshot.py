@@ -0,0 +1,112 @@
+from time import monotonic
+
+from django.db import transaction
+from django.test import override_settings
+
+from ..models import CacheVersion
+from ..versions import (
+    bump_cache_versions_generation,
+    get_cache_versions,
+    get_cache_versions_stats,
+    invalidate_cache,
+    reset_cache_versions_stats,
+)
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_cache_versions_are_reused_within_ttl(cache_version, django_assert_num_queries):
+    get_cache_versions()
+    with django_assert_num_queries(0):
+        assert get_cache_versions()[cache_version.cache] == cache_version.version
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=0)
+def test_cache_versions_are_read_from_db_if_ttl_is_disabled(
+    cache_version, django_assert_num_queries
+):
+    get_cache_versions()
+    with django_assert_num_queries(1):
+        get_cache_versions()
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_invalidating_cache_clears_cache_versions_snapshot(cache_version):
+    get_cache_versions()
+    invalidate_cache(cache_version.cache)
+    assert get_cache_versions()[cache_version.cache] != cache_version.version
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_cache_versions_are_not_reused_in_transaction_that_invalidated_cache(
+    cache_version, django_assert_num_queries
+):
+    invalidate_cache(cache_version.cache)
+    get_cache_versions()
+    with django_assert_num_queries(1):
+        get_cache_versions()
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_cache_versions_read_in_rolled_back_transaction_are_not_reused(cache_version):
+    try:
+        with transaction.atomic():
+            invalidate_cache(cache_version.cache)
+            assert get_cache_versions()[cache_version.cache] != cache_version.version
+            raise ValueError()
+    except ValueError:
+        pass
+
+    assert get_cache_versions()[cache_version.cache] == cache_version.version
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_bumping_generation_clears_cache_versions_snapshot(cache_version):
+    get_cache_versions()
+    CacheVersion.objects.filter(cache=cache_version.cache).update(version="changed")
+    bump_cache_versions_generation()
+    assert get_cache_versions()[cache_version.cache] == "changed"
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_cache_versions_stats_count_hits_and_misses(cache_version):
+    reset_cache_versions_stats()
+    get_cache_versions()
+    get_cache_versions()
+    get_cache_versions()
+    assert get_cache_versions_stats() == {"hits": 2, "misses": 1}
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_returned_cache_versions_can_be_mutated_safely(cache_version):
+    get_cache_versions()[cache_version.cache] = "changed"
+    assert get_cache_versions()[cache_version.cache] == cache_version.version
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_expired_snapshot_is_reused_if_generation_is_unchanged(
+    mocker, cache_version, django_assert_num_queries
+):
+    mocker.patch(
+        "misago.cache.versions.get_cache_versions_generation",
+        return_value="generation",
+    )
+    get_cache_versions()
+
+    mocker.patch("misago.cache.versions.monotonic", return_value=monotonic() + 120)
+    with django_assert_num_queries(0):
+        get_cache_versions()
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=60)
+def test_expired_snapshot_is_reloaded_if_generation_has_changed(
+    mocker, cache_version, django_assert_num_queries
+):
+    mocker.patch(
+        "misago.cache.versions.get_cache_versions_generation",
+        side_effect=["generation", "new-generation"],
+    )
+    get_cache_versions()
+
+    mocker.patch("misago.cache.versions.monotonic", return_value=monotonic() + 120)
+    with django_assert_num_queries(1):
+        get_cache_versions()
@@ -1,20 +1,131 @@
+from threading import Lock
+from time import monotonic
+
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from ..conf import settings
 from .models import CacheVersion
 from .utils import generate_version_string
 
+GENERATION_CACHE_KEY = "misago_cache_versions_generation"
+
+_lock = Lock()
+_snapshot = None
+_stats = {"hits": 0, "misses": 0}
+
+
+class CacheVersionsSnapshot:
+    __slots__ = ("versions", "generation", "checked_at")
+
+    def __init__(self, versions, generation):
+        self.versions = versions
+        self.generation = generation
+        self.checked_at = monotonic()
+
+    def is_fresh(self, ttl):
+        return monotonic() - self.checked_at < ttl
+
 
 def get_cache_versions():
+    """Returns dict of cache versions.
+
+    Versions are kept in process-local snapshot that is trusted for
+    MISAGO_CACHE_VERSIONS_TTL seconds. After that time snapshot's generation is
+    compared with one stored in shared cache, and versions are only reloaded
+    from database if it has changed.
+
+    Snapshot is bypassed in transaction that has invalidated caches, because
+    versions it reads may still be rolled back.
+    """
+    global _snapshot  # pylint: disable=global-statement
+
+    ttl = settings.MISAGO_CACHE_VERSIONS_TTL
+    if not ttl or is_cache_invalidation_pending():
+        _stats["misses"] += 1
+        return get_cache_versions_from_db()
+
+    snapshot = _snapshot
+    if snapshot and snapshot.is_fresh(ttl):
+        _stats["hits"] += 1
+        return snapshot.versions.copy()
+
+    with _lock:
+        if _snapshot is not snapshot and _snapshot and _snapshot.is_fresh(ttl):
+            # Other thread has refreshed the snapshot while we were waiting
+            _stats["hits"] += 1
+            return _snapshot.versions.copy()
+
+        generation = get_cache_versions_generation()
+        if snapshot and generation and snapshot.generation == generation:
+            _stats["hits"] += 1
+            _snapshot = CacheVersionsSnapshot(snapshot.versions, generation)
+            return snapshot.versions.copy()
+
+        _stats["misses"] += 1
+        versions = get_cache_versions_from_db()
+        _snapshot = CacheVersionsSnapshot(versions, generation)
+        return versions.copy()
+
+
+def get_cache_versions_from_db():
     queryset = CacheVersion.objects.all()
     return {i.cache: i.version for i in queryset}
 
 
+def get_cache_versions_generation():
+    generation = cache.get(GENERATION_CACHE_KEY)
+    if generation:
+        return generation
+
+    cache.add(GENERATION_CACHE_KEY, generate_version_string(), None)
+    return cache.get(GENERATION_CACHE_KEY)
+
+
+def bump_cache_versions_generation():
+    cache.set(GENERATION_CACHE_KEY, generate_version_string(), None)
+    clear_cache_versions_snapshot()
+
+
+def is_cache_invalidation_pending():
+    # Generation bump is dropped from callbacks if transaction is rolled back
+    return connection.in_atomic_block and any(
+        func is bump_cache_versions_generation for _, func in connection.run_on_commit
+    )
+
+
+def clear_cache_versions_snapshot():
+    global _snapshot  # pylint: disable=global-statement
+    _snapshot = None
+
+
+def get_cache_versions_stats():
+    return _stats.copy()
+
+
+def reset_cache_versions_stats():
+    _stats["hits"] = 0
+    _stats["misses"] = 0
+
+
 def invalidate_cache(cache_name):
     CacheVersion.objects.filter(cache=cache_name).update(
         version=generate_version_string()
     )
+    handle_cache_invalidation()
 
 
 def invalidate_all_caches():
-    for cache_name in get_cache_versions().keys():
+    for cache_name in get_cache_versions_from_db().keys():
         CacheVersion.objects.filter(cache=cache_name).update(
             version=generate_version_string()
         )
+    handle_cache_invalidation()
+
+
+def handle_cache_invalidation():
+    # Current process should see new versions right away, but other processes
+    # are notified about them only after transaction commits, so they don't
+    # reload old versions under new generation
+    clear_cache_versions_snapshot()
+    transaction.on_commit(bump_cache_versions_generation)
@@ -1,9 +1,6 @@
-from datetime import timedelta
-
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 
-from ...models import Category
+from ...prune import PRUNE_BATCH_SIZE, prune_categories
 
 
 class Command(BaseCommand):
@@ -14,46 +11,39 @@ class Command(BaseCommand):
 
     help = "Prunes categories"
 
-    def handle(self, *args, **options):  # pylint: disable=too-many-branches
-        now = timezone.now()
-        synchronize_categories = []
-
-        for category in Category.objects.iterator():
-            archive = category.archive_pruned_in
-            pruned_threads = 0
-
-            threads_qs = category.thread_set.filter(weight=0)
-
-            if category.prune_started_after:
-                cutoff = now - timedelta(days=category.prune_started_after)
-                prune_qs = threads_qs.filter(started_on__lte=cutoff)
-                for thread in prune_qs.iterator():
-                    if archive:
-                        thread.move(archive)
-                        thread.save()
-                    else:
-                        thread.delete()
-                    pruned_threads += 1
-
-            if category.prune_replied_after:
-                cutoff = now - timedelta(days=category.prune_replied_after)
-                prune_qs = threads_qs.filter(last_post_on__lte=cutoff)
-                for thread in prune_qs.iterator():
-                    if archive:
-                        thread.move(archive)
-                        thread.save()
-                    else:
-                        thread.delete()
-                    pruned_threads += 1
-
-            if pruned_threads:
-                if category not in synchronize_categories:
-                    synchronize_categories.append(category)
-                if archive and archive not in synchronize_categories:
-                    synchronize_categories.append(archive)
-
-        for category in synchronize_categories:
-            category.synchronize()
-            category.save()
-
-        self.stdout.write("\n\nCategories were pruned")
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=PRUNE_BATCH_SIZE,
+            help="Number of threads moved or deleted in single transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            default=False,
+            help="Reports numbers of threads to prune without pruning them.",
+        )
+
+    def handle(self, *args, **options):
+        pruned_categories = prune_categories(
+            batch_size=options["batch_size"], dry_run=options["dry_run"]
+        )
+
+        if options["dry_run"]:
+            for category, pruned_threads in pruned_categories:
+                if category.archive_pruned_in:
+                    self.stdout.write(
+                        "%s: %s threads would be moved to %s"
+                        % (category, pruned_threads, category.archive_pruned_in)
+                    )
+                else:
+                    self.stdout.write(
+                        "%s: %s threads would be deleted" % (category, pruned_threads)
+                    )
+
+            self.stdout.write("\n\nCategories were not pruned (dry run)")
+        else:
+            self.stdout.write("\n\nCategories were pruned")
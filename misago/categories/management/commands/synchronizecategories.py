@@ -4,6 +4,9 @@ from django.core.management.base import BaseCommand
 
 from ....core.management.progressbar import show_progress
 from ...models import Category
+from ...synchronize import synchronize_categories
+
+BATCH_SIZE = 100
 
 
 class Command(BaseCommand):
@@ -21,11 +24,12 @@ class Command(BaseCommand):
 
         synchronized_count = 0
         show_progress(self, synchronized_count, categories_to_sync)
-        for category in Category.objects.iterator():
-            category.synchronize()
-            category.save()
 
-            synchronized_count += 1
+        categories = list(Category.objects.order_by("id"))
+        for i in range(0, len(categories), BATCH_SIZE):
+            batch = synchronize_categories(categories[i : i + BATCH_SIZE])
+
+            synchronized_count += len(batch)
             show_progress(self, synchronized_count, categories_to_sync)
 
         end_time = time.time() - start_time
@@ -0,0 +1,86 @@
+# Generated by Django 2.2.12 on 2026-10-18 19:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from ..subtrees import TREE_FIELDS, aggregate_categories_trees, set_tree_stats
+
+
+def update_categories_trees(apps, _):
+    Category = apps.get_model("misago_categories", "Category")
+    for tree_id in Category.objects.values_list("tree_id", flat=True).distinct():
+        categories = list(Category.objects.filter(tree_id=tree_id).order_by("lft"))
+        for category, tree_stats in aggregate_categories_trees(categories):
+            set_tree_stats(category, tree_stats)
+        Category.objects.bulk_update(categories, TREE_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("misago_threads", "0012_set_dj_partial_indexes"),
+        ("misago_categories", "0008_auto_20190518_1659"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="tree_last_post_on",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="tree_last_poster",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="tree_last_poster_name",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="tree_last_poster_slug",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="tree_last_thread",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="misago_threads.Thread",
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="tree_last_thread_slug",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="tree_last_thread_title",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="tree_posts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="tree_threads",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(update_categories_trees),
+    ]
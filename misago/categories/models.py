@@ -83,6 +83,28 @@ class Category(MPTTModel):
     )
     last_poster_name = models.CharField(max_length=255, null=True, blank=True)
     last_poster_slug = models.CharField(max_length=255, null=True, blank=True)
+    # Stats and last thread of category together with all its subcategories
+    tree_threads = models.PositiveIntegerField(default=0)
+    tree_posts = models.PositiveIntegerField(default=0)
+    tree_last_post_on = models.DateTimeField(null=True, blank=True)
+    tree_last_thread = models.ForeignKey(
+        "misago_threads.Thread",
+        related_name="+",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+    )
+    tree_last_thread_title = models.CharField(max_length=255, null=True, blank=True)
+    tree_last_thread_slug = models.CharField(max_length=255, null=True, blank=True)
+    tree_last_poster = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="+",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+    )
+    tree_last_poster_name = models.CharField(max_length=255, null=True, blank=True)
+    tree_last_poster_slug = models.CharField(max_length=255, null=True, blank=True)
     require_threads_approval = models.BooleanField(default=False)
     require_replies_approval = models.BooleanField(default=False)
     require_edits_approval = models.BooleanField(default=False)
@@ -111,6 +133,14 @@ class Category(MPTTModel):
         clear_acl_cache()
         return super().delete(*args, **kwargs)
 
+    def move_to(self, *args, **kwargs):
+        from .subtrees import update_categories_trees_on_change
+
+        # New path is updated on save, but old one is not known after move
+        old_parent_id = self.parent_id
+        super().move_to(*args, **kwargs)
+        update_categories_trees_on_change([old_parent_id])
+
     def synchronize(self):
         threads_queryset = self.thread_set.filter(is_hidden=False, is_unapproved=False)
         self.threads = threads_queryset.count()
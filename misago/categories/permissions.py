@@ -4,6 +4,7 @@ from django.http import Http404
 from django.utils.translation import gettext_lazy as _
 
 from ..acl import algebra
+from ..acl.buildacl import get_build_memo
 from ..acl.decorators import return_boolean
 from ..admin.forms import YesNoSwitch
 from .models import Category, CategoryRole, RoleCategoryACL
@@ -27,26 +28,42 @@ def build_acl(acl, roles, key_name):
 
     roles = get_categories_roles(roles)
 
-    for category in Category.objects.all_categories():
-        build_category_acl(new_acl, category, roles, key_name)
+    for category in get_categories():
+        if category.level:
+            build_category_acl(new_acl, category, roles, key_name)
 
     return new_acl
 
 
+def get_categories():
+    """Returns all categories including root, shared by providers during build"""
+    memo = get_build_memo()
+    if "categories" not in memo:
+        memo["categories"] = list(Category.objects.all_categories(include_root=True))
+    return memo["categories"]
+
+
 def get_categories_roles(roles):
+    memo = get_build_memo()
+    memo_key = ("categories_roles", tuple(role.pk for role in roles))
+    if memo_key in memo:
+        return memo[memo_key]
+
     queryset = RoleCategoryACL.objects.filter(role__in=roles)
     queryset = queryset.select_related("category_role")
 
-    roles = {}
+    categories_roles = {}
     for acl_relation in queryset.iterator():
         role = acl_relation.category_role
-        roles.setdefault(acl_relation.category_id, []).append(role)
-    return roles
+        categories_roles.setdefault(acl_relation.category_id, []).append(role)
+
+    memo[memo_key] = categories_roles
+    return categories_roles
 
 
 def build_category_acl(acl, category, categories_roles, key_name):
     if category.level > 1:
-        if category.parent_id not in acl["visible_categories"]:
+        if category.parent_id not in acl["categories"]:
             # dont bother with child categories of invisible parents
             return
         if not acl["categories"][category.parent_id]["can_browse"]:
@@ -55,10 +72,8 @@ def build_category_acl(acl, category, categories_roles, key_name):
 
     category_roles = categories_roles.get(category.pk, [])
 
-    final_acl = {"can_see": 0, "can_browse": 0}
-
-    algebra.sum_acls(
-        final_acl,
+    final_acl = algebra.sum_roles_acls(
+        {"can_see": 0, "can_browse": 0},
         roles=category_roles,
         key=key_name,
         can_see=algebra.greater,
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from ..threads.deletecontent import delete_threads, get_ids_batches
+from ..threads.models import Thread
+from ..threads.movecontent import move_threads
+from .models import Category
+from .synchronize import synchronize_categories
+
+PRUNE_BATCH_SIZE = 500
+
+
+def prune_categories(batch_size=PRUNE_BATCH_SIZE, dry_run=False, now=None):
+    """
+    Moves or deletes threads matching categories pruning policies
+
+    Threads are pruned in batches using set-based queries, and every category
+    that lost or received threads is synchronized once at the end. Dry run
+    only counts threads that would be pruned.
+
+    Returns list of (category, pruned threads) tuples.
+    """
+    now = now or timezone.now()
+    pruned_categories = []
+    synchronize_ids = set()
+
+    queryset = Category.objects.filter(
+        Q(prune_started_after__gt=0) | Q(prune_replied_after__gt=0)
+    ).select_related("archive_pruned_in")
+
+    for category in queryset.order_by("tree_id", "lft"):
+        if category.archive_pruned_in_id == category.id:
+            continue  # threads archived in same category are never pruned
+
+        threads = get_threads_to_prune(category, now)
+
+        if dry_run:
+            pruned_threads = threads.count()
+        else:
+            pruned_threads = prune_threads(
+                threads, category.archive_pruned_in, batch_size
+            )
+
+        if pruned_threads:
+            pruned_categories.append((category, pruned_threads))
+            synchronize_ids.add(category.id)
+            if category.archive_pruned_in_id:
+                synchronize_ids.add(category.archive_pruned_in_id)
+
+    if synchronize_ids and not dry_run:
+        synchronize_categories(Category.objects.filter(id__in=synchronize_ids))
+
+    return pruned_categories
+
+
+def get_threads_to_prune(category, now):
+    policies = Q()
+    if category.prune_started_after:
+        cutoff = now - timedelta(days=category.prune_started_after)
+        policies |= Q(started_on__lte=cutoff)
+    if category.prune_replied_after:
+        cutoff = now - timedelta(days=category.prune_replied_after)
+        policies |= Q(last_post_on__lte=cutoff)
+
+    return Thread.objects.filter(policies, category=category, weight=0)
+
+
+def prune_threads(queryset, archive, batch_size):
+    pruned_threads = 0
+    for batch in get_ids_batches(queryset, batch_size):
+        if archive:
+            move_threads(batch, archive)
+        else:
+            delete_threads(batch)
+        pruned_threads += len(batch)
+    return pruned_threads
@@ -1,7 +1,9 @@
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal, receiver
 
 from ..users.signals import anonymize_user_data, username_changed
 from .models import Category
+from .subtrees import update_categories_trees_on_change
 
 delete_category_content = Signal()
 move_category_content = Signal(providing_args=["new_category"])
@@ -12,3 +14,16 @@ def update_usernames(sender, **kwargs):
     Category.objects.filter(last_poster=sender).update(
         last_poster_name=sender.username, last_poster_slug=sender.slug
     )
+    Category.objects.filter(tree_last_poster=sender).update(
+        tree_last_poster_name=sender.username, tree_last_poster_slug=sender.slug
+    )
+
+
+@receiver(post_save, sender=Category)
+def update_categories_trees_on_save(sender, instance, update_fields=None, **kwargs):
+    update_categories_trees_on_change([instance.id], update_fields)
+
+
+@receiver(post_delete, sender=Category)
+def update_categories_trees_on_delete(sender, instance, **kwargs):
+    update_categories_trees_on_change([instance.parent_id])
@@ -0,0 +1,227 @@
+"""
+Stats of categories aggregated together with their subcategories
+
+Category's tree fields store its threads and posts counts summed with ones of
+all its subcategories, and last thread of whole subtree. Index page uses them
+for categories which subtrees are fully visible to user, instead of adding
+subcategories stats up on every request.
+
+After category's stats or place in tree change, tree fields are updated only
+on paths from changed categories to their tree's root. Those updates are
+coalesced, so transaction updates every path once after it commits. Whole
+trees are rebuilt only after synchronizing categories and in migration.
+"""
+from django.db import transaction
+from django.db.models import Q
+
+from ..conf import settings
+from .models import Category
+
+STATS_FIELDS = {
+    "threads",
+    "posts",
+    "last_post_on",
+    "last_thread",
+    "last_thread_title",
+    "last_thread_slug",
+    "last_poster",
+    "last_poster_name",
+    "last_poster_slug",
+    "parent",
+    "tree_id",
+    "lft",
+    "rght",
+    "level",
+}
+
+TREE_FIELDS = [
+    "tree_threads",
+    "tree_posts",
+    "tree_last_post_on",
+    "tree_last_thread",
+    "tree_last_thread_title",
+    "tree_last_thread_slug",
+    "tree_last_poster",
+    "tree_last_poster_name",
+    "tree_last_poster_slug",
+]
+
+REBUILD_ALL = "all"
+
+
+def update_categories_trees_on_change(categories_ids, update_fields=None):
+    """Updates paths from categories to their trees roots"""
+    if update_fields and not STATS_FIELDS.intersection(update_fields):
+        return
+
+    defer_categories_trees_update({i for i in categories_ids if i})
+
+
+def rebuild_categories_trees_on_change():
+    defer_categories_trees_update({REBUILD_ALL})
+
+
+def defer_categories_trees_update(updates):
+    connection = transaction.get_connection()
+    is_deferred = settings.MISAGO_DEFER_CATEGORIES_TREES_UPDATES
+    if not (is_deferred and connection.in_atomic_block):
+        run_categories_trees_updates(updates)
+        return
+
+    # Callback is dropped together with updates registered in transaction or
+    # savepoint that was rolled back
+    if not any(
+        func is flush_categories_trees_updates for _, func in connection.run_on_commit
+    ):
+        connection.misago_categories_trees_updates = set()
+        transaction.on_commit(flush_categories_trees_updates)
+
+    connection.misago_categories_trees_updates.update(updates)
+
+
+def flush_categories_trees_updates():
+    connection = transaction.get_connection()
+    updates = connection.misago_categories_trees_updates
+    connection.misago_categories_trees_updates = set()
+    run_categories_trees_updates(updates)
+
+
+def run_categories_trees_updates(updates):
+    if REBUILD_ALL in updates:
+        update_categories_trees()
+    elif updates:
+        update_categories_paths(updates)
+
+
+def update_categories_trees():
+    """Updates tree fields of categories which subtrees stats have changed"""
+    with transaction.atomic():
+        # Locking categories makes concurrent updates see each other's changes
+        categories = list(
+            Category.objects.all_categories(include_root=True).select_for_update()
+        )
+
+        changed_categories = [
+            category
+            for category, tree_stats in aggregate_categories_trees(categories)
+            if set_tree_stats(category, tree_stats)
+        ]
+
+        if changed_categories:
+            Category.objects.bulk_update(changed_categories, TREE_FIELDS)
+
+    return changed_categories
+
+
+def update_categories_paths(categories_ids):
+    """
+    Updates tree fields of categories and their ancestors
+
+    Only categories on updated paths are locked, in same order by every
+    update. Their other children's tree fields are already up to date.
+    """
+    with transaction.atomic():
+        paths_filter = Q(pk__in=[])
+        for category in Category.objects.filter(id__in=categories_ids):
+            paths_filter |= Q(
+                tree_id=category.tree_id,
+                lft__lte=category.lft,
+                rght__gte=category.rght,
+            )
+
+        categories = list(
+            Category.objects.filter(paths_filter)
+            .select_for_update()
+            .order_by("tree_id", "lft")
+        )
+        if not categories:
+            return []
+
+        categories_ids = [category.id for category in categories]
+        children = Category.objects.filter(parent_id__in=categories_ids).exclude(
+            id__in=categories_ids
+        )
+
+        trees_stats = {c.id: get_category_stats(c) for c in categories}
+        for child in children:
+            add_subtree_stats(trees_stats[child.parent_id], get_tree_stats(child))
+
+        # Categories are ordered by lft, so children are added to parents first
+        changed_categories = []
+        for category in reversed(categories):
+            tree_stats = trees_stats[category.id]
+            if category.parent_id in trees_stats:
+                add_subtree_stats(trees_stats[category.parent_id], tree_stats)
+            if set_tree_stats(category, tree_stats):
+                changed_categories.append(category)
+
+        if changed_categories:
+            Category.objects.bulk_update(changed_categories, TREE_FIELDS)
+
+    return changed_categories
+
+
+def aggregate_categories_trees(categories):
+    """
+    Yields categories and stats of their subtrees
+
+    Categories are ordered by lft. Subcategory's last thread replaces parent's
+    one only if it was posted in later.
+    """
+    trees_stats = {c.id: get_category_stats(c) for c in categories}
+
+    for category in reversed(categories):
+        parent_stats = trees_stats.get(category.parent_id)
+        if parent_stats:
+            add_subtree_stats(parent_stats, trees_stats[category.id])
+
+    for category in categories:
+        yield category, trees_stats[category.id]
+
+
+def get_category_stats(category):
+    return {
+        "threads": category.threads,
+        "posts": category.posts,
+        "last_post_on": category.last_post_on,
+        "last_thread_id": category.last_thread_id,
+        "last_thread_title": category.last_thread_title,
+        "last_thread_slug": category.last_thread_slug,
+        "last_poster_id": category.last_poster_id,
+        "last_poster_name": category.last_poster_name,
+        "last_poster_slug": category.last_poster_slug,
+    }
+
+
+def get_tree_stats(category):
+    return {
+        key: getattr(category, "tree_%s" % key) for key in get_category_stats(category)
+    }
+
+
+def add_subtree_stats(parent_stats, tree_stats):
+    parent_stats["threads"] += tree_stats["threads"]
+    parent_stats["posts"] += tree_stats["posts"]
+
+    if tree_stats["last_post_on"] and (
+        not parent_stats["last_post_on"]
+        or parent_stats["last_post_on"] < tree_stats["last_post_on"]
+    ):
+        parent_stats.update(
+            {
+                key: value
+                for key, value in tree_stats.items()
+                if key not in ("threads", "posts")
+            }
+        )
+
+
+def set_tree_stats(category, tree_stats):
+    """Sets tree fields on category, returning True if any has changed"""
+    has_changed = False
+    for key, value in tree_stats.items():
+        field = "tree_%s" % key
+        if getattr(category, field) != value:
+            setattr(category, field, value)
+            has_changed = True
+    return has_changed
@@ -0,0 +1,61 @@
+from django.db.models import Count, Sum
+
+from ..threads.models import Thread
+from .models import Category
+from .subtrees import rebuild_categories_trees_on_change
+
+SYNCHRONIZED_FIELDS = [
+    "threads",
+    "posts",
+    "last_post_on",
+    "last_thread",
+    "last_thread_title",
+    "last_thread_slug",
+    "last_poster",
+    "last_poster_name",
+    "last_poster_slug",
+]
+
+
+def synchronize_categories(categories):
+    """
+    Synchronizes list of categories using fixed number of queries
+
+    Produces same results as calling Category.synchronize() on every category.
+    """
+    categories_ids = [category.id for category in categories]
+    if not categories_ids:
+        return []
+
+    threads_queryset = Thread.objects.filter(
+        category_id__in=categories_ids, is_hidden=False, is_unapproved=False
+    )
+
+    stats = {
+        row["category_id"]: row
+        for row in threads_queryset.order_by()
+        .values("category_id")
+        .annotate(threads=Count("id"), replies=Sum("replies"))
+    }
+
+    last_threads = {
+        thread.category_id: thread
+        for thread in threads_queryset.select_related("last_poster")
+        .order_by("category_id", "-last_post_on")
+        .distinct("category_id")
+    }
+
+    for category in categories:
+        category_stats = stats.get(category.id)
+        if category_stats:
+            category.threads = category_stats["threads"]
+            category.posts = category_stats["threads"] + category_stats["replies"]
+            category.set_last_thread(last_threads[category.id])
+        else:
+            category.threads = 0
+            category.posts = 0
+            category.empty_last_thread()
+
+    Category.objects.bulk_update(categories, SYNCHRONIZED_FIELDS)
+    rebuild_categories_trees_on_change()
+    return categories
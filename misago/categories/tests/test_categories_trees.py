@@ -0,0 +1,284 @@
+from unittest.mock import Mock
+
+import pytest
+from django.db import transaction
+from django.test import override_settings
+
+from ...threads.test import post_thread
+from ...users.test import create_test_user
+from ..models import Category
+from ..subtrees import (
+    flush_categories_trees_updates,
+    rebuild_categories_trees_on_change,
+    update_categories_paths,
+    update_categories_trees,
+    update_categories_trees_on_change,
+)
+from ..utils import get_categories_tree
+
+
+@pytest.fixture
+def parent_category(root_category):
+    Category(name="Parent", slug="parent").insert_at(
+        root_category, position="last-child", save=True
+    )
+    return Category.objects.get(slug="parent")
+
+
+@pytest.fixture
+def child_category(parent_category):
+    Category(name="Child", slug="child").insert_at(
+        parent_category, position="last-child", save=True
+    )
+    return Category.objects.get(slug="child")
+
+
+@pytest.fixture
+def other_child_category(parent_category, child_category):
+    Category(name="Other Child", slug="other-child").insert_at(
+        parent_category, position="last-child", save=True
+    )
+    return Category.objects.get(slug="other-child")
+
+
+@pytest.fixture
+def get_request(user, user_acl, dynamic_settings):
+    def get_request_mock(visible, browseable=None):
+        return Mock(
+            settings=dynamic_settings,
+            user=user,
+            user_acl=get_user_acl(user_acl, visible, browseable or visible),
+        )
+
+    return get_request_mock
+
+
+def get_user_acl(user_acl, visible, browseable):
+    user_acl = user_acl.copy()
+    user_acl.update({"visible_categories": [c.id for c in visible], "categories": {}})
+    for category in visible:
+        user_acl["categories"][category.id] = {
+            "can_see": 1,
+            "can_browse": int(category in browseable),
+        }
+    return user_acl
+
+
+def test_category_tree_stats_include_subcategories(
+    parent_category, child_category, other_child_category
+):
+    post_thread(parent_category)
+    post_thread(child_category)
+    thread = post_thread(other_child_category)
+
+    parent_category.refresh_from_db()
+    assert parent_category.tree_threads == 3
+    assert parent_category.tree_posts == 3
+    assert parent_category.tree_last_thread == thread
+    assert parent_category.tree_last_thread_title == thread.title
+    assert parent_category.tree_last_post_on == thread.last_post_on
+
+    child_category.refresh_from_db()
+    assert child_category.tree_threads == 1
+
+
+def test_category_tree_stats_are_updated_in_root_category(
+    root_category, child_category
+):
+    thread = post_thread(child_category)
+
+    root_category.refresh_from_db()
+    assert root_category.tree_threads == 1
+    assert root_category.tree_last_thread == thread
+
+
+def test_category_tree_last_thread_is_kept_if_subcategory_thread_is_older(
+    parent_category, child_category
+):
+    thread = post_thread(parent_category)
+    post_thread(child_category, started_on=thread.last_post_on.replace(year=2000))
+
+    parent_category.refresh_from_db()
+    assert parent_category.tree_threads == 2
+    assert parent_category.tree_last_thread == thread
+
+
+def test_category_tree_stats_are_updated_when_subcategory_is_moved(
+    root_category, parent_category, child_category
+):
+    post_thread(child_category)
+
+    child_category.move_to(root_category, "last-child")
+    child_category.save()
+
+    parent_category.refresh_from_db()
+    assert parent_category.tree_threads == 0
+    assert parent_category.tree_last_thread is None
+
+
+def test_categories_trees_update_returns_only_changed_categories(
+    parent_category, child_category
+):
+    assert update_categories_trees() == []
+
+    Category.objects.filter(id=child_category.id).update(threads=5)
+    changed_categories = update_categories_trees()
+    assert {c.slug for c in changed_categories} == {"root", "parent", "child"}
+
+
+def test_categories_paths_update_returns_only_changed_categories(
+    parent_category, child_category, other_child_category
+):
+    assert update_categories_paths([child_category.id]) == []
+
+    Category.objects.filter(id=child_category.id).update(threads=5)
+    changed_categories = update_categories_paths([child_category.id])
+    assert {c.slug for c in changed_categories} == {"root", "parent", "child"}
+
+
+def test_categories_paths_update_keeps_stats_of_categories_outside_of_path(
+    parent_category, child_category, other_child_category
+):
+    post_thread(other_child_category)
+
+    Category.objects.filter(id=child_category.id).update(threads=5)
+    update_categories_paths([child_category.id])
+
+    parent_category.refresh_from_db()
+    assert parent_category.tree_threads == 6
+
+
+def test_categories_trees_are_not_updated_if_stats_were_not_saved(
+    mocker, child_category
+):
+    update_categories_paths = mocker.patch(
+        "misago.categories.subtrees.update_categories_paths"
+    )
+    update_categories_trees_on_change([child_category.id], ["name", "slug"])
+    update_categories_paths.assert_not_called()
+
+    update_categories_trees_on_change([child_category.id], ["last_thread_title"])
+    update_categories_paths.assert_called_once_with({child_category.id})
+
+
+def test_categories_are_rebuilt_after_synchronization(mocker):
+    update_categories_trees = mocker.patch(
+        "misago.categories.subtrees.update_categories_trees"
+    )
+    rebuild_categories_trees_on_change()
+    update_categories_trees.assert_called_once()
+
+
+@override_settings(MISAGO_DEFER_CATEGORIES_TREES_UPDATES=True)
+def test_categories_trees_updates_are_deferred_to_transaction_commit(
+    mocker, parent_category, child_category
+):
+    on_commit = mocker.patch("misago.categories.subtrees.transaction.on_commit")
+    update_categories_paths = mocker.patch(
+        "misago.categories.subtrees.update_categories_paths"
+    )
+
+    update_categories_trees_on_change([parent_category.id])
+    update_categories_paths.assert_not_called()
+    on_commit.assert_called_once_with(flush_categories_trees_updates)
+
+
+@override_settings(MISAGO_DEFER_CATEGORIES_TREES_UPDATES=True)
+def test_categories_trees_updates_are_coalesced_in_transaction(
+    mocker, parent_category, child_category
+):
+    update_categories_paths = mocker.patch(
+        "misago.categories.subtrees.update_categories_paths"
+    )
+
+    update_categories_trees_on_change([parent_category.id])
+    update_categories_trees_on_change([child_category.id])
+    update_categories_trees_on_change([child_category.id])
+
+    callbacks = [
+        func
+        for _, func in transaction.get_connection().run_on_commit
+        if func is flush_categories_trees_updates
+    ]
+    assert len(callbacks) == 1
+
+    flush_categories_trees_updates()
+    update_categories_paths.assert_called_once_with(
+        {parent_category.id, child_category.id}
+    )
+
+
+def test_category_tree_last_poster_name_is_updated_on_username_change(
+    parent_category, child_category
+):
+    user = create_test_user("User", "user@example.com")
+    post_thread(child_category, poster=user)
+
+    user.set_username("Renamed")
+    user.save()
+
+    parent_category.refresh_from_db()
+    assert parent_category.tree_last_poster_name == "Renamed"
+
+
+def test_categories_tree_uses_stored_stats_for_fully_browseable_tree(
+    get_request, parent_category, child_category
+):
+    post_thread(child_category)
+    Category.objects.filter(id=parent_category.id).update(tree_threads=42)
+
+    request = get_request([parent_category, child_category])
+    categories = get_categories_tree(request, join_posters=True)
+
+    assert categories[0].threads == 42
+
+
+def test_categories_tree_adds_stats_up_for_partially_visible_tree(
+    get_request, parent_category, child_category, other_child_category
+):
+    post_thread(parent_category)
+    post_thread(child_category)
+    post_thread(other_child_category)
+
+    request = get_request([parent_category, child_category])
+    categories = get_categories_tree(request)
+
+    assert categories[0].threads == 2
+    assert categories[0].subcategories[0].threads == 1
+
+
+def test_categories_tree_skips_stats_of_not_browseable_subcategory(
+    get_request, parent_category, child_category, other_child_category
+):
+    post_thread(parent_category)
+    post_thread(child_category)
+    thread = post_thread(other_child_category)
+
+    visible = [parent_category, child_category, other_child_category]
+    browseable = [parent_category, child_category]
+    request = get_request(visible, browseable)
+    categories = get_categories_tree(request)
+
+    assert categories[0].threads == 2
+    assert categories[0].last_thread_id != thread.id
+
+
+def test_categories_tree_stats_are_same_as_added_up_for_partial_tree(
+    get_request, parent_category, child_category, other_child_category
+):
+    post_thread(parent_category)
+    post_thread(child_category)
+    thread = post_thread(other_child_category)
+
+    visible = [parent_category, child_category, other_child_category]
+    full_tree = get_categories_tree(get_request(visible))
+
+    # Hidden sibling makes parent's stats to be added up
+    hidden_sibling = Category(name="Hidden", slug="hidden")
+    hidden_sibling.insert_at(parent_category, position="last-child", save=True)
+    Category.objects.filter(id=parent_category.id).update(tree_threads=42)
+
+    partial_tree = get_categories_tree(get_request(visible))
+
+    assert partial_tree[0].threads == full_tree[0].threads == 3
+    assert partial_tree[0].last_thread_id == full_tree[0].last_thread_id == thread.id
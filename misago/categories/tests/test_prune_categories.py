@@ -0,0 +1,151 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from ...readtracker.models import ThreadRead
+from ...threads.models import Post, PostLike, Subscription, Thread
+from ...threads.test import like_post, post_poll, post_thread, reply_thread
+from .. import prune
+from ..management.commands import prunecategories
+from ..models import Category
+from ..prune import prune_categories
+
+
+@pytest.fixture
+def archive(root_category):
+    Category(name="Archive", slug="archive").insert_at(
+        root_category, position="last-child", save=True
+    )
+    return Category.objects.get(slug="archive")
+
+
+@pytest.fixture
+def pruned_category(default_category):
+    default_category.prune_started_after = 20
+    default_category.save()
+    return default_category
+
+
+@pytest.fixture
+def old_thread(pruned_category):
+    return post_thread(pruned_category, started_on=timezone.now() - timedelta(days=30))
+
+
+def test_pruned_threads_are_deleted(pruned_category, old_thread):
+    reply_thread(old_thread)
+    recent_thread = post_thread(pruned_category)
+
+    assert prune_categories() == [(pruned_category, 1)]
+
+    assert not Thread.objects.filter(id=old_thread.id).exists()
+    assert not Post.objects.filter(thread_id=old_thread.id).exists()
+    assert Thread.objects.filter(id=recent_thread.id).exists()
+
+
+def test_threads_are_pruned_by_last_reply_date(pruned_category):
+    pruned_category.prune_started_after = 0
+    pruned_category.prune_replied_after = 20
+    pruned_category.save()
+
+    old_date = timezone.now() - timedelta(days=30)
+    old_thread = post_thread(pruned_category, started_on=old_date)
+    replied_thread = post_thread(pruned_category, started_on=old_date)
+    reply_thread(replied_thread, posted_on=timezone.now())
+
+    prune_categories()
+
+    assert not Thread.objects.filter(id=old_thread.id).exists()
+    assert Thread.objects.filter(id=replied_thread.id).exists()
+
+
+def test_pinned_threads_are_not_pruned(pruned_category, old_thread):
+    old_thread.weight = 1
+    old_thread.save()
+
+    assert prune_categories() == []
+    assert Thread.objects.filter(id=old_thread.id).exists()
+
+
+def test_pruned_threads_are_moved_to_archive_with_their_content(
+    user, pruned_category, archive, old_thread
+):
+    pruned_category.archive_pruned_in = archive
+    pruned_category.save()
+
+    post = reply_thread(old_thread)
+    like_post(post, user)
+    post_poll(old_thread, user)
+    Subscription.objects.create(user=user, thread=old_thread, category=pruned_category)
+    ThreadRead.objects.create(
+        user=user,
+        thread=old_thread,
+        category=pruned_category,
+        read_until=timezone.now(),
+    )
+
+    prune_categories()
+
+    old_thread.refresh_from_db()
+    assert old_thread.category == archive
+    assert old_thread.poll.category == archive
+    assert not Post.objects.filter(thread=old_thread).exclude(category=archive)
+    assert PostLike.objects.get(post=post).category == archive
+    assert Subscription.objects.get(thread=old_thread).category == archive
+    assert ThreadRead.objects.get(thread=old_thread).category == archive
+
+
+def test_categories_are_synchronized_after_pruning(
+    pruned_category, archive, old_thread
+):
+    pruned_category.archive_pruned_in = archive
+    pruned_category.save()
+
+    reply_thread(old_thread)
+    prune_categories()
+
+    pruned_category.refresh_from_db()
+    assert pruned_category.threads == 0
+    assert pruned_category.last_thread is None
+
+    archive.refresh_from_db()
+    assert archive.threads == 1
+    assert archive.posts == 2
+    assert archive.last_thread == old_thread
+
+
+def test_threads_are_pruned_in_batches(mocker, pruned_category):
+    started_on = timezone.now() - timedelta(days=30)
+    for _ in range(5):
+        post_thread(pruned_category, started_on=started_on)
+
+    delete_threads = mocker.spy(prune, "delete_threads")
+    synchronize_categories = mocker.spy(prune, "synchronize_categories")
+
+    assert prune_categories(batch_size=2) == [(pruned_category, 5)]
+    assert delete_threads.call_count == 3
+    assert synchronize_categories.call_count == 1
+    assert not pruned_category.thread_set.exists()
+
+
+def test_dry_run_counts_threads_without_pruning_them(pruned_category, old_thread):
+    assert prune_categories(dry_run=True) == [(pruned_category, 1)]
+    assert Thread.objects.filter(id=old_thread.id).exists()
+
+
+def test_command_reports_threads_to_prune_in_dry_run(
+    pruned_category, archive, old_thread
+):
+    pruned_category.archive_pruned_in = archive
+    pruned_category.save()
+
+    out = StringIO()
+    call_command(prunecategories.Command(), dry_run=True, stdout=out)
+
+    assert "1 threads would be moved to Archive" in out.getvalue()
+    assert "Categories were not pruned (dry run)" in out.getvalue()
+
+    old_thread.refresh_from_db()
+    assert old_thread.category == pruned_category
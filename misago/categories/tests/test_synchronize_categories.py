@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ...threads.test import post_thread, reply_thread
+from ..models import Category
+from ..synchronize import synchronize_categories
+
+
+def test_synchronize_categories_produces_same_results_as_model_method(
+    root_category, default_category
+):
+    started_on = timezone.now() - timedelta(days=1)
+    for _ in range(3):
+        reply_thread(post_thread(default_category, started_on=started_on))
+    post_thread(default_category, is_hidden=True)
+    post_thread(default_category, is_unapproved=True)
+    last_thread = post_thread(default_category)
+
+    expected = Category.objects.get(id=default_category.id)
+    expected.synchronize()
+
+    Category.objects.update(threads=0, posts=0)
+    categories = list(Category.objects.filter(id__in=[root_category.id, expected.id]))
+    synchronize_categories(categories)
+
+    default_category = Category.objects.get(id=default_category.id)
+    assert default_category.threads == expected.threads == 4
+    assert default_category.posts == expected.posts == 7
+    assert default_category.last_thread_id == expected.last_thread_id == last_thread.id
+    assert default_category.last_post_on == expected.last_post_on
+
+    root_category = Category.objects.get(id=root_category.id)
+    assert root_category.threads == 0
+    assert root_category.last_thread is None
+
+
+def test_synchronize_categories_uses_fixed_number_of_queries(
+    default_category, django_assert_num_queries
+):
+    post_thread(default_category)
+    categories = list(Category.objects.all())
+
+    # Categories trees update uses 3 queries
+    with django_assert_num_queries(6):
+        synchronize_categories(categories)
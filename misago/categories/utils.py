@@ -16,7 +16,9 @@ def get_categories_tree(
 
     queryset_with_acl = queryset.filter(id__in=request.user_acl["visible_categories"])
     if join_posters:
-        queryset_with_acl = queryset_with_acl.select_related("last_poster")
+        queryset_with_acl = queryset_with_acl.select_related(
+            "last_poster", "tree_last_poster"
+        )
 
     visible_categories = list(queryset_with_acl)
 
@@ -27,6 +29,7 @@ def get_categories_tree(
 
     for category in visible_categories:
         category.subcategories = []
+        category.browseable_descendants = 0
         categories_dict[category.pk] = category
         categories_list.append(category)
 
@@ -36,29 +39,27 @@ def get_categories_tree(
     add_acl_to_obj(request.user_acl, categories_list)
     categoriestracker.make_read_aware(request, categories_list)
 
+    # Categories which all subcategories can be browsed use stored tree stats
     for category in reversed(visible_categories):
         if category.acl["can_browse"]:
             category.parent = categories_dict.get(category.parent_id)
             if category.parent:
-                category.parent.threads += category.threads
-                category.parent.posts += category.posts
-
-                if category.parent.last_post_on and category.last_post_on:
-                    parent_last_post = category.parent.last_post_on
-                    category_last_post = category.last_post_on
-                    update_last_thead = parent_last_post < category_last_post
-                elif not category.parent.last_post_on and category.last_post_on:
-                    update_last_thead = True
-                else:
-                    update_last_thead = False
-
-                if update_last_thead:
-                    category.parent.last_post_on = category.last_post_on
-                    category.parent.last_thread_id = category.last_thread_id
-                    category.parent.last_thread_title = category.last_thread_title
-                    category.parent.last_thread_slug = category.last_thread_slug
-                    category.parent.last_poster_name = category.last_poster_name
-                    category.parent.last_poster_slug = category.last_poster_slug
+                category.parent.browseable_descendants += (
+                    category.browseable_descendants + 1
+                )
+
+    for category in visible_categories:
+        category.has_complete_tree = (
+            category.browseable_descendants == category.get_descendant_count()
+        )
+        if category.has_complete_tree:
+            use_tree_stats(category, join_posters)
+
+    for category in reversed(visible_categories):
+        if category.acl["can_browse"]:
+            if category.parent:
+                if not category.parent.has_complete_tree:
+                    add_stats_to_parent(category, join_posters)
 
                 if not category.is_read:
                     category.parent.is_read = False
@@ -70,6 +71,47 @@ def get_categories_tree(
     return flat_list
 
 
+def use_tree_stats(category, join_posters):
+    category.threads = category.tree_threads
+    category.posts = category.tree_posts
+    category.last_post_on = category.tree_last_post_on
+    category.last_thread_id = category.tree_last_thread_id
+    category.last_thread_title = category.tree_last_thread_title
+    category.last_thread_slug = category.tree_last_thread_slug
+    if join_posters:
+        category.last_poster = category.tree_last_poster
+    else:
+        category.last_poster_id = category.tree_last_poster_id
+    category.last_poster_name = category.tree_last_poster_name
+    category.last_poster_slug = category.tree_last_poster_slug
+
+
+def add_stats_to_parent(category, join_posters):
+    category.parent.threads += category.threads
+    category.parent.posts += category.posts
+
+    if category.parent.last_post_on and category.last_post_on:
+        parent_last_post = category.parent.last_post_on
+        category_last_post = category.last_post_on
+        update_last_thead = parent_last_post < category_last_post
+    elif not category.parent.last_post_on and category.last_post_on:
+        update_last_thead = True
+    else:
+        update_last_thead = False
+
+    if update_last_thead:
+        category.parent.last_post_on = category.last_post_on
+        category.parent.last_thread_id = category.last_thread_id
+        category.parent.last_thread_title = category.last_thread_title
+        category.parent.last_thread_slug = category.last_thread_slug
+        if join_posters:
+            category.parent.last_poster = category.last_poster
+        else:
+            category.parent.last_poster_id = category.last_poster_id
+        category.parent.last_poster_name = category.last_poster_name
+        category.parent.last_poster_slug = category.last_poster_slug
+
+
 def get_category_path(category):
     if category.special_role:
         return [category]
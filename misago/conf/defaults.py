@@ -31,6 +31,42 @@ MISAGO_ACL_EXTENSIONS = [
 MISAGO_USER_DATA_DOWNLOADS_WORKING_DIR = None
 
 
+# How long (in seconds) process may reuse cache versions before checking shared
+# cache for changes. Set to 0 to read cache versions from database on every request.
+
+MISAGO_CACHE_VERSIONS_TTL = 5
+
+
+# How often (in seconds) process writes users last clicks buffered in memory to
+# online tracker table. Set to 0 to write user's last click on every request.
+
+MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL = 30
+
+
+# Send notifications about new replies from Celery task after posting transaction
+# commits. Set to False to send them during request if you are not running Celery.
+
+MISAGO_DEFER_NOTIFICATIONS = True
+
+
+# Update usernames stored on threads, posts and other content from Celery task
+# after username change. Set to False to update them during request.
+
+MISAGO_DEFER_USERNAME_CHANGES = True
+
+
+# Update categories stats aggregated with their subcategories after transaction
+# that changed categories commits. Set to False to update them in transaction.
+
+MISAGO_DEFER_CATEGORIES_TREES_UPDATES = True
+
+
+# Number of ACLs built for distinct roles sets that process keeps in memory, so it
+# doesn't have to read them from cache on every request. Set to 0 to disable.
+
+MISAGO_ACL_CACHE_SIZE = 100
+
+
 # Custom markup extensions
 
 MISAGO_MARKUP_EXTENSIONS = []
@@ -1,7 +1,9 @@
 import pytest
 
 from .acl import ACL_CACHE, useracl
+from .acl.useracl import clear_roles_acls
 from .admin.auth import authorize_admin
+from .cache.versions import clear_cache_versions_snapshot
 from .categories.models import Category
 from .conf import SETTINGS_CACHE
 from .conf.dynamicsettings import DynamicSettings
@@ -12,7 +14,9 @@ from .test import MisagoClient
 from .themes import THEME_CACHE
 from .threads.test import post_thread
 from .users import BANS_CACHE
+from .users.banmatcher import clear_bans_matcher
 from .users.models import AnonymousUser
+from .users.online.buffer import clear_clicks_buffer
 from .users.test import create_test_superuser, create_test_user
 
 
@@ -27,6 +31,22 @@ def get_cache_versions():
     }
 
 
+@pytest.fixture(autouse=True)
+def clear_cache_versions():
+    # Process-local cache versions would otherwise outlive test's transaction
+    clear_cache_versions_snapshot()
+    clear_bans_matcher()
+    clear_roles_acls()
+
+
+@pytest.fixture(autouse=True)
+def clear_online_clicks_buffer():
+    # Buffered clicks would otherwise be written after test's transaction
+    clear_clicks_buffer()
+    yield
+    clear_clicks_buffer()
+
+
 @pytest.fixture
 def cache_versions():
     return get_cache_versions()
@@ -1,7 +1,15 @@
 from django.apps import AppConfig
+from django.db.models import AutoField, ForeignKey, IntegerField
+
+from .pgutils import AnyLookup
 
 
 class MisagoCoreConfig(AppConfig):
     name = "misago.core"
     label = "misago_core"
     verbose_name = "Misago Core"
+
+    def ready(self):
+        AutoField.register_lookup(AnyLookup)
+        ForeignKey.register_lookup(AnyLookup)
+        IntegerField.register_lookup(AnyLookup)
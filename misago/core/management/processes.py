@@ -0,0 +1,20 @@
+from multiprocessing import Pool
+
+from django.db import connections
+
+
+def imap_processes(function, items, processes=1):
+    """
+    Yields results of calling function on every item, in order of completion
+
+    If more than one process is requested, items are distributed between pool
+    of worker processes.
+    """
+    if processes > 1:
+        # Forked workers must not share parent's database connection
+        connections.close_all()
+        with Pool(processes) as pool:
+            yield from pool.imap_unordered(function, items)
+    else:
+        for item in items:
+            yield function(item)
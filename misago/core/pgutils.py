@@ -1,3 +1,26 @@
+from django.db.models import Lookup, Max, Min
+
+
+class AnyLookup(Lookup):
+    """
+    Matches field against values array passed as single parameter
+
+    Unlike "in" lookup, SQL it produces is the same no matter how many values
+    are matched against.
+    """
+
+    lookup_name = "any"
+    prepare_rhs = False
+
+    def get_db_prep_lookup(self, value, connection):
+        return "%s", [list(value)]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return "%s = ANY(%s)" % (lhs, rhs), lhs_params + rhs_params
+
+
 def chunk_queryset(queryset, chunk_size=20):
     ordered_queryset = queryset.order_by("-pk")  # bias to newest items first
     chunk = ordered_queryset[:chunk_size]
@@ -7,3 +30,21 @@ def chunk_queryset(queryset, chunk_size=20):
             last_pk = item.pk
             yield item
         chunk = ordered_queryset.filter(pk__lt=last_pk)[:chunk_size]
+
+
+def chunk_ids_ranges(queryset, chunk_size):
+    """
+    Splits ids of queryset items into (start_id, end_id) ranges, newest first
+
+    Ranges are aligned to chunk size so they remain same between calls.
+    """
+    ids_range = queryset.aggregate(Min("pk"), Max("pk"))
+    if ids_range["pk__min"] is None:
+        return []
+
+    ranges = []
+    start_id = ids_range["pk__max"] // chunk_size * chunk_size
+    while start_id + chunk_size > ids_range["pk__min"]:
+        ranges.append((start_id, start_id + chunk_size))
+        start_id -= chunk_size
+    return ranges
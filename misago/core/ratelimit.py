@@ -0,0 +1,73 @@
+"""
+Rate limits based on sliding window counters kept in shared cache
+
+Every limit counts actions in fixed windows of time, and number of actions in
+sliding window is estimated from counts in current and previous windows,
+weighted by part of previous window that still overlaps sliding one.
+
+Counters are incremented atomically, so limits hold between processes without
+locking or counting rows in database. Limits aren't enforced if cache backend
+doesn't store values, like dummy cache.
+"""
+from time import time
+
+from django.core.cache import cache
+
+CACHE_KEY = "misago_rate_limit_%s_%s_%s"
+
+
+class RateLimit:
+    def __init__(self, name, limit, window):
+        self.name = name
+        self.limit = limit
+        self.window = window
+
+    def hit(self, key):
+        """Counts action and returns False if it exceeds limit"""
+        if not self.limit:
+            return True
+
+        now = time()
+        current_window = int(now // self.window)
+        current_key = self.get_cache_key(key, current_window)
+        previous_key = self.get_cache_key(key, current_window - 1)
+
+        current_count = increment_counter(current_key, self.window * 2)
+        previous_count = cache.get(previous_key) or 0
+
+        previous_weight = 1 - (now % self.window) / self.window
+        if previous_count * previous_weight + current_count > self.limit:
+            self.release_counter(current_key)
+            return False
+
+        return True
+
+    def release(self, key):
+        """Reverts action counted by hit"""
+        if self.limit:
+            current_window = int(time() // self.window)
+            self.release_counter(self.get_cache_key(key, current_window))
+
+    def release_counter(self, cache_key):
+        try:
+            cache.decr(cache_key)
+        except ValueError:
+            pass  # counter has expired
+
+    def get_cache_key(self, key, window):
+        return CACHE_KEY % (self.name, key, window)
+
+
+def increment_counter(cache_key, timeout):
+    cache.add(cache_key, 0, timeout)
+    try:
+        return cache.incr(cache_key)
+    except ValueError:
+        # Counter has expired after it was added
+        cache.set(cache_key, 1, timeout)
+        return 1
+
+
+def acquire_interval(name, key, interval):
+    """Returns False if action was already done within interval seconds"""
+    return cache.add(CACHE_KEY % (name, key, "interval"), True, interval)
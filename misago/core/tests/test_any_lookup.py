@@ -0,0 +1,20 @@
+from django.contrib.contenttypes.models import ContentType
+
+
+def test_any_lookup_matches_values_in_list(db):
+    content_types = list(ContentType.objects.order_by("id")[:3])
+    queryset = ContentType.objects.filter(
+        id__any=[content_types[0].id, content_types[2].id]
+    )
+    assert list(queryset.order_by("id")) == [content_types[0], content_types[2]]
+
+
+def test_any_lookup_matches_nothing_for_empty_list(db):
+    assert not ContentType.objects.filter(id__any=[]).exists()
+
+
+def test_any_lookup_sql_is_same_for_different_number_of_values(db):
+    one_value_sql = str(ContentType.objects.filter(id__any=[1]).query)
+    many_values_sql = str(ContentType.objects.filter(id__any=[1, 2, 3]).query)
+    assert "= ANY(" in one_value_sql
+    assert one_value_sql.split("ANY(")[0] == many_values_sql.split("ANY(")[0]
@@ -0,0 +1,22 @@
+from django.contrib.contenttypes.models import ContentType
+
+from ..pgutils import chunk_ids_ranges
+
+
+def test_chunk_ids_ranges_covers_all_items_newest_first(db):
+    queryset = ContentType.objects.all()
+    ids = sorted(queryset.values_list("id", flat=True))
+
+    ranges = chunk_ids_ranges(queryset, 5)
+    assert ranges == sorted(ranges, reverse=True)
+
+    covered_ids = []
+    for start_id, end_id in ranges:
+        assert start_id % 5 == 0
+        assert end_id == start_id + 5
+        covered_ids += [i for i in ids if start_id <= i < end_id]
+    assert sorted(covered_ids) == ids
+
+
+def test_chunk_ids_ranges_returns_empty_list_for_empty_queryset(db):
+    assert chunk_ids_ranges(ContentType.objects.none(), 5) == []
@@ -0,0 +1,95 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from ..ratelimit import RateLimit, acquire_interval
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "rate-limit-tests",
+    }
+}
+
+
+def hit_at(rate_limit, key, now):
+    with patch("misago.core.ratelimit.time", return_value=now):
+        return rate_limit.hit(key)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_rate_limit_allows_actions_up_to_limit():
+    cache.clear()
+    rate_limit = RateLimit("test", 3, 60)
+
+    assert hit_at(rate_limit, 1, 6000)
+    assert hit_at(rate_limit, 1, 6001)
+    assert hit_at(rate_limit, 1, 6002)
+    assert not hit_at(rate_limit, 1, 6003)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_rate_limit_is_counted_separately_for_every_key():
+    cache.clear()
+    rate_limit = RateLimit("test", 1, 60)
+
+    assert hit_at(rate_limit, 1, 6000)
+    assert hit_at(rate_limit, 2, 6000)
+    assert not hit_at(rate_limit, 1, 6000)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_rejected_actions_are_not_counted():
+    cache.clear()
+    rate_limit = RateLimit("test", 2, 60)
+
+    assert hit_at(rate_limit, 1, 6000)
+    assert hit_at(rate_limit, 1, 6000)
+    for _ in range(5):
+        assert not hit_at(rate_limit, 1, 6000)
+
+    # Half of previous window's actions overlap sliding window
+    assert hit_at(rate_limit, 1, 6090)
+    assert not hit_at(rate_limit, 1, 6090)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_previous_window_is_weighted_by_its_overlap_with_sliding_window():
+    cache.clear()
+    rate_limit = RateLimit("test", 4, 60)
+
+    for _ in range(4):
+        assert hit_at(rate_limit, 1, 6030)
+
+    # 3/4 of previous window overlap sliding window: 4 * 0.75 + 1 = 4
+    assert hit_at(rate_limit, 1, 6075)
+    assert not hit_at(rate_limit, 1, 6075)
+
+    # previous window no longer overlaps sliding window
+    assert hit_at(rate_limit, 1, 6180)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_released_action_is_not_counted():
+    cache.clear()
+    rate_limit = RateLimit("test", 1, 60)
+
+    with patch("misago.core.ratelimit.time", return_value=6000):
+        assert rate_limit.hit(1)
+        rate_limit.release(1)
+        assert rate_limit.hit(1)
+
+
+def test_disabled_rate_limit_allows_all_actions():
+    rate_limit = RateLimit("test", 0, 60)
+    for _ in range(5):
+        assert rate_limit.hit(1)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_interval_can_be_acquired_once():
+    cache.clear()
+    assert acquire_interval("test", 1, 60)
+    assert not acquire_interval("test", 1, 60)
+    assert acquire_interval("test", 2, 60)
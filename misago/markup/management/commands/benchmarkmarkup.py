@@ -0,0 +1,93 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from ....faker.englishcorpus import EnglishCorpus
+from ...mentions import add_mentions
+from ...parser import clean_links, linkify_paragraphs, md_factory, minify_result, parse
+from ...pipeline import pipeline
+
+User = get_user_model()
+
+
+class BenchmarkRequest:
+    def __init__(self, user):
+        self.user = user
+
+    def get_host(self):
+        return "example.com"
+
+
+class Command(BaseCommand):
+    help = "Benchmarks markup parser using English corpus"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "posts", help="number of posts to parse", nargs="?", type=int, default=200
+        )
+        parser.add_argument(
+            "--sentences", help="number of sentences in post", type=int, default=20,
+        )
+
+    def handle(self, *args, **options):
+        request = BenchmarkRequest(User(username="Benchmark", slug="benchmark"))
+        texts = get_benchmark_texts(options["posts"], options["sentences"])
+
+        self.stdout.write("Parsing %s posts...\n" % len(texts))
+
+        multipass_time = self.run_benchmark(parse_multipass, texts, request)
+        self.stdout.write("Multi-pass parser: %.2f posts/s" % multipass_time)
+
+        singlepass_time = self.run_benchmark(parse, texts, request)
+        self.stdout.write("Single-pass parser: %.2f posts/s" % singlepass_time)
+
+        self.stdout.write("Speedup: %.2fx" % (singlepass_time / multipass_time))
+
+    def run_benchmark(self, parser, texts, request):
+        start_time = time.perf_counter()
+        for text in texts:
+            parser(text, request, request.user)
+        return len(texts) / (time.perf_counter() - start_time)
+
+
+def get_benchmark_texts(posts, sentences):
+    corpus = EnglishCorpus()
+    usernames = list(User.objects.values_list("username", flat=True)[:50])
+    usernames.append("Nonexisting")
+
+    texts = []
+    for _ in range(posts):
+        paragraphs = []
+        for sentence in corpus.random_sentences(sentences):
+            if random.randint(0, 100) > 90:
+                sentence += " @%s" % random.choice(usernames)
+            if random.randint(0, 100) > 90:
+                sentence += " http://example.com/t/thread/%s/" % random.randint(1, 100)
+            if random.randint(0, 100) > 80:
+                sentence = "**%s**" % sentence
+            paragraphs.append(sentence)
+        texts.append("\n\n".join(paragraphs))
+    return texts
+
+
+def parse_multipass(text, request, poster):
+    """parse() as it was before it started to reuse single DOM for all steps"""
+    md = md_factory()
+    result = {
+        "original_text": text,
+        "parsed_text": md.convert(text).strip(),
+        "markdown": md,
+        "mentions": [],
+        "images": [],
+        "internal_links": [],
+        "outgoing_links": [],
+    }
+
+    linkify_paragraphs(result)
+    result = pipeline.process_result(result)
+    add_mentions(request, result)
+    clean_links(request, result)
+    minify_result(result)
+    return result
@@ -12,50 +12,68 @@ def add_mentions(request, result):
     if "@" not in result["parsed_text"]:
         return
 
-    mentions_dict = {}
-
     soup = BeautifulSoup(result["parsed_text"], "html5lib")
+    add_mentions_to_soup(request, result, soup)
+    result["parsed_text"] = str(soup.body)[6:-7].strip()
+
+
+def add_mentions_to_soup(request, result, soup):
+    # Elements are visited grouped by their tag names, in SUPPORTED_TAGS order
+    elements = soup.find_all(SUPPORTED_TAGS)
+    elements.sort(key=lambda element: SUPPORTED_TAGS.index(element.name))
 
-    elements = []
-    for tagname in SUPPORTED_TAGS:
-        if tagname in result["parsed_text"]:
-            elements += soup.find_all(tagname)
+    strings = []
     for element in elements:
-        add_mentions_to_element(request, element, mentions_dict)
+        find_strings_with_mentions(element, strings)
+
+    usernames = get_mentioned_usernames(strings)
+    mentions_dict = get_mentioned_users(request, usernames)
+    for string in strings:
+        parse_string(string, mentions_dict)
 
-    result["parsed_text"] = str(soup.body)[6:-7].strip()
     result["mentions"] = list(filter(bool, mentions_dict.values()))
 
 
-def add_mentions_to_element(request, element, mentions_dict):
+def find_strings_with_mentions(element, strings):
     for item in element.contents:
         if item.name:
             if item.name != "a":
-                add_mentions_to_element(request, item, mentions_dict)
-        elif "@" in item.string:
-            parse_string(request, item, mentions_dict)
+                find_strings_with_mentions(item, strings)
+        elif "@" in item.string and not any(s is item for s in strings):
+            strings.append(item)
 
 
-def parse_string(request, element, mentions_dict):
-    User = get_user_model()
+def get_mentioned_usernames(strings):
+    usernames = []
+    for string in strings:
+        for match in USERNAME_RE.finditer(string):
+            username = match.group(0)[1:].strip().lower()
+            if username not in usernames:
+                usernames.append(username)
+                if len(usernames) >= MENTIONS_LIMIT:
+                    return usernames
+    return usernames
 
-    def replace_mentions(matchobj):
-        if len(mentions_dict) >= MENTIONS_LIMIT:
-            return matchobj.group(0)
 
-        username = matchobj.group(0)[1:].strip().lower()
+def get_mentioned_users(request, usernames):
+    mentions_dict = dict.fromkeys(usernames)
+    if request.user.slug in mentions_dict:
+        mentions_dict[request.user.slug] = request.user
+
+    slugs = [username for username, user in mentions_dict.items() if not user]
+    if slugs:
+        User = get_user_model()
+        for user in User.objects.filter(slug__in=slugs):
+            mentions_dict[user.slug] = user
+
+    return mentions_dict
 
-        if username not in mentions_dict:
-            if username == request.user.slug:
-                mentions_dict[username] = request.user
-            else:
-                try:
-                    mentions_dict[username] = User.objects.get(slug=username)
-                except User.DoesNotExist:
-                    mentions_dict[username] = None
-
-        if mentions_dict[username]:
-            user = mentions_dict[username]
+
+def parse_string(element, mentions_dict):
+    def replace_mentions(matchobj):
+        username = matchobj.group(0)[1:].strip().lower()
+        user = mentions_dict.get(username)
+        if user:
             return '<a href="%s">@%s</a>' % (user.get_absolute_url(), user.username)
 
         # we've failed to resolve user for username
@@ -1,9 +1,11 @@
+from threading import local
+
 import bleach
 import markdown
 from bs4 import BeautifulSoup
 from django.http import Http404
 from django.urls import resolve
-from htmlmin.minify import html_minify
+from htmlmin.minify import html_minify, space_minify
 from markdown.extensions.fenced_code import FencedCodeExtension
 
 from ..conf import settings
@@ -14,11 +16,13 @@ from .bbcode.quote import QuoteExtension
 from .bbcode.spoiler import SpoilerExtension
 from .md.shortimgs import ShortImagesExtension
 from .md.strikethrough import StrikethroughExtension
-from .mentions import add_mentions
+from .mentions import add_mentions_to_soup
 from .pipeline import pipeline
 
 MISAGO_ATTACHMENT_VIEWS = ("misago:attachment", "misago:attachment-thumbnail")
 
+_markdown_pool = local()
+
 
 def parse(
     text,
@@ -41,7 +45,7 @@ def parse(
 
     Returns dict object
     """
-    md = md_factory(
+    md = get_markdown(
         allow_links=allow_links, allow_images=allow_images, allow_blocks=allow_blocks
     )
 
@@ -64,19 +68,45 @@ def parse(
     if allow_links:
         linkify_paragraphs(parsing_result)
 
-    parsing_result = pipeline.process_result(parsing_result)
+    # Build single DOM that all further processing steps operate on
+    soup = BeautifulSoup(parsing_result["parsed_text"], "html5lib")
+
+    pipeline.process_soup(parsing_result, soup)
 
-    if allow_mentions:
-        add_mentions(request, parsing_result)
+    if allow_mentions and "@" in parsing_result["parsed_text"]:
+        add_mentions_to_soup(request, parsing_result, soup)
 
     if allow_links or allow_images:
-        clean_links(request, parsing_result, force_shva)
+        clean_links_in_soup(request, parsing_result, soup, force_shva)
 
     if minify:
-        minify_result(parsing_result)
+        space_minify(soup.body)
+
+    # [6:-7] trims <body></body> wrap
+    parsing_result["parsed_text"] = str(soup.body)[6:-7].strip()
     return parsing_result
 
 
+def get_markdown(allow_links=True, allow_images=True, allow_blocks=True):
+    """returns reset markdown object from current thread's pool"""
+    try:
+        engines = _markdown_pool.engines
+    except AttributeError:
+        engines = _markdown_pool.engines = {}
+
+    key = (allow_links, allow_images, allow_blocks)
+    if key not in engines:
+        engines[key] = md_factory(
+            allow_links=allow_links,
+            allow_images=allow_images,
+            allow_blocks=allow_blocks,
+        )
+    else:
+        engines[key].reset()
+
+    return engines[key]
+
+
 def md_factory(allow_links=True, allow_images=True, allow_blocks=True):
     """creates and configures markdown object"""
     md = markdown.Markdown(extensions=["markdown.extensions.nl2br"])
@@ -156,9 +186,16 @@ def linkify_paragraphs(result):
 
 
 def clean_links(request, result, force_shva=False):
+    soup = BeautifulSoup(result["parsed_text"], "html5lib")
+    clean_links_in_soup(request, result, soup, force_shva)
+
+    # [6:-7] trims <body></body> wrap
+    result["parsed_text"] = str(soup.body)[6:-7]
+
+
+def clean_links_in_soup(request, result, soup, force_shva=False):
     host = request.get_host()
 
-    soup = BeautifulSoup(result["parsed_text"], "html5lib")
     for link in soup.find_all("a"):
         if is_internal_link(link["href"], host):
             link["href"] = clean_internal_link(link["href"], host)
@@ -182,9 +219,6 @@ def clean_links(request, result, force_shva=False):
             result["images"].append(clean_link_prefix(img["src"]))
             img["src"] = assert_link_prefix(img["src"])
 
-    # [6:-7] trims <body></body> wrap
-    result["parsed_text"] = str(soup.body)[6:-7]
-
 
 def is_internal_link(link, host):
     if link.startswith("/") and not link.startswith("//"):
@@ -23,6 +23,13 @@ class MarkupPipeline:
 
     def process_result(self, result):
         soup = BeautifulSoup(result["parsed_text"], "html5lib")
+        self.process_soup(result, soup)
+
+        souped_text = str(soup.body).strip()[6:-7]
+        result["parsed_text"] = souped_text.strip()
+        return result
+
+    def process_soup(self, result, soup):
         for extension in settings.MISAGO_MARKUP_EXTENSIONS:
             module = import_module(extension)
             if hasattr(module, "clean_parsed"):
@@ -32,9 +39,5 @@ class MarkupPipeline:
         for extension in hooks.parsing_result_processors:
             extension(result, soup)
 
-        souped_text = str(soup.body).strip()[6:-7]
-        result["parsed_text"] = souped_text.strip()
-        return result
-
 
 pipeline = MarkupPipeline()
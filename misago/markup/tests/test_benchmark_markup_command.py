@@ -0,0 +1,18 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from ..management.commands import benchmarkmarkup
+from ..parser import parse
+
+
+def test_management_command_benchmarks_parser(user):
+    stdout = StringIO()
+    call_command(benchmarkmarkup.Command(), 2, sentences=3, stdout=stdout)
+    assert "Speedup:" in stdout.getvalue()
+
+
+def test_multipass_parser_gives_same_result_as_parser(user, request_mock):
+    text = "Hello @%s, see http://example.com/t/1/\n\n**Lorem  ipsum**" % user.username
+    parsed = benchmarkmarkup.parse_multipass(text, request_mock, user)
+    assert parsed["parsed_text"] == parse(text, request_mock, user)["parsed_text"]
@@ -0,0 +1,35 @@
+from threading import Thread
+
+from ..parser import get_markdown, parse
+
+
+def test_same_markdown_object_is_reused_for_same_flavour():
+    assert get_markdown() is get_markdown()
+
+
+def test_different_markdown_objects_are_used_for_different_flavours():
+    assert get_markdown() is not get_markdown(allow_blocks=False)
+    assert get_markdown(allow_links=False) is not get_markdown(allow_images=False)
+
+
+def test_markdown_objects_are_not_shared_between_threads():
+    markdown_objects = []
+    thread = Thread(target=lambda: markdown_objects.append(get_markdown()))
+    thread.start()
+    thread.join()
+
+    assert markdown_objects[0] is not get_markdown()
+
+
+def test_reused_markdown_object_is_reset(request_mock, user):
+    parse("[quote]Lorem ipsum[/quote]", request_mock, user)
+    md = get_markdown()
+    assert not md.htmlStash.rawHtmlBlocks
+    assert not md.parser.blockprocessors["misago_bbcode_quote"]._children
+
+
+def test_reused_markdown_object_produces_same_results(request_mock, user):
+    text = "[quote]**Lorem**[/quote]\n\n[spoiler]Ipsum[/spoiler]\n\n```\nDolor\n```"
+    first_result = parse(text, request_mock, user)
+    second_result = parse(text, request_mock, user)
+    assert first_result["parsed_text"] == second_result["parsed_text"]
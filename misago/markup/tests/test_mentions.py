@@ -76,3 +76,40 @@ def test_util_handles_text_without_mentions(request_mock):
     add_mentions(request_mock, parsing_result)
     assert parsing_result["parsed_text"] == ("<p>Hello, world!</p>")
     assert parsing_result["mentions"] == []
+
+
+def test_util_resolves_multiple_mentions_with_single_query(
+    request_mock, user, other_user, django_assert_num_queries
+):
+    parsing_result = {
+        "parsed_text": (
+            f"<p>Hello, @{other_user.username} and @Nonexisting!</p>"
+            f"<p>Also @{user.username} and @{other_user.username}!</p>"
+        ),
+        "mentions": [],
+    }
+    with django_assert_num_queries(1):
+        add_mentions(request_mock, parsing_result)
+    assert parsing_result["mentions"] == [other_user, user]
+
+
+def test_util_doesnt_query_db_for_mention_of_request_user(
+    request_mock, user, django_assert_num_queries
+):
+    parsing_result = {"parsed_text": f"<p>Hello, @{user.username}!</p>", "mentions": []}
+    with django_assert_num_queries(0):
+        add_mentions(request_mock, parsing_result)
+    assert parsing_result["mentions"] == [user]
+
+
+def test_util_limits_number_of_resolved_mentions(request_mock, user, mocker):
+    mocker.patch("misago.markup.mentions.MENTIONS_LIMIT", 2)
+    parsing_result = {
+        "parsed_text": f"<p>Hello, @Nonexisting, @Other and @{user.username}!</p>",
+        "mentions": [],
+    }
+    add_mentions(request_mock, parsing_result)
+    assert parsing_result["parsed_text"] == (
+        f"<p>Hello, @Nonexisting, @Other and @{user.username}!</p>"
+    )
+    assert parsing_result["mentions"] == []
@@ -1,6 +1,7 @@
 from ..threads.models import Post, Thread
 from ..threads.permissions import exclude_invisible_posts, exclude_invisible_threads
 from .cutoffdate import get_cutoff_date
+from .watermarks import exclude_read_posts
 
 
 def make_read_aware(request, categories):
@@ -18,17 +19,14 @@ def make_read_aware(request, categories):
     threads = Thread.objects.filter(category__in=categories)
     threads = exclude_invisible_threads(request.user_acl, categories, threads)
 
-    queryset = (
-        Post.objects.filter(
-            category__in=categories,
-            thread__in=threads,
-            posted_on__gt=get_cutoff_date(request.settings, request.user),
-        )
-        .values_list("category", flat=True)
-        .distinct()
+    queryset = Post.objects.filter(
+        category__in=categories,
+        thread__in=threads,
+        posted_on__gt=get_cutoff_date(request.settings, request.user),
     )
 
-    queryset = queryset.exclude(id__in=request.user.postread_set.values("post"))
+    queryset = exclude_read_posts(request.user, queryset)
+    queryset = queryset.values_list("category", flat=True).distinct()
     queryset = exclude_invisible_posts(request.user_acl, categories, queryset)
 
     unread_categories = list(queryset)
@@ -2,7 +2,7 @@ from django.core.management.base import BaseCommand
 
 from ....conf.shortcuts import get_dynamic_settings
 from ...cutoffdate import get_cutoff_date
-from ...models import PostRead
+from ...models import PostRead, ThreadRead
 
 
 class Command(BaseCommand):
@@ -10,11 +10,19 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         settings = get_dynamic_settings()
-        queryset = PostRead.objects.filter(last_read_on__lt=get_cutoff_date(settings))
-        deleted_count = queryset.count()
+        cutoff_date = get_cutoff_date(settings)
+
+        # Watermarks older than cutoff date are no longer affecting anything
+        querysets = [
+            PostRead.objects.filter(last_read_on__lt=cutoff_date),
+            ThreadRead.objects.filter(read_until__lt=cutoff_date),
+        ]
+
+        deleted_count = 0
+        for queryset in querysets:
+            deleted_count += queryset.delete()[0]
 
         if deleted_count:
-            queryset.delete()
             message = "\n\nDeleted %s expired entries" % deleted_count
         else:
             message = "\n\nNo expired entries were found"
@@ -0,0 +1,83 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from ....core.management.progressbar import show_progress
+from ....core.pgutils import chunk_ids_ranges
+from ...models import PostRead, ThreadRead
+
+User = get_user_model()
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = "Migrates per-post read tracker entries to per-thread watermarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            help="number of ids in single batch of users to migrate",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--delete",
+            help="delete per-post entries after they have been migrated",
+            action="store_true",
+        )
+
+    def handle(self, *args, **options):
+        if not PostRead.objects.exists():
+            self.stdout.write("\n\nNo entries were found")
+            return
+
+        batches = chunk_ids_ranges(User.objects.all(), options["batch_size"])
+        batches_count = len(batches)
+
+        self.stdout.write(
+            "Migrating read tracker entries in %s batches...\n" % batches_count
+        )
+
+        migrated_count = 0
+        show_progress(self, 0, batches_count)
+        start_time = time.time()
+
+        for batch_no, (start_id, end_id) in enumerate(batches, start=1):
+            migrated_count += migrate_users_reads(start_id, end_id, options["delete"])
+            show_progress(self, batch_no, batches_count, start_time)
+
+        self.stdout.write("\n\nCreated %s thread watermarks" % migrated_count)
+
+
+def migrate_users_reads(start_id, end_id, delete):
+    queryset = PostRead.objects.filter(user_id__gte=start_id, user_id__lt=end_id)
+
+    # Watermark is set on newest post user has read in thread, so older posts
+    # that user has skipped will be considered read
+    watermarks = (
+        queryset.order_by()
+        .values("user_id", "thread_id", "thread__category_id")
+        .annotate(read_until=Max("post__posted_on"), last_read_on=Max("last_read_on"))
+    )
+
+    thread_reads = [
+        ThreadRead(
+            user_id=watermark["user_id"],
+            thread_id=watermark["thread_id"],
+            category_id=watermark["thread__category_id"],
+            read_until=watermark["read_until"],
+            last_read_on=watermark["last_read_on"],
+        )
+        for watermark in watermarks
+    ]
+
+    # Users watermarks created since new tracker was deployed take precedence
+    ThreadRead.objects.bulk_create(thread_reads, ignore_conflicts=True)
+
+    if delete:
+        queryset.delete()
+
+    return len(thread_reads)
@@ -0,0 +1,60 @@
+# Generated by Django 2.2.12 on 2026-10-18 18:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("misago_categories", "0008_auto_20190518_1659"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("misago_threads", "0012_set_dj_partial_indexes"),
+        ("misago_readtracker", "0004_auto_20171015_2010"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ThreadRead",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("read_until", models.DateTimeField()),
+                (
+                    "last_read_on",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="misago_categories.Category",
+                    ),
+                ),
+                (
+                    "thread",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="misago_threads.Thread",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={"unique_together": {("user", "thread")},},
+        ),
+    ]
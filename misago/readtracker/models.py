@@ -4,8 +4,23 @@ from django.utils import timezone
 
 
 class PostRead(models.Model):
+    """Legacy per-post read tracker, kept for migratereadtracker command"""
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     category = models.ForeignKey("misago_categories.Category", on_delete=models.CASCADE)
     thread = models.ForeignKey("misago_threads.Thread", on_delete=models.CASCADE)
     post = models.ForeignKey("misago_threads.Post", on_delete=models.CASCADE)
     last_read_on = models.DateTimeField(default=timezone.now)
+
+
+class ThreadRead(models.Model):
+    """Posts in thread that were posted on or before read_until are read"""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    category = models.ForeignKey("misago_categories.Category", on_delete=models.CASCADE)
+    thread = models.ForeignKey("misago_threads.Thread", on_delete=models.CASCADE)
+    read_until = models.DateTimeField()
+    last_read_on = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = [["user", "thread"]]
@@ -1,4 +1,8 @@
+from django.utils import timezone
+
 from .cutoffdate import get_cutoff_date
+from .models import ThreadRead
+from .watermarks import get_read_until
 
 
 def make_read_aware(request, posts):
@@ -14,19 +18,19 @@ def make_read_aware(request, posts):
         return
 
     cutoff_date = get_cutoff_date(request.settings, request.user)
-    unresolved_posts = {}
+    unresolved_posts = [post for post in posts if post.posted_on > cutoff_date]
+    if not unresolved_posts:
+        return
 
-    for post in posts:
-        if post.posted_on > cutoff_date:
+    read_until = get_read_until(
+        request.user, {post.thread_id for post in unresolved_posts}
+    )
+
+    for post in unresolved_posts:
+        thread_read_until = read_until.get(post.thread_id)
+        if not thread_read_until or post.posted_on > thread_read_until:
             post.is_read = False
             post.is_new = True
-            unresolved_posts[post.pk] = post
-
-    if unresolved_posts:
-        queryset = request.user.postread_set.filter(post__in=unresolved_posts)
-        for post_id in queryset.values_list("post_id", flat=True):
-            unresolved_posts[post_id].is_read = True
-            unresolved_posts[post_id].is_new = False
 
 
 def make_read(posts):
@@ -36,4 +40,26 @@ def make_read(posts):
 
 
 def save_read(user, post):
-    user.postread_set.create(category=post.category, thread=post.thread, post=post)
+    """Moves user's watermark in post's thread forward to the post"""
+    # Conditional update never moves watermark back when posts are read
+    # concurrently, eg. from many tabs
+    if move_read_until(user, post):
+        return
+
+    _, created = ThreadRead.objects.get_or_create(
+        user=user,
+        thread_id=post.thread_id,
+        defaults={"category_id": post.category_id, "read_until": post.posted_on},
+    )
+    if not created:
+        move_read_until(user, post)  # watermark was created by other request
+
+
+def move_read_until(user, post):
+    return ThreadRead.objects.filter(
+        user=user, thread_id=post.thread_id, read_until__lt=post.posted_on
+    ).update(
+        category_id=post.category_id,
+        read_until=post.posted_on,
+        last_read_on=timezone.now(),
+    )
@@ -1,8 +1,10 @@
+from django.db.models import OuterRef, Subquery
 from django.dispatch import Signal, receiver
 
 from ..categories import PRIVATE_THREADS_ROOT_NAME
 from ..categories.signals import delete_category_content, move_category_content
 from ..threads.signals import merge_post, merge_thread, move_post, move_thread
+from .watermarks import move_watermarks_before
 
 thread_read = Signal(providing_args=["thread"])
 
@@ -10,11 +12,14 @@ thread_read = Signal(providing_args=["thread"])
 @receiver(delete_category_content)
 def delete_category_threads(sender, **kwargs):
     sender.postread_set.all().delete()
+    sender.threadread_set.all().delete()
 
 
 @receiver(move_category_content)
 def move_category_tracker(sender, **kwargs):
-    sender.postread_set.update(category=kwargs["new_category"])
+    new_category = kwargs["new_category"]
+    sender.postread_set.update(category=new_category)
+    sender.threadread_set.update(category=new_category)
 
 
 @receiver(merge_thread)
@@ -22,10 +27,23 @@ def merge_thread_tracker(sender, **kwargs):
     other_thread = kwargs["other_thread"]
     other_thread.postread_set.update(category=sender.category, thread=sender)
 
+    # Merged thread is read until older of both threads watermarks. Users that
+    # have watermark in only one of threads haven't read other thread's posts
+    other_reads = other_thread.threadread_set.filter(user=OuterRef("user"))
+    other_read_until = other_reads.values("read_until")
+    sender.threadread_set.filter(read_until__gt=Subquery(other_read_until)).update(
+        read_until=Subquery(other_read_until)
+    )
+    sender.threadread_set.exclude(
+        user__in=other_thread.threadread_set.values("user")
+    ).delete()
+    other_thread.threadread_set.all().delete()
+
 
 @receiver(move_thread)
 def move_thread_tracker(sender, **kwargs):
     sender.postread_set.update(category=sender.category, thread=sender)
+    sender.threadread_set.update(category=sender.category)
 
 
 @receiver(merge_post)
@@ -37,6 +55,10 @@ def merge_post_delete_tracker(sender, **kwargs):
 def move_post_delete_tracker(sender, **kwargs):
     sender.postread_set.all().delete()
 
+    # Moved post stays unread in new thread for users that have read it past
+    # post's date
+    move_watermarks_before(sender.thread.threadread_set, sender.posted_on)
+
 
 @receiver(thread_read)
 def decrease_unread_private_count(sender, **kwargs):
@@ -150,7 +150,11 @@ def test_category_with_hidden_event_in_read_thread_is_marked_as_read(
 def test_category_with_hidden_event_visible_to_user_in_read_thread_is_marked_as_unread(
     request_mock, read_thread, default_category
 ):
-    request_mock.user_acl["categories"][default_category.id]["can_hide_events"] = 1
+    categories_acl = dict(request_mock.user_acl["categories"])
+    categories_acl[default_category.id] = dict(
+        categories_acl[default_category.id], can_hide_events=1
+    )
+    request_mock.user_acl["categories"] = categories_acl
     reply_thread(read_thread, is_hidden=True, is_event=True)
     make_read_aware(request_mock, default_category)
     assert not default_category.is_read
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ...threads.test import post_thread
+from ..models import ThreadRead
+
+
+def create_thread_read(user, thread, read_until):
+    return ThreadRead.objects.create(
+        user=user, category=thread.category, thread=thread, read_until=read_until
+    )
+
+
+def test_merged_thread_is_read_until_older_of_both_watermarks(
+    user, thread, default_category
+):
+    other_thread = post_thread(default_category)
+    read_until = timezone.now()
+    create_thread_read(user, thread, read_until)
+    create_thread_read(user, other_thread, read_until - timedelta(days=1))
+
+    thread.merge(other_thread)
+
+    assert user.threadread_set.get(thread=thread).read_until == read_until - timedelta(
+        days=1
+    )
+    assert not user.threadread_set.filter(thread=other_thread).exists()
+
+
+def test_merged_thread_watermark_is_deleted_if_other_thread_was_not_read(
+    user, thread, default_category
+):
+    other_thread = post_thread(default_category)
+    create_thread_read(user, thread, timezone.now())
+
+    thread.merge(other_thread)
+
+    assert not user.threadread_set.exists()
+
+
+def test_other_thread_watermark_is_deleted_if_merged_thread_was_not_read(
+    user, thread, default_category
+):
+    other_thread = post_thread(default_category)
+    create_thread_read(user, other_thread, timezone.now())
+
+    thread.merge(other_thread)
+
+    assert not user.threadread_set.exists()
+
+
+def test_merging_threads_keeps_other_users_watermarks(
+    user, other_user, thread, default_category
+):
+    other_thread = post_thread(default_category)
+    create_thread_read(other_user, thread, timezone.now())
+    create_thread_read(other_user, other_thread, timezone.now())
+    create_thread_read(user, other_thread, timezone.now())
+
+    thread.merge(other_thread)
+
+    assert other_user.threadread_set.get().thread == thread
+    assert not user.threadread_set.exists()
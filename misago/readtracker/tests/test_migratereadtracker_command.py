@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.core import management
+
+from ...threads.test import reply_thread
+from ..management.commands import migratereadtracker
+from ..models import PostRead, ThreadRead
+
+
+def call_command(**options):
+    command = migratereadtracker.Command()
+
+    out = StringIO()
+    management.call_command(command, stdout=out, **options)
+    return out.getvalue().strip().splitlines()[-1].strip()
+
+
+def create_post_read(user, post):
+    return PostRead.objects.create(
+        user=user, category=post.category, thread=post.thread, post=post
+    )
+
+
+def test_command_works_if_there_are_no_read_tracker_entries(db):
+    command_output = call_command()
+    assert command_output == "No entries were found"
+
+
+def test_post_reads_are_migrated_to_newest_read_post_watermark(user, thread):
+    reply = reply_thread(thread)
+    newest_reply = reply_thread(thread)
+
+    create_post_read(user, thread.first_post)
+    create_post_read(user, newest_reply)
+
+    command_output = call_command()
+    assert command_output == "Created 1 thread watermarks"
+
+    thread_read = ThreadRead.objects.get(user=user, thread=thread)
+    assert thread_read.category == thread.category
+    assert thread_read.read_until == newest_reply.posted_on
+    assert reply.posted_on < thread_read.read_until
+
+    assert PostRead.objects.count() == 2
+
+
+def test_post_reads_are_migrated_for_each_user(user, other_user, thread):
+    create_post_read(user, thread.first_post)
+    create_post_read(other_user, thread.first_post)
+
+    command_output = call_command(batch_size=1)
+    assert command_output == "Created 2 thread watermarks"
+    assert ThreadRead.objects.filter(thread=thread).count() == 2
+
+
+def test_existing_watermark_is_not_overridden(user, thread):
+    reply = reply_thread(thread)
+    ThreadRead.objects.create(
+        user=user, category=thread.category, thread=thread, read_until=reply.posted_on,
+    )
+
+    create_post_read(user, thread.first_post)
+    call_command()
+
+    thread_read = ThreadRead.objects.get(user=user, thread=thread)
+    assert thread_read.read_until == reply.posted_on
+
+
+def test_post_reads_are_deleted_after_migration_if_option_is_set(user, thread):
+    create_post_read(user, thread.first_post)
+
+    call_command(delete=True)
+    assert ThreadRead.objects.exists()
+    assert not PostRead.objects.exists()
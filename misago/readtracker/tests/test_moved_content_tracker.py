@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ...threads.test import post_thread, reply_thread
+from ..models import ThreadRead
+from ..watermarks import UNREAD_OFFSET
+
+
+def test_moved_post_is_unread_in_new_thread(user, thread, default_category):
+    other_thread = post_thread(default_category)
+    ThreadRead.objects.create(
+        user=user,
+        category=default_category,
+        thread=other_thread,
+        read_until=timezone.now(),
+    )
+
+    post = reply_thread(thread, posted_on=timezone.now() - timedelta(days=1))
+    post.move(other_thread)
+    post.save()
+
+    thread_read = user.threadread_set.get(thread=other_thread)
+    assert thread_read.read_until == post.posted_on - UNREAD_OFFSET
+
+
+def test_moved_post_keeps_older_watermarks(user, thread, default_category):
+    other_thread = post_thread(default_category)
+    read_until = timezone.now() - timedelta(days=2)
+    ThreadRead.objects.create(
+        user=user, category=default_category, thread=other_thread, read_until=read_until
+    )
+
+    post = reply_thread(thread, posted_on=timezone.now() - timedelta(days=1))
+    post.move(other_thread)
+    post.save()
+
+    assert user.threadread_set.get(thread=other_thread).read_until == read_until
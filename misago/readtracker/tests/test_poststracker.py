@@ -4,6 +4,7 @@ import pytest
 from django.utils import timezone
 
 from ...conf.test import override_dynamic_settings
+from ...threads.test import reply_thread
 from ..poststracker import make_read_aware, save_read
 
 
@@ -87,3 +88,30 @@ def test_not_tracked_post_is_marked_as_read_and_not_new_for_anonymous_user(
     make_read_aware(anonymous_request_mock, post)
     assert post.is_read
     assert not post.is_new
+
+
+def test_post_older_than_read_post_is_marked_as_read(request_mock, user, thread):
+    reply = reply_thread(thread)
+    save_read(user, reply)
+
+    post = thread.first_post
+    make_read_aware(request_mock, post)
+    assert post.is_read
+    assert not post.is_new
+
+
+def test_post_newer_than_read_post_is_marked_as_not_read(
+    request_mock, user, read_post, thread
+):
+    reply = reply_thread(thread)
+    make_read_aware(request_mock, reply)
+    assert not reply.is_read
+    assert reply.is_new
+
+
+def test_saving_older_post_read_doesnt_move_watermark_back(user, thread):
+    reply = reply_thread(thread)
+    save_read(user, reply)
+    save_read(user, thread.first_post)
+
+    assert user.threadread_set.get(thread=thread).read_until == reply.posted_on
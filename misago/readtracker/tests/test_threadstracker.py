@@ -99,7 +99,11 @@ def test_read_thread_with_hidden_event_is_marked_as_read(request_mock, read_thre
 def test_read_thread_with_hidden_event_visible_to_user_is_marked_as_unread(
     request_mock, read_thread, default_category
 ):
-    request_mock.user_acl["categories"][default_category.id]["can_hide_events"] = 1
+    categories_acl = dict(request_mock.user_acl["categories"])
+    categories_acl[default_category.id] = dict(
+        categories_acl[default_category.id], can_hide_events=1
+    )
+    request_mock.user_acl["categories"] = categories_acl
     reply_thread(read_thread, is_hidden=True, is_event=True)
     make_read_aware(request_mock, read_thread)
     assert not read_thread.is_read
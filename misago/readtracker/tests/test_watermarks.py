@@ -0,0 +1,42 @@
+from django.utils import timezone
+
+from ...threads.models import Post
+from ...threads.test import reply_thread
+from ..models import ThreadRead
+from ..watermarks import exclude_read_posts, get_read_until
+
+
+def test_read_until_is_empty_for_threads_without_watermarks(user, thread):
+    assert get_read_until(user, [thread.id]) == {}
+
+
+def test_read_until_uses_thread_watermark(user, thread):
+    read_until = timezone.now()
+    ThreadRead.objects.create(
+        user=user, category=thread.category, thread=thread, read_until=read_until
+    )
+
+    assert get_read_until(user, [thread.id]) == {thread.id: read_until}
+
+
+def test_read_until_excludes_other_users_watermarks(user, other_user, thread):
+    ThreadRead.objects.create(
+        user=other_user,
+        category=thread.category,
+        thread=thread,
+        read_until=timezone.now(),
+    )
+
+    assert get_read_until(user, [thread.id]) == {}
+
+
+def test_exclude_read_posts_excludes_posts_up_to_watermark(user, thread):
+    reply = reply_thread(thread)
+    newest_reply = reply_thread(thread)
+
+    ThreadRead.objects.create(
+        user=user, category=thread.category, thread=thread, read_until=reply.posted_on,
+    )
+
+    queryset = exclude_read_posts(user, Post.objects.filter(thread=thread))
+    assert list(queryset) == [newest_reply]
@@ -1,6 +1,7 @@
 from ..threads.models import Post
 from ..threads.permissions import exclude_invisible_posts
 from .cutoffdate import get_cutoff_date
+from .watermarks import exclude_read_posts
 
 
 def make_read_aware(request, threads):
@@ -18,13 +19,9 @@ def make_read_aware(request, threads):
     categories = [t.category for t in threads]
     cutoff_date = get_cutoff_date(request.settings, request.user)
 
-    queryset = (
-        Post.objects.filter(thread__in=threads, posted_on__gt=cutoff_date)
-        .values_list("thread", flat=True)
-        .distinct()
-    )
-
-    queryset = queryset.exclude(id__in=request.user.postread_set.values("post"))
+    queryset = Post.objects.filter(thread__in=threads, posted_on__gt=cutoff_date)
+    queryset = exclude_read_posts(request.user, queryset)
+    queryset = queryset.values_list("thread", flat=True).distinct()
     queryset = exclude_invisible_posts(request.user_acl, categories, queryset)
 
     unread_threads = list(queryset)
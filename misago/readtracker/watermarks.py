@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.db.models import Exists, OuterRef
+
+from .models import ThreadRead
+
+# Watermark is moved this much before post that should remain unread
+UNREAD_OFFSET = timedelta(microseconds=1)
+
+
+def get_read_until(user, threads_ids):
+    """
+    Returns dict of thread ids and dates until which their posts were read
+
+    Threads without watermark are not included in returned dict.
+    """
+    return dict(
+        ThreadRead.objects.filter(user=user, thread_id__in=threads_ids).values_list(
+            "thread_id", "read_until"
+        )
+    )
+
+
+def exclude_read_posts(user, queryset):
+    """Excludes posts posted before user's thread watermark"""
+    thread_reads = ThreadRead.objects.filter(
+        user=user, thread=OuterRef("thread"), read_until__gte=OuterRef("posted_on")
+    )
+
+    return queryset.annotate(is_read_in_thread=Exists(thread_reads)).filter(
+        is_read_in_thread=False
+    )
+
+
+def move_watermarks_before(queryset, posted_on):
+    """
+    Moves watermarks covering posts posted on given date back before it
+
+    Used when posts are moved to other thread, so they don't become read
+    because destination's watermark is newer than them. Other posts posted
+    after that date in destination become unread again too.
+    """
+    return queryset.filter(read_until__gte=posted_on).update(
+        read_until=posted_on - UNREAD_OFFSET
+    )
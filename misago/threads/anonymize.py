@@ -1,5 +1,11 @@
+import json
+
+from django.db import connection
 from django.urls import reverse
 
+from ..core.pgutils import chunk_ids_ranges
+from .models import Post
+
 ANONYMIZABLE_EVENTS = (
     "added_participant",
     "changed_owner",
@@ -9,25 +15,45 @@ ANONYMIZABLE_EVENTS = (
     "removed_participant",
 )
 
+# Size of ids range updated by single query
+ANONYMIZE_BATCH_SIZE = 5000
+
+ANONYMIZE_LAST_LIKES_SQL = """
+UPDATE {table} SET last_likes = (
+    SELECT jsonb_agg(
+        CASE WHEN item -> 'id' = to_jsonb(%s::int)
+        THEN jsonb_build_object('id', NULL, 'username', %s::text)
+        ELSE item END
+        ORDER BY position
+    )
+    FROM jsonb_array_elements(last_likes) WITH ORDINALITY AS likes(item, position)
+)
+WHERE id >= %s AND id < %s AND last_likes @> %s::jsonb
+"""
+
 
-def anonymize_event(user, event):
-    if event.event_type not in ANONYMIZABLE_EVENTS:
-        raise ValueError('event of type "%s" can\'t be ananymized' % event.event_type)
+def anonymize_events(user, batch_size=ANONYMIZE_BATCH_SIZE):
+    queryset = Post.objects.filter(
+        is_event=True,
+        event_type__in=ANONYMIZABLE_EVENTS,
+        event_context__user__id=user.id,
+    )
 
-    event.event_context = {
+    event_context = {
         "user": {"id": None, "username": user.username, "url": reverse("misago:index")}
     }
-    event.save(update_fields=["event_context"])
+
+    for start_id, end_id in chunk_ids_ranges(queryset, batch_size):
+        queryset.filter(id__gte=start_id, id__lt=end_id).update(
+            event_context=event_context
+        )
 
 
-def anonymize_post_last_likes(user, post):
-    cleaned_likes = []
-    for like in post.last_likes:
-        if like["id"] == user.id:
-            cleaned_likes.append({"id": None, "username": user.username})
-        else:
-            cleaned_likes.append(like)
+def anonymize_last_likes(user, batch_size=ANONYMIZE_BATCH_SIZE):
+    """Replaces user's entries in posts last likes with anonymous ones in SQL"""
+    query = ANONYMIZE_LAST_LIKES_SQL.format(table=Post._meta.db_table)
+    user_like = json.dumps([{"id": user.id}])
 
-    if cleaned_likes != post.last_likes:
-        post.last_likes = cleaned_likes
-        post.save(update_fields=["last_likes"])
+    with connection.cursor() as cursor:
+        for start_id, end_id in chunk_ids_ranges(user.liked_post_set, batch_size):
+            cursor.execute(query, [user.id, user.username, start_id, end_id, user_like])
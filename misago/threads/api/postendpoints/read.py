@@ -1,10 +1,34 @@
+from django.utils.translation import gettext as _, ngettext
+from rest_framework import serializers
 from rest_framework.response import Response
 
 from ....readtracker import poststracker, threadstracker
 from ....readtracker.signals import thread_read
+from ...permissions import exclude_invisible_posts
 
 
 def post_read_endpoint(request, thread, post):
+    return save_read(request, thread, post)
+
+
+def posts_read_endpoint(request, thread):
+    serializer = ReadPostsSerializer(
+        data=request.data, context={"settings": request.settings}
+    )
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=400)
+
+    post = get_newest_read_post(request, thread, serializer.validated_data)
+    if not post:
+        threadstracker.make_read_aware(request, thread)
+        return Response({"thread_is_read": thread.is_read})
+
+    return save_read(request, thread, post)
+
+
+def save_read(request, thread, post):
+    # Reading post marks all older posts in thread as read, so reading many
+    # posts at once needs to save only the newest of them
     poststracker.make_read_aware(request, post)
     if post.is_new:
         poststracker.save_read(request.user, post)
@@ -20,3 +44,46 @@ def post_read_endpoint(request, thread, post):
         thread_read.send(request.user, thread=thread)
 
     return Response({"thread_is_read": thread.is_read})
+
+
+def get_newest_read_post(request, thread, data):
+    queryset = exclude_invisible_posts(
+        request.user_acl, thread.category, thread.post_set
+    )
+
+    if data.get("posts"):
+        queryset = queryset.filter(id__in=data["posts"])
+    else:
+        queryset = queryset.filter(id__lte=data["until"])
+
+    post = queryset.order_by("-posted_on", "-id").first()
+    if post:
+        post.category = thread.category
+        post.thread = thread
+    return post
+
+
+class ReadPostsSerializer(serializers.Serializer):
+    posts = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), min_length=1, required=False
+    )
+    until = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_posts(self, data):
+        settings = self.context["settings"]
+        limit = settings.posts_per_page + settings.posts_per_page_orphans
+        if len(data) > limit:
+            message = ngettext(
+                "No more than %(limit)s post can be read at a single time.",
+                "No more than %(limit)s posts can be read at a single time.",
+                limit,
+            )
+            raise serializers.ValidationError(message % {"limit": limit})
+        return data
+
+    def validate(self, data):
+        if not data.get("posts") and not data.get("until"):
+            raise serializers.ValidationError(
+                _("You have to specify posts that were read.")
+            )
+        return data
@@ -21,9 +21,6 @@ class PostingEndpoint:
     EDIT = 2
 
     def __init__(self, request, mode, **kwargs):
-        # we are using lock on user model to protect us from flood
-        request.user.lock()
-
         # build kwargs dict for passing to middlewares
         self.kwargs = kwargs
         self.kwargs.update(
@@ -1,9 +1,8 @@
-from datetime import timedelta
-
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from . import PostingEndpoint, PostingInterrupt, PostingMiddleware
+from ....core.ratelimit import RateLimit, acquire_interval
 
 MIN_POSTING_INTERVAL = 3
 
@@ -25,20 +24,20 @@ class FloodProtectionMiddleware(PostingMiddleware):
                     _("You can't post message so quickly after previous one.")
                 )
 
+        # Protects from posts sent at same time, before last_posted_on is saved
+        if not acquire_interval("posting", self.user.id, MIN_POSTING_INTERVAL):
+            raise PostingInterrupt(
+                _("You can't post message so quickly after previous one.")
+            )
+
         self.user.last_posted_on = timezone.now()
         self.user.update_fields.append("last_posted_on")
 
-        if self.settings.hourly_post_limit:
-            cutoff = now - timedelta(hours=24)
-            if self.is_limit_exceeded(cutoff, self.settings.hourly_post_limit):
-                raise PostingInterrupt(
-                    _("Your account has exceed an hourly post limit.")
-                )
-
-        if self.settings.daily_post_limit:
-            cutoff = now - timedelta(hours=1)
-            if self.is_limit_exceeded(cutoff, self.settings.daily_post_limit):
-                raise PostingInterrupt(_("Your account has exceed a daily post limit."))
+        hourly_limit = RateLimit("hourly_posts", self.settings.hourly_post_limit, 3600)
+        if not hourly_limit.hit(self.user.id):
+            raise PostingInterrupt(_("Your account has exceed an hourly post limit."))
 
-    def is_limit_exceeded(self, cutoff, limit):
-        return self.user.post_set.filter(posted_on__gte=cutoff).count() >= limit
+        daily_limit = RateLimit("daily_posts", self.settings.daily_post_limit, 86400)
+        if not daily_limit.hit(self.user.id):
+            hourly_limit.release(self.user.id)
+            raise PostingInterrupt(_("Your account has exceed a daily post limit."))
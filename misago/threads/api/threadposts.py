@@ -19,7 +19,7 @@ from .postendpoints.merge import posts_merge_endpoint
 from .postendpoints.move import posts_move_endpoint
 from .postendpoints.patch_event import event_patch_endpoint
 from .postendpoints.patch_post import bulk_patch_endpoint, post_patch_endpoint
-from .postendpoints.read import post_read_endpoint
+from .postendpoints.read import post_read_endpoint, posts_read_endpoint
 from .postendpoints.split import posts_split_endpoint
 from .postingendpoint import PostingEndpoint
 
@@ -167,6 +167,11 @@ class ViewSet(viewsets.ViewSet):
         post = self.get_post(request, thread, pk).unwrap()
         return post_read_endpoint(request, thread, post)
 
+    @action(detail=False, methods=["post"], url_path="read", url_name="read")
+    def read_bulk(self, request, thread_pk):
+        thread = self.get_thread(request, thread_pk, subscription_aware=True).unwrap()
+        return posts_read_endpoint(request, thread)
+
     @action(detail=True, methods=["get"], url_name="editor")
     def post_editor(self, request, thread_pk, pk=None):
         thread = self.get_thread(request, thread_pk)
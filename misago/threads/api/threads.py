@@ -119,8 +119,6 @@ class PrivateThreadViewSet(ViewSet):
         if not request.user_acl["can_start_private_threads"]:
             raise PermissionDenied(_("You can't start private threads."))
 
-        request.user.lock()
-
         # Initialize empty instances for new thread
         thread = Thread()
         post = Post(thread=thread)
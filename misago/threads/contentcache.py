@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.utils.translation import get_language
+
+
+def add_cached_content_to_posts(posts):
+    """
+    Sets finalized content and hydrated attachments on posts using shared cache
+
+    Posts that weren't found in cache have their content finalized and stored
+    in cache for next time.
+    """
+    language = get_language()
+    posts_keys = {
+        get_cache_key(post, language): post for post in posts if not post.is_event
+    }
+    if not posts_keys:
+        return
+
+    cached_contents = cache.get_many(posts_keys.keys())
+
+    new_contents = {}
+    for key, post in posts_keys.items():
+        cached_content = cached_contents.get(key)
+        if cached_content:
+            set_post_content(post, cached_content)
+        else:
+            new_contents[key] = get_post_content(post)
+
+    if new_contents:
+        cache.set_many(new_contents)
+
+
+def get_cache_key(post, language):
+    return "post_content_%s_%s_%s" % (post.id, post.checksum, language)
+
+
+def get_post_content(post):
+    return {
+        "content": post.content,
+        "attachments_ids": get_post_attachments_ids(post),
+        "attachments": post.attachments,
+    }
+
+
+def set_post_content(post, cached_content):
+    # pylint: disable=protected-access
+    post._finalised_parsed = cached_content["content"]
+
+    # Attachments may be removed from post without change to its checksum
+    if cached_content["attachments_ids"] == get_post_attachments_ids(post):
+        post._hydrated_attachments_cache = cached_content["attachments"]
+
+
+def get_post_attachments_ids(post):
+    if post.attachments_cache:
+        return [attachment.get("id") for attachment in post.attachments_cache]
+    return []
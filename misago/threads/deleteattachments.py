@@ -0,0 +1,229 @@
+"""
+Garbage collector for attachments and their files in storage
+
+Unused attachments are deleted from database in batches, with single query
+per batch, and their files are deleted from storage afterwards by bounded
+pool of threads, so slow storage backends don't keep database waiting. Each
+batch's files are deleted before next batch is started, and sweep stops on
+first batch which files failed to delete.
+
+Files under attachments directory that no attachment points to are found by
+walking storage and checking found paths against database in batches.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import BoundedSemaphore, Lock
+
+from django.db.models import Q
+
+from .models import Attachment
+
+ATTACHMENTS_DIR = "attachments"
+FILES_FIELDS = ("thumbnail", "image", "file")
+
+DELETE_BATCH_SIZE = 500
+DELETE_WORKERS = 8
+
+logger = logging.getLogger("misago.threads.deleteattachments")
+
+
+class FilesDeleteError(Exception):
+    pass
+
+
+class RateLimiter:
+    """Blocks calling thread to keep calls to wait() under rate per second"""
+
+    def __init__(self, rate=None):
+        self.interval = 1 / rate if rate else 0
+        self.next_call = 0
+
+    def wait(self):
+        if not self.interval:
+            return
+
+        now = time.monotonic()
+        if now < self.next_call:
+            time.sleep(self.next_call - now)
+            now = self.next_call
+        self.next_call = now + self.interval
+
+
+class FilesDeleter:
+    """Deletes files from storage using threads pool
+
+    Up to two deletes per worker are in flight at a time, so deleting many
+    files doesn't queue all of them in memory. Failed deletes are logged as
+    they complete, and raise FilesDeleteError when deleter is flushed.
+    """
+
+    def __init__(self, storage, workers=DELETE_WORKERS, rate=None):
+        self.storage = storage
+        self.workers = workers
+        self.max_in_flight = workers * 2
+        self.rate_limiter = RateLimiter(rate)
+        self.executor = None
+        self.in_flight = BoundedSemaphore(self.max_in_flight)
+        self.lock = Lock()
+        self.failed = []
+
+    def __enter__(self):
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, exc_type, *args):
+        self.executor.shutdown(wait=True)
+        if not exc_type:
+            self.raise_failed()
+
+    def delete(self, name):
+        self.rate_limiter.wait()
+        self.in_flight.acquire()
+        try:
+            future = self.executor.submit(self.storage.delete, name)
+        except Exception:
+            self.in_flight.release()
+            raise
+        future.add_done_callback(partial(self.delete_done, name))
+
+    def delete_done(self, name, future):
+        error = future.exception()
+        if error:
+            logger.error("Failed to delete %s from storage", name, exc_info=error)
+            with self.lock:
+                self.failed.append(name)
+        self.in_flight.release()
+
+    def flush(self):
+        """Waits for deletes in flight and raises if any of them failed"""
+        for _ in range(self.max_in_flight):
+            self.in_flight.acquire()
+        for _ in range(self.max_in_flight):
+            self.in_flight.release()
+        self.raise_failed()
+
+    def raise_failed(self):
+        with self.lock:
+            failed, self.failed = self.failed, []
+        if failed:
+            raise FilesDeleteError(
+                "Failed to delete %s files from storage, eg. %s"
+                % (len(failed), failed[0])
+            )
+
+
+def get_attachments_storage():
+    return Attachment._meta.get_field("file").storage
+
+
+def delete_unused_attachments(
+    cutoff,
+    batch_size=DELETE_BATCH_SIZE,
+    workers=DELETE_WORKERS,
+    rate=None,
+    dry_run=False,
+    progress=None,
+):
+    """
+    Deletes attachments unassociated with any posts uploaded before cutoff
+
+    Optional progress callable is called after every batch with number of
+    attachments deleted so far. Dry run only counts attachments and files.
+    Raises FilesDeleteError after batch which files failed to delete.
+
+    Returns tuple with numbers of deleted attachments and files.
+    """
+    queryset = Attachment.objects.filter(post__isnull=True, uploaded_on__lt=cutoff)
+    queryset = queryset.order_by("id").values_list("id", *FILES_FIELDS)
+
+    deleted_attachments = 0
+    deleted_files = 0
+
+    with FilesDeleter(get_attachments_storage(), workers, rate) as deleter:
+        batch = list(queryset[:batch_size])
+        while batch:
+            ids = [row[0] for row in batch]
+            files = [name for row in batch for name in row[1:] if name]
+
+            if not dry_run:
+                Attachment.objects.filter(id__in=ids).delete()
+                for name in files:
+                    deleter.delete(name)
+                deleter.flush()
+
+            deleted_attachments += len(ids)
+            deleted_files += len(files)
+            if progress:
+                progress(deleted_attachments)
+
+            batch = list(queryset.filter(id__gt=ids[-1])[:batch_size])
+
+    return deleted_attachments, deleted_files
+
+
+def delete_orphaned_files(
+    cutoff,
+    batch_size=DELETE_BATCH_SIZE,
+    workers=DELETE_WORKERS,
+    rate=None,
+    dry_run=False,
+):
+    """
+    Deletes files under attachments directory that no attachment points to
+
+    Files modified after cutoff are kept, as their attachments may still be
+    saved by uploads in progress. Returns number of deleted files.
+    """
+    storage = get_attachments_storage()
+    deleted_files = 0
+
+    with FilesDeleter(storage, workers, rate) as deleter:
+        for batch in get_storage_files_batches(storage, batch_size):
+            for name in get_orphaned_files(batch):
+                if storage.get_modified_time(name) >= cutoff:
+                    continue
+
+                if not dry_run:
+                    deleter.delete(name)
+                deleted_files += 1
+
+            deleter.flush()
+
+    return deleted_files
+
+
+def get_storage_files_batches(storage, batch_size):
+    batch = []
+    for name in walk_storage(storage, ATTACHMENTS_DIR):
+        batch.append(name)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def walk_storage(storage, path):
+    if not storage.exists(path):
+        return
+
+    directories, files = storage.listdir(path)
+    for name in files:
+        yield os.path.join(path, name)
+    for directory in directories:
+        yield from walk_storage(storage, os.path.join(path, directory))
+
+
+def get_orphaned_files(names):
+    query = Q()
+    for field in FILES_FIELDS:
+        query |= Q(**{"%s__in" % field: names})
+
+    used_files = set()
+    for row in Attachment.objects.filter(query).values_list(*FILES_FIELDS):
+        used_files.update(row)
+
+    return [name for name in names if name not in used_files]
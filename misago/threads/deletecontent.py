@@ -0,0 +1,143 @@
+from django.db import transaction
+
+from ..categories.models import Category
+from ..categories.synchronize import synchronize_categories
+from ..readtracker.models import PostRead
+from .models import (
+    Attachment,
+    Poll,
+    PollVote,
+    Post,
+    PostEdit,
+    PostLike,
+    Subscription,
+    Thread,
+)
+from .synchronize import synchronize_threads
+
+DELETE_BATCH_SIZE = 500
+
+
+def delete_user_threads_and_posts(user, batch_size=DELETE_BATCH_SIZE, progress=None):
+    """
+    Deletes threads started and posts posted by user using set-based queries
+
+    Content is deleted in batches, each in its own transaction, and threads
+    and categories that lost posts are synchronized afterwards with aggregate
+    queries. Optional progress callable is called after every batch with
+    numbers of threads and posts deleted so far.
+
+    Returns tuple with numbers of deleted threads and posts.
+    """
+    remove_user_from_last_likes(user, batch_size)
+
+    deleted_threads = 0
+    deleted_posts = 0
+    sync_threads = set()
+    sync_categories = set()
+
+    for batch in get_ids_batches(Thread.objects.filter(starter=user), batch_size):
+        threads = Thread.objects.filter(id__in=batch)
+        sync_categories.update(threads.values_list("category_id", flat=True))
+        deleted_posts += delete_threads(batch)
+        deleted_threads += len(batch)
+        if progress:
+            progress(deleted_threads, deleted_posts)
+
+    for batch in get_ids_batches(Post.objects.filter(poster=user), batch_size):
+        posts = Post.objects.filter(id__in=batch)
+        for thread_id, category_id in posts.values_list("thread_id", "category_id"):
+            sync_threads.add(thread_id)
+            sync_categories.add(category_id)
+        deleted_posts += delete_posts(batch)
+        if progress:
+            progress(deleted_threads, deleted_posts)
+
+    if sync_threads:
+        synchronize_user_threads(sync_threads)
+    if sync_categories:
+        synchronize_categories(Category.objects.filter(id__in=sync_categories))
+
+    return deleted_threads, deleted_posts
+
+
+def get_ids_batches(queryset, batch_size):
+    # Items are deleted before next batch is selected, so every batch is
+    # selected from the start of the queryset
+    queryset = queryset.order_by("-id").values_list("id", flat=True)
+    batch = list(queryset[:batch_size])
+    while batch:
+        yield batch
+        batch = list(queryset[:batch_size])
+
+
+def remove_user_from_last_likes(user, batch_size):
+    queryset = user.liked_post_set.order_by("-id").only("id", "last_likes")
+
+    batch = list(queryset[:batch_size])
+    while batch:
+        cleaned_posts = []
+        for post in batch:
+            cleaned_likes = [i for i in post.last_likes if i["id"] != user.id]
+            if cleaned_likes != post.last_likes:
+                post.last_likes = cleaned_likes
+                cleaned_posts.append(post)
+
+        if cleaned_posts:
+            Post.objects.bulk_update(cleaned_posts, ["last_likes"])
+
+        batch = list(queryset.filter(id__lt=batch[-1].id)[:batch_size])
+
+
+def delete_threads(threads_ids):
+    posts = Post.objects.filter(thread_id__in=threads_ids)
+    attachments = list(Attachment.objects.filter(post__in=posts))
+
+    with transaction.atomic():
+        Subscription.objects.filter(thread_id__in=threads_ids).delete()
+        PollVote.objects.filter(thread_id__in=threads_ids).delete()
+        Poll.objects.filter(thread_id__in=threads_ids).delete()
+        PostLike.objects.filter(thread_id__in=threads_ids).delete()
+        PostEdit.objects.filter(thread_id__in=threads_ids).delete()
+        PostRead.objects.filter(thread_id__in=threads_ids).delete()
+        Attachment.objects.filter(id__in=[a.id for a in attachments]).delete()
+        Thread.objects.filter(id__in=threads_ids).update(
+            first_post=None, last_post=None, best_answer=None
+        )
+        deleted_posts = posts.count()
+        posts.delete()
+        Thread.objects.filter(id__in=threads_ids).delete()
+
+    delete_attachments_files(attachments)
+    return deleted_posts
+
+
+def delete_posts(posts_ids):
+    attachments = list(Attachment.objects.filter(post_id__in=posts_ids))
+
+    with transaction.atomic():
+        PostLike.objects.filter(post_id__in=posts_ids).delete()
+        PostEdit.objects.filter(post_id__in=posts_ids).delete()
+        PostRead.objects.filter(post_id__in=posts_ids).delete()
+        Attachment.objects.filter(id__in=[a.id for a in attachments]).delete()
+        Post.objects.filter(id__in=posts_ids).delete()
+
+    delete_attachments_files(attachments)
+    return len(posts_ids)
+
+
+def delete_attachments_files(attachments):
+    # Files are deleted after transaction is committed, so they are not lost
+    # if deleting attachments from database fails
+    for attachment in attachments:
+        attachment.delete_files()
+
+
+def synchronize_user_threads(threads_ids):
+    threads = list(Thread.objects.filter(id__in=threads_ids))
+    synchronized_threads = synchronize_threads(threads)
+
+    # Threads left without posts are deleted
+    empty_threads = set(threads_ids) - {t.id for t in synchronized_threads}
+    if empty_threads:
+        delete_threads(list(empty_threads))
@@ -0,0 +1,75 @@
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ....categories.models import Category
+from ...models import Thread
+from ...serializers import ThreadsListSerializer
+from ...threadtypes.urltemplates import URLTemplate
+
+
+class Command(BaseCommand):
+    help = "Benchmarks building threads URLs in threads list serializer"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "threads", help="number of threads in list", nargs="?", type=int, default=50
+        )
+        parser.add_argument(
+            "--lists", help="number of lists to serialize", type=int, default=100
+        )
+
+    def handle(self, *args, **options):
+        threads = get_benchmark_threads(options["threads"])
+        lists = range(options["lists"])
+
+        self.stdout.write("Serializing list of %s threads...\n" % len(threads))
+
+        with reversed_urls():
+            reverse_time = self.run_benchmark(threads, lists)
+        self.stdout.write("Reversed URLs: %.4f ms/list" % (reverse_time * 1000))
+
+        template_time = self.run_benchmark(threads, lists)
+        self.stdout.write("URL templates: %.4f ms/list" % (template_time * 1000))
+
+        self.stdout.write("Speedup: %.2fx" % (reverse_time / template_time))
+
+    def run_benchmark(self, threads, lists):
+        start_time = time.perf_counter()
+        for _ in lists:
+            ThreadsListSerializer(threads, many=True).data
+        return (time.perf_counter() - start_time) / len(lists)
+
+
+@contextmanager
+def reversed_urls():
+    """Makes thread types reverse their URLs like they did before templates"""
+    format_url = URLTemplate.format
+    URLTemplate.format = URLTemplate.reverse
+    try:
+        yield
+    finally:
+        URLTemplate.format = format_url
+
+
+def get_benchmark_threads(threads):
+    category = Category.objects.all_categories().first()
+    now = timezone.now()
+
+    return [
+        Thread(
+            id=i,
+            category=category,
+            title="Benchmark thread %s" % i,
+            slug="benchmark-thread-%s" % i,
+            started_on=now,
+            starter_name="Benchmark",
+            starter_slug="benchmark",
+            last_post_on=now,
+            last_poster_name="Benchmark",
+            last_poster_slug="benchmark",
+        )
+        for i in range(1, threads + 1)
+    ]
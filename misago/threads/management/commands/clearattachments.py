@@ -1,18 +1,61 @@
 import time
 from datetime import timedelta
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
 from ....conf.shortcuts import get_dynamic_settings
 from ....core.management.progressbar import show_progress
-from ....core.pgutils import chunk_queryset
+from ...deleteattachments import (
+    DELETE_BATCH_SIZE,
+    DELETE_WORKERS,
+    FilesDeleteError,
+    delete_orphaned_files,
+    delete_unused_attachments,
+)
 from ...models import Attachment
 
 
 class Command(BaseCommand):
     help = "Deletes attachments unassociated with any posts"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=DELETE_BATCH_SIZE,
+            help="Number of attachments deleted from database in single query.",
+        )
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            type=int,
+            default=DELETE_WORKERS,
+            help="Number of threads deleting files from storage.",
+        )
+        parser.add_argument(
+            "--max-deletes-per-second",
+            dest="rate",
+            type=float,
+            default=None,
+            help="Limits number of files deleted from storage every second.",
+        )
+        parser.add_argument(
+            "--orphaned-files",
+            action="store_true",
+            dest="orphaned_files",
+            default=False,
+            help="Also deletes files in storage that no attachment points to.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            default=False,
+            help="Reports numbers of attachments and files without deleting them.",
+        )
+
     def handle(self, *args, **options):
         settings = get_dynamic_settings()
 
@@ -21,22 +64,53 @@ class Command(BaseCommand):
 
         attachments_to_sync = queryset.count()
 
-        if not attachments_to_sync:
-            self.stdout.write("\n\nNo unused attachments were cleared")
+        try:
+            if options["orphaned_files"]:
+                self.clear_orphaned_files(cutoff, options)
+
+            if not attachments_to_sync:
+                self.stdout.write("\n\nNo unused attachments were cleared")
+            else:
+                self.sync_attachments(cutoff, attachments_to_sync, options)
+        except FilesDeleteError as e:
+            raise CommandError(str(e))
+
+    def clear_orphaned_files(self, cutoff, options):
+        deleted_files = delete_orphaned_files(
+            cutoff,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            rate=options["rate"],
+            dry_run=options["dry_run"],
+        )
+
+        if options["dry_run"]:
+            self.stdout.write("%s orphaned files would be deleted" % deleted_files)
         else:
-            self.sync_attachments(queryset, attachments_to_sync)
+            self.stdout.write("Deleted %s orphaned files" % deleted_files)
 
-    def sync_attachments(self, queryset, attachments_to_sync):
+    def sync_attachments(self, cutoff, attachments_to_sync, options):
         self.stdout.write("Clearing %s attachments...\n" % attachments_to_sync)
 
-        cleared_count = 0
-        show_progress(self, cleared_count, attachments_to_sync)
+        show_progress(self, 0, attachments_to_sync)
         start_time = time.time()
 
-        for attachment in chunk_queryset(queryset):
-            attachment.delete()
-
-            cleared_count += 1
+        def progress(cleared_count):
             show_progress(self, cleared_count, attachments_to_sync, start_time)
 
-        self.stdout.write("\n\nCleared %s attachments" % cleared_count)
+        cleared_count, deleted_files = delete_unused_attachments(
+            cutoff,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            rate=options["rate"],
+            dry_run=options["dry_run"],
+            progress=progress,
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(
+                "\n\n%s attachments with %s files would be cleared (dry run)"
+                % (cleared_count, deleted_files)
+            )
+        else:
+            self.stdout.write("\n\nCleared %s attachments" % cleared_count)
@@ -1,42 +1,146 @@
+import json
+import os
 import time
 
-from django.core.management.base import BaseCommand
+from django.contrib.postgres.search import SearchVector
+from django.core.management.base import BaseCommand, CommandError
 
+from ....conf import settings
+from ....core.management.processes import imap_processes
 from ....core.management.progressbar import show_progress
-from ....core.pgutils import chunk_queryset
+from ....core.pgutils import chunk_ids_ranges
 from ...models import Post
 
+DEFAULT_BATCH_SIZE = 1000
+
 
 class Command(BaseCommand):
     help = "Rebuilds posts search"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            help="number of ids in single batch of posts to rebuild",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--processes",
+            help="number of worker processes to use",
+            type=int,
+            default=1,
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "path to file in which rebuild progress is saved, "
+                "enabling interrupted rebuild to be resumed"
+            ),
+        )
+
     def handle(self, *args, **options):
         posts_to_reindex = Post.objects.filter(is_event=False).count()
 
         if not posts_to_reindex:
             self.stdout.write("\n\nNo posts were found")
         else:
-            self.rebuild_posts_search(posts_to_reindex)
+            self.rebuild_posts_search(posts_to_reindex, **options)
+
+    def rebuild_posts_search(
+        self, posts_to_reindex, batch_size, processes, checkpoint, **options
+    ):
+        batches = get_batches(batch_size)
+        completed_batches = load_checkpoint(checkpoint, batch_size)
+        if completed_batches:
+            self.stdout.write(
+                "Resuming rebuild, %s batches were already completed...\n"
+                % len(completed_batches)
+            )
+
+        pending_batches = [b for b in batches if b[0] not in completed_batches]
 
-    def rebuild_posts_search(self, posts_to_reindex):
         self.stdout.write("Rebuilding search for %s posts...\n" % posts_to_reindex)
 
         rebuild_count = 0
-        show_progress(self, rebuild_count, posts_to_reindex)
+        batches_count = len(pending_batches)
+        show_progress(self, 0, batches_count or 1)
         start_time = time.time()
 
-        queryset = Post.objects.select_related("thread").filter(is_event=False)
-        for post in chunk_queryset(queryset):
-            if post.id == post.thread.first_post_id:
-                post.set_search_document(post.thread.title)
-            else:
-                post.set_search_document()
-            post.save(update_fields=["search_document"])
+        for batch_no, (start_id, posts_count) in enumerate(
+            imap_processes(rebuild_posts_search_batch, pending_batches, processes),
+            start=1,
+        ):
+            rebuild_count += posts_count
+            completed_batches.add(start_id)
+            save_checkpoint(checkpoint, batch_size, completed_batches)
+            show_progress(self, batch_no, batches_count, start_time)
+
+        delete_checkpoint(checkpoint)
+
+        total_time = time.time() - start_time
+        total_humanized = time.strftime("%H:%M:%S", time.gmtime(total_time))
+        self.stdout.write(
+            "\n\nRebuild search for %s posts in %s (%.2f posts/s)"
+            % (rebuild_count, total_humanized, rebuild_count / max(total_time, 0.001))
+        )
+
+
+def get_batches(batch_size):
+    queryset = Post.objects.filter(is_event=False)
+    return chunk_ids_ranges(queryset, batch_size)
+
+
+def rebuild_posts_search_batch(batch):
+    start_id, end_id = batch
+    queryset = Post.objects.filter(is_event=False, id__gte=start_id, id__lt=end_id)
+
+    posts = list(
+        queryset.select_related("thread").only(
+            "id", "original", "thread__title", "thread__first_post_id"
+        )
+    )
+
+    for post in posts:
+        if post.id == post.thread.first_post_id:
+            post.set_search_document(post.thread.title)
+        else:
+            post.set_search_document()
+
+    if posts:
+        Post.objects.bulk_update(posts, ["search_document"])
+        queryset.update(
+            search_vector=SearchVector(
+                "search_document", config=settings.MISAGO_SEARCH_CONFIG
+            )
+        )
+
+    return start_id, len(posts)
+
+
+def load_checkpoint(checkpoint, batch_size):
+    if not checkpoint or not os.path.exists(checkpoint):
+        return set()
+
+    with open(checkpoint, "r") as f:
+        data = json.load(f)
+
+    if data["batch_size"] != batch_size:
+        raise CommandError(
+            "Checkpoint was saved for batch size of %s" % data["batch_size"]
+        )
+    return set(data["completed_batches"])
+
+
+def save_checkpoint(checkpoint, batch_size, completed_batches):
+    if not checkpoint:
+        return
 
-            post.update_search_vector()
-            post.save(update_fields=["search_vector"])
+    data = {"batch_size": batch_size, "completed_batches": sorted(completed_batches)}
+    with open("%s.tmp" % checkpoint, "w") as f:
+        json.dump(data, f)
+    os.replace("%s.tmp" % checkpoint, checkpoint)
 
-            rebuild_count += 1
-            show_progress(self, rebuild_count, posts_to_reindex, start_time)
 
-        self.stdout.write("\n\nRebuild search for %s posts" % rebuild_count)
+def delete_checkpoint(checkpoint):
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
@@ -1,35 +1,114 @@
 import time
+from datetime import datetime, time as dt_time
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
+from ....core.management.processes import imap_processes
 from ....core.management.progressbar import show_progress
-from ....core.pgutils import chunk_queryset
+from ....core.pgutils import chunk_ids_ranges
 from ...models import Thread
+from ...synchronize import synchronize_threads
+
+DEFAULT_BATCH_SIZE = 500
 
 
 class Command(BaseCommand):
     help = "Synchronizes threads"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            help="number of ids in single batch of threads to synchronize",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--processes",
+            help="number of worker processes to use",
+            type=int,
+            default=1,
+        )
+        parser.add_argument(
+            "--since",
+            help=(
+                "only synchronize threads with last post posted since this date; "
+                "threads that only had older posts edited, deleted or moved out "
+                "are not selected, synchronize all threads to fix those"
+            ),
+        )
+
     def handle(self, *args, **options):
-        threads_to_sync = Thread.objects.count()
+        since = parse_since(options["since"]) if options["since"] else None
+        queryset = get_threads_queryset(since)
+        threads_to_sync = queryset.count()
 
         if not threads_to_sync:
             self.stdout.write("\n\nNo threads were found")
         else:
-            self.sync_threads(threads_to_sync)
+            self.sync_threads(
+                queryset,
+                threads_to_sync,
+                since,
+                options["batch_size"],
+                options["processes"],
+            )
 
-    def sync_threads(self, threads_to_sync):
+    def sync_threads(self, queryset, threads_to_sync, since, batch_size, processes):
         self.stdout.write("Synchronizing %s threads...\n" % threads_to_sync)
 
+        batches = [
+            (start_id, end_id, since)
+            for start_id, end_id in chunk_ids_ranges(queryset, batch_size)
+        ]
+
         synchronized_count = 0
         show_progress(self, synchronized_count, threads_to_sync)
         start_time = time.time()
 
-        for thread in chunk_queryset(Thread.objects.all()):
-            thread.synchronize()
-            thread.save()
-
-            synchronized_count += 1
-            show_progress(self, synchronized_count, threads_to_sync, start_time)
+        for threads_count in imap_processes(
+            synchronize_threads_batch, batches, processes
+        ):
+            synchronized_count += threads_count
+            show_progress(
+                self,
+                min(synchronized_count, threads_to_sync),
+                threads_to_sync,
+                start_time,
+            )
 
         self.stdout.write("\n\nSynchronized %s threads" % synchronized_count)
+
+
+def get_threads_queryset(since=None):
+    queryset = Thread.objects.all()
+    if since:
+        queryset = queryset.filter(last_post_on__gte=since)
+    return queryset
+
+
+def synchronize_threads_batch(batch):
+    start_id, end_id, since = batch
+    queryset = get_threads_queryset(since).filter(id__gte=start_id, id__lt=end_id)
+    return len(synchronize_threads(list(queryset)))
+
+
+def parse_since(value):
+    try:
+        since = parse_datetime(value)
+        if not since:
+            date = parse_date(value)
+            if date:
+                since = datetime.combine(date, dt_time.min)
+    except ValueError:
+        since = None
+
+    if not since:
+        raise CommandError(
+            "--since should be a date (YYYY-MM-DD) or datetime (YYYY-MM-DD HH:MM)"
+        )
+
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
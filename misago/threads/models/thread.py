@@ -6,6 +6,7 @@ from django.utils.translation import gettext_lazy as _
 
 from ...conf import settings
 from ...core.utils import slugify
+from ..postspages import clear_posts_pages
 
 
 class Thread(models.Model):
@@ -167,6 +168,8 @@ class Thread(models.Model):
         move_thread.send(sender=self)
 
     def synchronize(self):
+        clear_posts_pages([self.id])
+
         try:
             self.has_poll = bool(self.poll)
         except ObjectDoesNotExist:
@@ -239,6 +242,9 @@ class Thread(models.Model):
     def get_post_split_api_url(self):
         return self.thread_type.get_post_split_api_url(self)
 
+    def get_posts_read_api_url(self):
+        return self.thread_type.get_posts_read_api_url(self)
+
     def get_poll_api_url(self):
         return self.thread_type.get_thread_poll_api_url(self)
 
@@ -0,0 +1,31 @@
+from django.db import transaction
+
+from ..readtracker.models import PostRead, ThreadRead
+from .models import Poll, PollVote, Post, PostEdit, PostLike, Subscription, Thread
+
+# Models which rows store category of thread they belong to
+THREAD_CONTENT_MODELS = (
+    Post,
+    PostEdit,
+    PostLike,
+    Poll,
+    PollVote,
+    Subscription,
+    PostRead,
+    ThreadRead,
+)
+
+
+def move_threads(threads_ids, new_category):
+    """
+    Moves threads to other category using single update query per model
+
+    Produces same results as calling thread.move() and thread.save() on every
+    thread. Categories aren't synchronized.
+    """
+    with transaction.atomic():
+        Thread.objects.filter(id__in=threads_ids).update(category=new_category)
+        for model in THREAD_CONTENT_MODELS:
+            model.objects.filter(thread_id__in=threads_ids).update(
+                category=new_category
+            )
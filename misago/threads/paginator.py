@@ -1,4 +1,5 @@
 from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 
 
 class PostsPaginator(Paginator):
@@ -20,3 +21,34 @@ class PostsPaginator(Paginator):
         if top < self.count:
             top += 1
         return self._get_page(self.object_list[bottom:top], number, self)
+
+
+class KeysetPostsPaginator(PostsPaginator):
+    """paginator that seeks to page's first post using map of thread's pages."""
+
+    def __init__(
+        self, object_list, per_page, orphans=0, allow_empty_first_page=True, pages=None
+    ):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.pages = pages
+
+    @cached_property
+    def count(self):
+        return self.pages.count
+
+    def page(self, number):
+        """returns a Page object for the given 1-based page number."""
+        number = self.validate_number(number)
+        if not self.count:
+            return self._get_page(self.object_list.none(), number, self)
+
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        if top < self.count:
+            top += 1
+
+        page_start = self.pages.get_page_start(number)
+        object_list = self.object_list.filter(id__gte=page_start)[: top - bottom]
+        return self._get_page(object_list, number, self)
@@ -7,7 +7,7 @@ from django.utils.translation import ngettext
 from ...acl import algebra
 from ...acl.decorators import return_boolean
 from ...categories.models import Category, CategoryRole
-from ...categories.permissions import get_categories_roles
+from ...categories.permissions import get_categories, get_categories_roles
 from ..models import Post, Thread
 
 __all__nope = [
@@ -59,9 +59,8 @@ def change_permissions_form(role):
 
 def build_acl(acl, roles, key_name):
     categories_roles = get_categories_roles(roles)
-    categories = list(Category.objects.all_categories(include_root=True))
 
-    for category in categories:
+    for category in get_categories():
         category_acl = acl["categories"].get(category.pk, {"can_browse": 0})
         if category_acl["can_browse"]:
             acl["categories"][category.pk] = build_category_acl(
@@ -85,15 +84,15 @@ def build_acl(acl, roles, key_name):
 def build_category_acl(acl, category, categories_roles, key_name):
     category_roles = categories_roles.get(category.pk, [])
 
-    final_acl = {
+    default_acl = {
         "can_mark_best_answers": 0,
         "can_change_marked_answers": 0,
         "best_answer_change_time": 0,
     }
-    final_acl.update(acl)
+    default_acl.update(acl)
 
-    algebra.sum_acls(
-        final_acl,
+    return algebra.sum_roles_acls(
+        default_acl,
         roles=category_roles,
         key=key_name,
         can_mark_best_answers=algebra.greater,
@@ -101,8 +100,6 @@ def build_category_acl(acl, category, categories_roles, key_name):
         best_answer_change_time=algebra.greater_or_zero,
     )
 
-    return final_acl
-
 
 def add_acl_to_thread(user_acl, thread):
     thread.acl.update(
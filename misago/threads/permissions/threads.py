@@ -10,9 +10,10 @@ from ...acl import algebra
 from ...acl.decorators import return_boolean
 from ...acl.models import Role
 from ...acl.objectacl import add_acl_to_obj
+from ...acl.useracl import get_user_acl_memo
 from ...admin.forms import YesNoSwitch
 from ...categories.models import Category, CategoryRole
-from ...categories.permissions import get_categories_roles
+from ...categories.permissions import get_categories, get_categories_roles
 from ..models import Post, Thread
 
 __all__ = [
@@ -251,9 +252,8 @@ def build_acl(acl, roles, key_name):
     )
 
     categories_roles = get_categories_roles(roles)
-    categories = list(Category.objects.all_categories(include_root=True))
 
-    for category in categories:
+    for category in get_categories():
         category_acl = acl["categories"].get(category.pk, {"can_browse": 0})
         if category_acl["can_browse"]:
             category_acl = acl["categories"][category.pk] = build_category_acl(
@@ -271,7 +271,7 @@ def build_acl(acl, roles, key_name):
 def build_category_acl(acl, category, categories_roles, key_name):
     category_roles = categories_roles.get(category.pk, [])
 
-    final_acl = {
+    default_acl = {
         "can_see_all_threads": 0,
         "can_start_threads": 0,
         "can_reply_threads": 0,
@@ -300,10 +300,10 @@ def build_category_acl(acl, category, categories_roles, key_name):
         "require_edits_approval": 0,
         "can_hide_events": 0,
     }
-    final_acl.update(acl)
+    default_acl.update(acl)
 
-    algebra.sum_acls(
-        final_acl,
+    return algebra.sum_roles_acls(
+        default_acl,
         roles=category_roles,
         key=key_name,
         can_see_all_threads=algebra.greater,
@@ -335,8 +335,6 @@ def build_category_acl(acl, category, categories_roles, key_name):
         can_hide_events=algebra.greater,
     )
 
-    return final_acl
-
 
 def add_acl_to_category(user_acl, category):
     category_acl = user_acl["categories"].get(category.pk, {})
@@ -1302,154 +1300,126 @@ def has_time_to_edit_post(user_acl, target):
     return True
 
 
-def exclude_invisible_threads(
-    user_acl, categories, queryset
-):  # pylint: disable=too-many-branches
-    show_all = []
-    show_accepted_visible = []
-    show_accepted = []
-    show_visible = []
-    show_owned = []
-    show_owned_visible = []
-
-    for category in categories:
-        add_acl_to_obj(user_acl, category)
-
-        if not (category.acl["can_see"] and category.acl["can_browse"]):
-            continue
-
-        can_hide = category.acl["can_hide_threads"]
-        if category.acl["can_see_all_threads"]:
-            can_mod = category.acl["can_approve_content"]
-
-            if can_mod and can_hide:
-                show_all.append(category)
-            elif user_acl["is_authenticated"]:
-                if not can_mod and not can_hide:
-                    show_accepted_visible.append(category)
-                elif not can_mod:
-                    show_accepted.append(category)
-                elif not can_hide:
-                    show_visible.append(category)
-            else:
-                show_accepted_visible.append(category)
-        elif user_acl["is_authenticated"]:
-            if can_hide:
-                show_owned.append(category)
-            else:
-                show_owned_visible.append(category)
+def exclude_invisible_threads(user_acl, categories, queryset):
+    visibility = get_categories_visibility(
+        user_acl, categories, "threads_visibility", get_category_threads_visibility
+    )
 
     conditions = None
-    if show_all:
-        conditions = Q(category__in=show_all)
+    for partition in THREADS_VISIBILITY_PARTITIONS:
+        if partition not in visibility:
+            continue
 
-    if show_accepted_visible:
-        if user_acl["is_authenticated"]:
-            condition = Q(
-                Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
-                category__in=show_accepted_visible,
-                is_hidden=False,
-            )
-        else:
-            condition = Q(
-                category__in=show_accepted_visible, is_hidden=False, is_unapproved=False
-            )
+        condition = Q(category__any=visibility[partition])
+        partition_condition = get_threads_partition_condition(user_acl, partition)
+        if partition_condition:
+            condition &= partition_condition
 
         if conditions:
             conditions = conditions | condition
         else:
             conditions = condition
 
-    if show_accepted:
-        condition = Q(
-            Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
-            category__in=show_accepted,
-        )
+    if not conditions:
+        return Thread.objects.none()
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+    return queryset.filter(conditions)
 
-    if show_visible:
-        condition = Q(category__in=show_visible, is_hidden=False)
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+THREADS_VISIBILITY_PARTITIONS = (
+    "show_all",
+    "show_accepted_visible",
+    "show_accepted",
+    "show_visible",
+    "show_owned",
+    "show_owned_visible",
+)
 
-    if show_owned:
-        condition = Q(category__in=show_owned, starter_id=user_acl["user_id"])
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+def get_category_threads_visibility(user_acl, category):
+    partition = get_category_threads_partition(user_acl, category)
+    return (partition,) if partition else ()
 
-    if show_owned_visible:
-        condition = Q(
-            category__in=show_owned_visible,
-            starter_id=user_acl["user_id"],
-            is_hidden=False,
-        )
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+def get_category_threads_partition(user_acl, category):
+    if not (category.acl["can_see"] and category.acl["can_browse"]):
+        return None
 
-    if not conditions:
-        return Thread.objects.none()
+    can_hide = category.acl["can_hide_threads"]
+    if category.acl["can_see_all_threads"]:
+        can_mod = category.acl["can_approve_content"]
 
-    return queryset.filter(conditions)
+        if can_mod and can_hide:
+            return "show_all"
+        if user_acl["is_authenticated"]:
+            if not can_mod and not can_hide:
+                return "show_accepted_visible"
+            if not can_mod:
+                return "show_accepted"
+            if not can_hide:
+                return "show_visible"
+            return None
+        return "show_accepted_visible"
+
+    if user_acl["is_authenticated"]:
+        if can_hide:
+            return "show_owned"
+        return "show_owned_visible"
 
+    return None
 
-def exclude_invisible_posts(user_acl, categories, queryset):
-    if hasattr(categories, "__iter__"):
-        return exclude_invisible_posts_in_categories(user_acl, categories, queryset)
-    return exclude_invisible_posts_in_category(user_acl, categories, queryset)
 
+def get_threads_partition_condition(user_acl, partition):
+    if partition == "show_accepted_visible":
+        if user_acl["is_authenticated"]:
+            return Q(
+                Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
+                is_hidden=False,
+            )
+        return Q(is_hidden=False, is_unapproved=False)
 
-def exclude_invisible_posts_in_categories(
-    user_acl, categories, queryset
-):  # pylint: disable=too-many-branches
-    show_all = []
-    show_approved = []
-    show_approved_owned = []
+    if partition == "show_accepted":
+        return Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False)
 
-    hide_invisible_events = []
+    if partition == "show_visible":
+        return Q(is_hidden=False)
 
-    for category in categories:
-        add_acl_to_obj(user_acl, category)
+    if partition == "show_owned":
+        return Q(starter_id=user_acl["user_id"])
 
-        if category.acl["can_approve_content"]:
-            show_all.append(category.pk)
-        else:
-            if user_acl["is_authenticated"]:
-                show_approved_owned.append(category.pk)
-            else:
-                show_approved.append(category.pk)
+    if partition == "show_owned_visible":
+        return Q(starter_id=user_acl["user_id"], is_hidden=False)
+
+    return None
 
-        if not category.acl["can_hide_events"]:
-            hide_invisible_events.append(category.pk)
+
+def exclude_invisible_posts(user_acl, categories, queryset):
+    if hasattr(categories, "__iter__"):
+        return exclude_invisible_posts_in_categories(user_acl, categories, queryset)
+    return exclude_invisible_posts_in_category(user_acl, categories, queryset)
+
+
+def exclude_invisible_posts_in_categories(user_acl, categories, queryset):
+    visibility = get_categories_visibility(
+        user_acl, categories, "posts_visibility", get_category_posts_visibility
+    )
 
     conditions = None
-    if show_all:
-        conditions = Q(category__in=show_all)
+    if "show_all" in visibility:
+        conditions = Q(category__any=visibility["show_all"])
 
-    if show_approved:
-        condition = Q(category__in=show_approved, is_unapproved=False)
+    if "show_approved" in visibility:
+        condition = Q(category__any=visibility["show_approved"], is_unapproved=False)
 
         if conditions:
             conditions = conditions | condition
         else:
             conditions = condition
 
-    if show_approved_owned:
+    if "show_approved_owned" in visibility:
         condition = Q(
             Q(poster_id=user_acl["user_id"]) | Q(is_unapproved=False),
-            category__in=show_approved_owned,
+            category__any=visibility["show_approved_owned"],
         )
 
         if conditions:
@@ -1457,9 +1427,11 @@ def exclude_invisible_posts_in_categories(
         else:
             conditions = condition
 
-    if hide_invisible_events:
+    if "hide_invisible_events" in visibility:
         queryset = queryset.exclude(
-            category__in=hide_invisible_events, is_event=True, is_hidden=True
+            category__any=visibility["hide_invisible_events"],
+            is_event=True,
+            is_hidden=True,
         )
 
     if not conditions:
@@ -1468,6 +1440,45 @@ def exclude_invisible_posts_in_categories(
     return queryset.filter(conditions)
 
 
+def get_category_posts_visibility(user_acl, category):
+    partitions = []
+
+    if category.acl["can_approve_content"]:
+        partitions.append("show_all")
+    elif user_acl["is_authenticated"]:
+        partitions.append("show_approved_owned")
+    else:
+        partitions.append("show_approved")
+
+    if not category.acl["can_hide_events"]:
+        partitions.append("hide_invisible_events")
+
+    return tuple(partitions)
+
+
+def get_categories_visibility(user_acl, categories, memo_key, get_visibility):
+    """
+    Partitions categories ids by their contents visibility for user
+
+    Category's partitions depend only on user's ACL, so they are memoized for
+    every ACL and categories don't have to be annotated with ACL on next call.
+    """
+    memo = get_user_acl_memo(user_acl).setdefault(memo_key, {})
+
+    visibility = {}
+    for category in categories:
+        try:
+            partitions = memo[category.pk]
+        except KeyError:
+            add_acl_to_obj(user_acl, category)
+            partitions = memo[category.pk] = get_visibility(user_acl, category)
+
+        for partition in partitions:
+            visibility.setdefault(partition, []).append(category.pk)
+
+    return visibility
+
+
 def exclude_invisible_posts_in_category(user_acl, category, queryset):
     add_acl_to_obj(user_acl, category)
 
@@ -0,0 +1,85 @@
+"""
+Posters displayed next to posts on thread pages
+
+Poster's card is kept in shared cache under key made of user's id and ACL
+cache version, which changes together with ranks. Card holds user with its
+rank, and user serialized for thread's posts without status. It is deleted
+from cache when user is saved or deleted, and again after transaction
+commits.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+from ..acl import ACL_CACHE
+from ..users.online.utils import make_users_status_aware_from_cache
+from .serializers import PosterCardSerializer
+
+CACHE_KEY = "misago_poster_card_%s_%s"
+
+User = get_user_model()
+
+
+def add_poster_cards_to_posts(request, posts):
+    """Sets posters on posts using cached cards and computes their status"""
+    posters_ids = {post.poster_id for post in posts if post.poster_id}
+    if not posters_ids:
+        return
+
+    cards = get_poster_cards(posters_ids, request.cache_versions)
+
+    posters = []
+    for card in cards.values():
+        poster = card["user"]
+        poster.serialized_card = card["serialized"]
+        posters.append(poster)
+
+    make_users_status_aware_from_cache(request, posters)
+
+    for post in posts:
+        if post.poster_id:
+            card = cards.get(post.poster_id)
+            post.poster = card["user"] if card else None
+
+
+def get_poster_cards(users_ids, cache_versions):
+    cache_keys = {
+        get_cache_key(user_id, cache_versions): user_id for user_id in users_ids
+    }
+
+    cards = {cache_keys[key]: card for key, card in cache.get_many(cache_keys).items()}
+
+    missing_ids = set(users_ids) - set(cards)
+    if missing_ids:
+        new_cards = build_poster_cards(missing_ids)
+        cache.set_many(
+            {get_cache_key(u, cache_versions): c for u, c in new_cards.items()}
+        )
+        cards.update(new_cards)
+
+    return cards
+
+
+def build_poster_cards(users_ids):
+    queryset = User.objects.filter(id__in=users_ids).select_related("rank")
+
+    cards = {}
+    for user in queryset.defer("password"):
+        cards[user.id] = {
+            "user": user,
+            "serialized": dict(PosterCardSerializer(user).data),
+        }
+    return cards
+
+
+def get_cache_key(user_id, cache_versions):
+    return CACHE_KEY % (user_id, cache_versions[ACL_CACHE])
+
+
+def delete_poster_card(user_id, cache_versions):
+    cache_key = get_cache_key(user_id, cache_versions)
+    cache.delete(cache_key)
+
+    # Delete card again after transaction commits, in case it was rebuilt from
+    # data before change
+    transaction.on_commit(lambda: cache.delete(cache_key))
@@ -0,0 +1,103 @@
+"""
+Map of thread's pages to ids of posts that start them
+
+Map covers thread's approved posts, which are all posts visible to everyone
+in thread without unapproved posts. With it, thread's page can be selected
+with seek on (thread_id, id) index instead of counting posts and skipping
+them with OFFSET.
+
+Map is stored in cache. New replies are appended to it when it's read, and
+it's rebuilt when thread's replies count doesn't match it or it's cleared
+after thread is synchronized.
+"""
+from bisect import bisect_left, bisect_right
+from math import ceil
+
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_KEY = "misago_posts_pages_%s"
+
+
+class PostsPages:
+    def __init__(self, per_page, orphans):
+        self.settings = (per_page, orphans)
+
+        # Last post on page is repeated as first post on next page
+        self.per_page = per_page - 1
+        self.orphans = orphans + 1 if orphans else 0
+
+        self.count = 0
+        self.last_id = 0
+        self.pages_starts = []
+
+    @property
+    def num_pages(self):
+        hits = max(1, self.count - self.orphans)
+        return int(ceil(hits / float(self.per_page)))
+
+    def add_posts(self, posts_ids):
+        for post_id in posts_ids:
+            if self.count % self.per_page == 0:
+                self.pages_starts.append(post_id)
+            self.count += 1
+            self.last_id = post_id
+
+    def get_page_start(self, number):
+        return self.pages_starts[number - 1]
+
+    def get_post_page(self, post):
+        """Returns number of page post or event is displayed on"""
+        if post.is_event:
+            page = bisect_left(self.pages_starts, post.id)
+        else:
+            page = bisect_right(self.pages_starts, post.id)
+        return min(page, self.num_pages)
+
+
+def can_use_posts_pages(thread):
+    return not thread.has_unapproved_posts
+
+
+def get_posts_pages(thread, per_page, orphans):
+    cache_key = CACHE_KEY % thread.id
+    posts_pages = cache.get(cache_key)
+
+    if posts_pages and posts_pages.settings != (per_page, orphans):
+        posts_pages = None
+
+    posts_queryset = get_posts_queryset(thread)
+    is_changed = False
+
+    if posts_pages:
+        new_posts = posts_queryset.filter(id__gt=posts_pages.last_id)
+        new_posts_ids = list(new_posts.values_list("id", flat=True))
+        posts_pages.add_posts(new_posts_ids)
+        is_changed = bool(new_posts_ids)
+
+        # Posts were removed or added without thread being synchronized
+        if posts_pages.count != thread.replies + 1:
+            posts_pages = None
+
+    if not posts_pages:
+        posts_pages = PostsPages(per_page, orphans)
+        posts_pages.add_posts(posts_queryset.values_list("id", flat=True).iterator())
+        is_changed = True
+
+    if is_changed:
+        cache.set(cache_key, posts_pages)
+
+    return posts_pages
+
+
+def get_posts_queryset(thread):
+    return thread.post_set.filter(is_event=False, is_unapproved=False).order_by("id")
+
+
+def clear_posts_pages(threads_ids):
+    cache_keys = [CACHE_KEY % thread_id for thread_id in threads_ids]
+    cache.delete_many(cache_keys)
+
+    # Delete map again after transaction commits, in case it was rebuilt from
+    # data before change
+    transaction.on_commit(lambda: cache.delete_many(cache_keys))
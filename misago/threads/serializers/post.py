@@ -5,7 +5,7 @@ from ...core.serializers import MutableFields
 from ...users.serializers import UserSerializer as BaseUserSerializer
 from ..models import Post
 
-__all__ = ["PostSerializer"]
+__all__ = ["PostSerializer", "PosterCardSerializer", "PosterSerializer"]
 
 UserSerializer = BaseUserSerializer.subset_fields(
     "id",
@@ -21,8 +21,23 @@ UserSerializer = BaseUserSerializer.subset_fields(
 )
 
 
+class PosterSerializer(UserSerializer):
+    def to_representation(self, instance):
+        # Posters from cached cards are already serialized, except for status
+        serialized_card = getattr(instance, "serialized_card", None)
+        if serialized_card is None:
+            return super().to_representation(instance)
+
+        data = serialized_card.copy()
+        data["status"] = self.get_status(instance)
+        return data
+
+
+PosterCardSerializer = PosterSerializer.exclude_fields("status")
+
+
 class PostSerializer(serializers.ModelSerializer, MutableFields):
-    poster = UserSerializer(many=False, read_only=True)
+    poster = PosterSerializer(many=False, read_only=True)
     content = serializers.SerializerMethodField()
     attachments = serializers.SerializerMethodField()
     last_editor = serializers.PrimaryKeyRelatedField(read_only=True)
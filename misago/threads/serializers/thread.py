@@ -119,6 +119,7 @@ class ThreadSerializer(serializers.ModelSerializer, MutableFields):
                 "merge": obj.get_post_merge_api_url(),
                 "move": obj.get_post_move_api_url(),
                 "split": obj.get_post_split_api_url(),
+                "read": obj.get_posts_read_api_url(),
             },
         }
 
@@ -2,12 +2,13 @@ from collections import OrderedDict
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models.signals import pre_delete
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import Signal, receiver
 from django.utils.translation import gettext as _
 
-from ..categories.models import Category
+from ..cache.versions import get_cache_versions
 from ..categories.signals import delete_category_content, move_category_content
+from ..conf import settings
 from ..core.pgutils import chunk_queryset
 from ..users.signals import (
     anonymize_user_data,
@@ -15,8 +16,12 @@ from ..users.signals import (
     delete_user_content,
     username_changed,
 )
-from .anonymize import ANONYMIZABLE_EVENTS, anonymize_event, anonymize_post_last_likes
-from .models import Attachment, Poll, PollVote, Post, PostEdit, PostLike, Thread
+from .anonymize import anonymize_events, anonymize_last_likes
+from .deletecontent import delete_user_threads_and_posts
+from .models import Poll, PostEdit
+from .postercards import delete_poster_card
+from .tasks import propagate_username_change
+from .usernames import update_usernames
 
 delete_post = Signal()
 delete_thread = Signal()
@@ -82,37 +87,8 @@ def move_category_threads(sender, **kwargs):
 
 
 @receiver(delete_user_content)
-def delete_user_threads(sender, **kwargs):
-    recount_categories = set()
-    recount_threads = set()
-
-    for post in chunk_queryset(sender.liked_post_set):
-        cleaned_likes = list(filter(lambda i: i["id"] != sender.id, post.last_likes))
-        if cleaned_likes != post.last_likes:
-            post.last_likes = cleaned_likes
-            post.save(update_fields=["last_likes"])
-
-    for thread in chunk_queryset(sender.thread_set):
-        recount_categories.add(thread.category_id)
-        with transaction.atomic():
-            thread.delete()
-
-    for post in chunk_queryset(sender.post_set):
-        recount_categories.add(post.category_id)
-        recount_threads.add(post.thread_id)
-        with transaction.atomic():
-            post.delete()
-
-    if recount_threads:
-        changed_threads_qs = Thread.objects.filter(id__in=recount_threads)
-        for thread in chunk_queryset(changed_threads_qs):
-            thread.synchronize()
-            thread.save()
-
-    if recount_categories:
-        for category in Category.objects.filter(id__in=recount_categories):
-            category.synchronize()
-            category.save()
+def delete_user_threads(sender, progress=None, **kwargs):
+    delete_user_threads_and_posts(sender, progress=progress)
 
 
 @receiver(archive_user_data)
@@ -175,62 +151,33 @@ def archive_user_polls(sender, archive=None, **kwargs):
 
 @receiver(anonymize_user_data)
 def anonymize_user_in_events(sender, **kwargs):
-    queryset = Post.objects.filter(
-        is_event=True,
-        event_type__in=ANONYMIZABLE_EVENTS,
-        event_context__user__id=sender.id,
-    )
-
-    for event in chunk_queryset(queryset):
-        anonymize_event(sender, event)
+    anonymize_events(sender)
 
 
 @receiver([anonymize_user_data])
 def anonymize_user_in_likes(sender, **kwargs):
-    for post in chunk_queryset(sender.liked_post_set):
-        anonymize_post_last_likes(sender, post)
-
-
-@receiver([anonymize_user_data, username_changed])
-def update_usernames(sender, **kwargs):
-    Thread.objects.filter(starter=sender).update(
-        starter_name=sender.username, starter_slug=sender.slug
-    )
-
-    Thread.objects.filter(last_poster=sender).update(
-        last_poster_name=sender.username, last_poster_slug=sender.slug
-    )
+    anonymize_last_likes(sender)
 
-    Thread.objects.filter(best_answer_marked_by=sender).update(
-        best_answer_marked_by_name=sender.username,
-        best_answer_marked_by_slug=sender.slug,
-    )
 
-    Post.objects.filter(poster=sender).update(poster_name=sender.username)
-
-    Post.objects.filter(last_editor=sender).update(
-        last_editor_name=sender.username, last_editor_slug=sender.slug
-    )
-
-    PostEdit.objects.filter(editor=sender).update(
-        editor_name=sender.username, editor_slug=sender.slug
-    )
+@receiver(anonymize_user_data)
+def anonymize_usernames(sender, **kwargs):
+    # User is deleted after its data is anonymized, so its content can't be
+    # found by its id in deferred task
+    update_usernames(sender.id, sender.username, sender.slug)
 
-    PostLike.objects.filter(liker=sender).update(
-        liker_name=sender.username, liker_slug=sender.slug
-    )
 
-    Attachment.objects.filter(uploader=sender).update(
-        uploader_name=sender.username, uploader_slug=sender.slug
-    )
+@receiver(username_changed)
+def update_usernames_on_change(sender, **kwargs):
+    if settings.MISAGO_DEFER_USERNAME_CHANGES:
+        user_id = sender.id
+        transaction.on_commit(lambda: propagate_username_change.delay(user_id))
+    else:
+        update_usernames(sender.id, sender.username, sender.slug)
 
-    Poll.objects.filter(poster=sender).update(
-        poster_name=sender.username, poster_slug=sender.slug
-    )
 
-    PollVote.objects.filter(voter=sender).update(
-        voter_name=sender.username, voter_slug=sender.slug
-    )
+@receiver([post_delete, post_save], sender=get_user_model())
+def delete_user_poster_card(sender, instance, **kwargs):
+    delete_poster_card(instance.pk, get_cache_versions())
 
 
 @receiver(pre_delete, sender=get_user_model())
@@ -0,0 +1,108 @@
+from django.db.models import Count, Max, Min, Q
+
+from .models import Poll, Post, Thread
+from .postspages import clear_posts_pages
+
+SYNCHRONIZED_FIELDS = [
+    "has_poll",
+    "replies",
+    "has_reported_posts",
+    "has_open_reports",
+    "has_unapproved_posts",
+    "has_hidden_posts",
+    "has_events",
+    "started_on",
+    "first_post",
+    "starter",
+    "starter_name",
+    "starter_slug",
+    "is_unapproved",
+    "is_hidden",
+    "last_post_on",
+    "last_post_is_event",
+    "last_post",
+    "last_poster",
+    "last_poster_name",
+    "last_poster_slug",
+]
+
+
+def synchronize_threads(threads):
+    """
+    Synchronizes list of threads using fixed number of queries
+
+    Produces same results as calling Thread.synchronize() on every thread,
+    but aggregates are computed for whole list at once and saved with single
+    bulk update. Returns list of synchronized threads. Threads without posts
+    are skipped.
+    """
+    threads_ids = [thread.id for thread in threads]
+    if not threads_ids:
+        return []
+
+    clear_posts_pages(threads_ids)
+
+    stats = get_threads_posts_stats(threads_ids)
+    threads_with_polls = set(
+        Poll.objects.filter(thread_id__in=threads_ids).values_list(
+            "thread_id", flat=True
+        )
+    )
+
+    posts_ids = set()
+    for thread_stats in stats.values():
+        posts_ids.add(thread_stats["first_post_id"])
+        if thread_stats["last_post_id"]:
+            posts_ids.add(thread_stats["last_post_id"])
+
+    posts = Post.objects.filter(id__in=posts_ids).select_related("poster")
+    posts = {post.id: post for post in posts}
+
+    synchronized_threads = []
+    for thread in threads:
+        thread_stats = stats.get(thread.id)
+        if not thread_stats:
+            continue
+
+        thread.has_poll = thread.id in threads_with_polls
+        thread.replies = max(thread_stats["posts"] - 1, 0)
+        thread.has_reported_posts = bool(thread_stats["reported_posts"])
+        thread.has_open_reports = bool(
+            thread_stats["reported_posts"] and thread_stats["open_reports"]
+        )
+        thread.has_unapproved_posts = bool(thread_stats["unapproved_posts"])
+        thread.has_hidden_posts = bool(thread_stats["hidden_posts"])
+
+        first_post = posts[thread_stats["first_post_id"]]
+        last_post = posts.get(thread_stats["last_post_id"])
+
+        thread.set_first_post(first_post)
+        thread.set_last_post(last_post or first_post)
+        thread.has_events = bool(last_post and thread_stats["events"])
+
+        synchronized_threads.append(thread)
+
+    if synchronized_threads:
+        Thread.objects.bulk_update(synchronized_threads, SYNCHRONIZED_FIELDS)
+
+    return synchronized_threads
+
+
+def get_threads_posts_stats(threads_ids):
+    queryset = (
+        Post.objects.filter(thread_id__in=threads_ids)
+        .order_by()
+        .values("thread_id")
+        .annotate(
+            posts=Count("id", filter=Q(is_event=False, is_unapproved=False)),
+            reported_posts=Count("id", filter=Q(has_reports=True)),
+            open_reports=Count("id", filter=Q(has_open_reports=True)),
+            unapproved_posts=Count("id", filter=Q(is_unapproved=True)),
+            hidden_posts=Count("id", filter=Q(is_hidden=True)),
+            events=Count("id", filter=Q(is_event=True)),
+            first_post_id=Min("id"),
+            last_post_id=Max("id", filter=Q(is_unapproved=False)),
+        )
+    )
+
+    return {row["thread_id"]: row for row in queryset}
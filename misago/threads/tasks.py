@@ -0,0 +1,142 @@
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.utils import translation
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext as _
+
+from ..acl import useracl
+from ..cache.versions import get_cache_versions
+from ..conf import settings
+from ..conf.shortcuts import get_dynamic_settings
+from ..core.mail import build_mail, send_messages
+from .models import Post
+from .permissions import can_see_post, can_see_thread
+from .usernames import update_usernames
+
+MESSAGES_BATCH_SIZE = 50
+
+User = get_user_model()
+
+
+@shared_task
+def notify_subscribers_on_reply(post_id, previous_last_post_on, language=None):
+    try:
+        post = Post.objects.select_related("thread", "poster").get(pk=post_id)
+    except Post.DoesNotExist:
+        return 0
+
+    if isinstance(previous_last_post_on, str):
+        previous_last_post_on = parse_datetime(previous_last_post_on)
+
+    with translation.override(language or settings.LANGUAGE_CODE):
+        return ReplyNotifications(post).send(previous_last_post_on)
+
+
+@shared_task
+def propagate_username_change(user_id):
+    # Current name is read when task runs, so tasks for quick renames running
+    # out of order still leave newest name denormalized
+    user = User.objects.filter(pk=user_id).values("username", "slug").first()
+    if user:
+        update_usernames(user_id, user["username"], user["slug"])
+
+
+class ReplyNotifications:
+    """Sends e-mails about new reply to users subscribed to its thread.
+
+    Subscribers sharing same roles share ACL, which is built once for every
+    acl_key. Subjects and context shared by all messages are prepared once,
+    and messages are sent in batches, each over single SMTP connection.
+    """
+
+    def __init__(self, post):
+        self.post = post
+        self.thread = post.thread
+        self.sender = post.poster
+
+        self.cache_versions = get_cache_versions()
+        self.acls = {}
+
+        subject_formats = {
+            "user": self.sender.username if self.sender else post.poster_name,
+            "thread": self.thread.title,
+        }
+        self.starter_subject = (
+            _('%(user)s has replied to your thread "%(thread)s"') % subject_formats
+        )
+        self.subscriber_subject = (
+            _('%(user)s has replied to thread "%(thread)s" that you are watching')
+            % subject_formats
+        )
+
+        self.context = {
+            "settings": get_dynamic_settings(),
+            "thread": self.thread,
+            "post": self.post,
+        }
+
+    def send(self, previous_last_post_on):
+        sent_count = 0
+        batch = []
+        for subscriber in self.get_subscribers(previous_last_post_on):
+            if self.subscriber_can_see_post(subscriber):
+                batch.append(self.build_mail(subscriber))
+            if len(batch) == MESSAGES_BATCH_SIZE:
+                send_messages(batch)
+                sent_count += len(batch)
+                batch = []
+
+        if batch:
+            send_messages(batch)
+            sent_count += len(batch)
+
+        return sent_count
+
+    def get_subscribers(self, previous_last_post_on):
+        queryset = (
+            self.thread.subscription_set.filter(
+                send_email=True, last_read_on__gte=previous_last_post_on
+            )
+            .exclude(user_id=self.post.poster_id)
+            .select_related("user")
+        )
+
+        for subscription in queryset.iterator():
+            yield subscription.user
+
+    def subscriber_can_see_post(self, subscriber):
+        user_acl = self.get_subscriber_acl(subscriber)
+        see_thread = can_see_thread(user_acl, self.thread)
+        see_post = can_see_post(user_acl, self.post)
+        return see_thread and see_post
+
+    def get_subscriber_acl(self, subscriber):
+        if subscriber.acl_key not in self.acls:
+            self.acls[subscriber.acl_key] = useracl.get_user_acl(
+                subscriber, self.cache_versions
+            )
+
+        # Roles-based permissions are shared, but user-specific flags are not
+        user_acl = self.acls[subscriber.acl_key].copy()
+        user_acl.update(
+            {
+                "user_id": subscriber.id,
+                "is_staff": subscriber.is_staff,
+                "is_superuser": subscriber.is_superuser,
+            }
+        )
+        return user_acl
+
+    def build_mail(self, subscriber):
+        if subscriber.id == self.thread.starter_id:
+            subject = self.starter_subject
+        else:
+            subject = self.subscriber_subject
+
+        return build_mail(
+            subscriber,
+            subject,
+            "misago/emails/thread/reply",
+            sender=self.sender,
+            context=self.context,
+        )
@@ -28,7 +28,7 @@ default_category_acl = {
 def patch_category_acl(acl_patch=None):
     def patch_acl(_, user_acl):
         category = Category.objects.get(slug="first-category")
-        category_acl = user_acl["categories"][category.id]
+        category_acl = user_acl["categories"][category.id].copy()
         category_acl.update(default_category_acl)
         if acl_patch:
             category_acl.update(acl_patch)
@@ -43,7 +43,7 @@ def patch_other_user_category_acl(acl_patch=None):
             return
 
         category = Category.objects.get(slug="first-category")
-        category_acl = user_acl["categories"][category.id]
+        category_acl = user_acl["categories"][category.id].copy()
         category_acl.update(default_category_acl)
         if acl_patch:
             category_acl.update(acl_patch)
@@ -58,7 +58,6 @@ def patch_other_category_acl(acl_patch=None):
         category_acl = user_acl["categories"][src_category.id].copy()
 
         dst_category = Category.objects.get(slug="other-category")
-        user_acl["categories"][dst_category.id] = category_acl
 
         category_acl.update(default_category_acl)
         if acl_patch:
@@ -72,7 +71,7 @@ def patch_other_category_acl(acl_patch=None):
 def patch_private_threads_acl(acl_patch=None):
     def patch_acl(_, user_acl):
         category = Category.objects.private_threads()
-        category_acl = user_acl["categories"][category.id]
+        category_acl = user_acl["categories"][category.id].copy()
         category_acl.update(default_category_acl)
         if acl_patch:
             category_acl.update(acl_patch)
@@ -89,7 +88,7 @@ def other_user_cant_use_private_threads(user, user_acl):
 def create_category_acl_patch(category_slug, acl_patch):
     def created_category_acl_patch(_, user_acl):
         category = Category.objects.get(slug=category_slug)
-        category_acl = user_acl["categories"].get(category.id, {})
+        category_acl = dict(user_acl["categories"].get(category.id, {}))
         category_acl.update(default_category_acl)
         if acl_patch:
             category_acl.update(acl_patch)
@@ -99,8 +98,13 @@ def create_category_acl_patch(category_slug, acl_patch):
 
 
 def cleanup_patched_acl(user_acl, category_acl, category):
-    visible_categories = user_acl["visible_categories"]
-    browseable_categories = user_acl["browseable_categories"]
+    # User's ACL shares frozen permissions with other users, so patched ones
+    # replace them instead of being changed in place
+    user_acl["categories"] = dict(user_acl["categories"])
+    user_acl["categories"][category.id] = category_acl
+
+    visible_categories = list(user_acl["visible_categories"])
+    browseable_categories = list(user_acl["browseable_categories"])
 
     if not category_acl["can_see"] and category.id in visible_categories:
         visible_categories.remove(category.id)
@@ -117,6 +121,9 @@ def cleanup_patched_acl(user_acl, category_acl, category):
     if category_acl["can_browse"] and category.id not in browseable_categories:
         browseable_categories.append(category.id)
 
+    user_acl["visible_categories"] = visible_categories
+    user_acl["browseable_categories"] = browseable_categories
+
 
 User = get_user_model()
 
@@ -0,0 +1,26 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from ..management.commands import benchmarkthreadsurls
+from ..serializers import ThreadsListSerializer
+
+
+def test_management_command_benchmarks_threads_urls(default_category):
+    stdout = StringIO()
+    call_command(benchmarkthreadsurls.Command(), 2, lists=2, stdout=stdout)
+    assert "Speedup:" in stdout.getvalue()
+
+
+def test_threads_are_serialized_with_same_urls_as_reversed(default_category):
+    threads = benchmarkthreadsurls.get_benchmark_threads(3)
+
+    with benchmarkthreadsurls.reversed_urls():
+        reversed_data = ThreadsListSerializer(threads, many=True).data
+    data = ThreadsListSerializer(threads, many=True).data
+
+    assert data == reversed_data
+    assert data[0]["api"]["index"] == reverse(
+        "misago:api:thread-detail", kwargs={"pk": threads[0].pk}
+    )
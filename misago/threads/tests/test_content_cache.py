@@ -0,0 +1,90 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
+from ..contentcache import add_cached_content_to_posts
+from ..models import Post
+from ..test import reply_thread
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def post_with_attachment(thread):
+    post = reply_thread(thread, message="Lorem ipsum")
+    post.attachments_cache = [
+        {"id": 1, "filename": "test.png", "uploaded_on": timezone.now().isoformat()}
+    ]
+    post.save()
+    return post
+
+
+@pytest.fixture
+def locmem_cache():
+    with override_settings(CACHES=LOCMEM_CACHE):
+        yield cache
+        cache.clear()
+
+
+def test_util_sets_content_on_posts(post):
+    add_cached_content_to_posts([post])
+    assert post.content == post.parsed
+
+
+def test_util_stores_posts_content_in_cache(locmem_cache, post_with_attachment):
+    add_cached_content_to_posts([post_with_attachment])
+
+    post_with_attachment = Post.objects.get(pk=post_with_attachment.pk)
+    post_with_attachment.parsed = "<p>Changed</p>"
+    add_cached_content_to_posts([post_with_attachment])
+
+    assert post_with_attachment.content == "Lorem ipsum"
+    assert post_with_attachment.attachments[0]["filename"] == "test.png"
+
+
+def test_util_uses_single_cache_query_for_all_posts(
+    mocker, locmem_cache, post, post_with_attachment
+):
+    add_cached_content_to_posts([post, post_with_attachment])
+
+    cache_mock = mocker.patch(
+        "misago.threads.contentcache.cache", mocker.Mock(wraps=locmem_cache)
+    )
+    posts = Post.objects.filter(pk__in=[post.pk, post_with_attachment.pk])
+    add_cached_content_to_posts(posts)
+
+    cache_mock.get_many.assert_called_once()
+    cache_mock.set_many.assert_not_called()
+
+
+def test_util_skips_cached_content_for_changed_checksum(
+    locmem_cache, post_with_attachment
+):
+    add_cached_content_to_posts([post_with_attachment])
+
+    post_with_attachment = Post.objects.get(pk=post_with_attachment.pk)
+    post_with_attachment.parsed = "<p>Changed</p>"
+    post_with_attachment.checksum = "changed"
+    add_cached_content_to_posts([post_with_attachment])
+
+    assert post_with_attachment.content == "<p>Changed</p>"
+
+
+def test_util_skips_cached_attachments_for_removed_attachment(
+    locmem_cache, post_with_attachment
+):
+    add_cached_content_to_posts([post_with_attachment])
+
+    post_with_attachment = Post.objects.get(pk=post_with_attachment.pk)
+    post_with_attachment.attachments_cache = None
+    add_cached_content_to_posts([post_with_attachment])
+
+    assert post_with_attachment.attachments == []
+
+
+def test_util_skips_events(mocker, thread):
+    cache_mock = mocker.patch("misago.threads.contentcache.cache")
+    event = reply_thread(thread, is_event=True)
+    add_cached_content_to_posts([event])
+    cache_mock.get_many.assert_not_called()
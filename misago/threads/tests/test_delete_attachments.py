@@ -0,0 +1,227 @@
+import os
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from .. import deleteattachments
+from ..deleteattachments import (
+    FilesDeleteError,
+    FilesDeleter,
+    RateLimiter,
+    delete_orphaned_files,
+    delete_unused_attachments,
+)
+from ..management.commands import clearattachments
+from ..models import Attachment, AttachmentType
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    with override_settings(MEDIA_ROOT=str(tmp_path)):
+        yield tmp_path
+
+
+@pytest.fixture
+def attachment_type(db):
+    return AttachmentType.objects.order_by("id").last()
+
+
+@pytest.fixture
+def cutoff(db):
+    return timezone.now() - timedelta(hours=2)
+
+
+def create_attachment(attachment_type, uploaded_on, post=None):
+    attachment = Attachment(
+        secret=Attachment.generate_new_secret(),
+        post=post,
+        filetype=attachment_type,
+        size=1000,
+        uploaded_on=uploaded_on,
+        uploader_name="User",
+        uploader_slug="user",
+        filename="testfile.zip",
+    )
+    attachment.file.save("testfile.zip", ContentFile(b"test"), save=False)
+    attachment.save()
+    return attachment
+
+
+def create_orphaned_file(media_root, modified_on):
+    path = media_root / "attachments" / "aa" / "bb" / "orphaned.zip"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"test")
+
+    timestamp = modified_on.timestamp()
+    os.utime(str(path), (timestamp, timestamp))
+    return path
+
+
+def old_date():
+    return timezone.now() - timedelta(hours=3)
+
+
+def test_unused_attachments_are_deleted_with_their_files(
+    media_root, attachment_type, cutoff
+):
+    attachment = create_attachment(attachment_type, old_date())
+    path = media_root / attachment.file.name
+
+    assert delete_unused_attachments(cutoff) == (1, 1)
+    assert not Attachment.objects.exists()
+    assert not path.exists()
+
+
+def test_used_and_recent_attachments_are_not_deleted(
+    media_root, attachment_type, cutoff, post
+):
+    used_attachment = create_attachment(attachment_type, old_date(), post)
+    recent_attachment = create_attachment(attachment_type, timezone.now())
+
+    assert delete_unused_attachments(cutoff) == (0, 0)
+    assert (media_root / used_attachment.file.name).exists()
+    assert (media_root / recent_attachment.file.name).exists()
+
+
+def test_unused_attachments_are_deleted_in_batches(
+    mocker, media_root, attachment_type, cutoff
+):
+    for _ in range(5):
+        create_attachment(attachment_type, old_date())
+
+    progress = mocker.Mock()
+    assert delete_unused_attachments(cutoff, batch_size=2, progress=progress) == (5, 5)
+    assert [c[0][0] for c in progress.call_args_list] == [2, 4, 5]
+    assert not Attachment.objects.exists()
+
+
+def test_dry_run_counts_unused_attachments_without_deleting_them(
+    media_root, attachment_type, cutoff
+):
+    attachment = create_attachment(attachment_type, old_date())
+
+    assert delete_unused_attachments(cutoff, dry_run=True) == (1, 1)
+    assert Attachment.objects.exists()
+    assert (media_root / attachment.file.name).exists()
+
+
+def test_old_orphaned_file_is_deleted(media_root, attachment_type, cutoff):
+    attachment = create_attachment(attachment_type, old_date())
+    path = create_orphaned_file(media_root, old_date())
+
+    assert delete_orphaned_files(cutoff) == 1
+    assert not path.exists()
+    assert (media_root / attachment.file.name).exists()
+
+
+def test_recent_orphaned_file_is_not_deleted(media_root, cutoff):
+    path = create_orphaned_file(media_root, timezone.now())
+
+    assert delete_orphaned_files(cutoff) == 0
+    assert path.exists()
+
+
+def test_dry_run_counts_orphaned_files_without_deleting_them(media_root, cutoff):
+    path = create_orphaned_file(media_root, old_date())
+
+    assert delete_orphaned_files(cutoff, dry_run=True) == 1
+    assert path.exists()
+
+
+def test_orphaned_files_are_not_deleted_if_attachments_dir_is_missing(
+    media_root, cutoff
+):
+    assert delete_orphaned_files(cutoff) == 0
+
+
+def test_files_deleter_deletes_files_from_storage(mocker):
+    storage = mocker.Mock()
+    with FilesDeleter(storage, workers=2) as deleter:
+        for i in range(10):
+            deleter.delete("file%s" % i)
+        deleter.flush()
+
+    assert storage.delete.call_count == 10
+
+
+def test_files_deleter_limits_deletes_in_flight(mocker):
+    storage = mocker.Mock()
+    with FilesDeleter(storage, workers=2) as deleter:
+        acquire = mocker.spy(deleter.in_flight, "acquire")
+        deleter.delete("file")
+
+    acquire.assert_called_once()
+    assert deleter.max_in_flight == 4
+
+
+def test_files_deleter_flush_raises_if_file_failed_to_delete(mocker):
+    storage = mocker.Mock()
+    storage.delete.side_effect = IOError("Storage error")
+
+    with pytest.raises(FilesDeleteError):
+        with FilesDeleter(storage, workers=2) as deleter:
+            deleter.delete("file")
+            deleter.flush()
+
+
+def test_unused_attachments_deletion_stops_after_batch_with_failed_deletes(
+    mocker, media_root, attachment_type, cutoff
+):
+    for _ in range(4):
+        create_attachment(attachment_type, old_date())
+
+    storage = mocker.Mock()
+    storage.delete.side_effect = IOError("Storage error")
+    mocker.patch.object(
+        deleteattachments, "get_attachments_storage", return_value=storage
+    )
+
+    with pytest.raises(FilesDeleteError):
+        delete_unused_attachments(cutoff, batch_size=2)
+
+    assert storage.delete.call_count == 2
+    assert Attachment.objects.count() == 2
+
+
+def test_rate_limiter_sleeps_between_calls(mocker):
+    monotonic = mocker.patch.object(deleteattachments.time, "monotonic")
+    monotonic.return_value = 100
+    sleep = mocker.patch.object(deleteattachments.time, "sleep")
+
+    rate_limiter = RateLimiter(4)
+    rate_limiter.wait()
+    sleep.assert_not_called()
+
+    rate_limiter.wait()
+    sleep.assert_called_once_with(0.25)
+
+
+def test_rate_limiter_without_rate_never_sleeps(mocker):
+    sleep = mocker.patch.object(deleteattachments.time, "sleep")
+
+    rate_limiter = RateLimiter()
+    rate_limiter.wait()
+    rate_limiter.wait()
+    sleep.assert_not_called()
+
+
+def test_command_reports_attachments_and_orphaned_files_in_dry_run(
+    media_root, attachment_type
+):
+    attachment = create_attachment(attachment_type, timezone.now() - timedelta(days=2))
+    path = create_orphaned_file(media_root, timezone.now() - timedelta(days=2))
+
+    out = StringIO()
+    call_command(
+        clearattachments.Command(), dry_run=True, orphaned_files=True, stdout=out
+    )
+
+    assert "1 orphaned files would be deleted" in out.getvalue()
+    assert "1 attachments with 1 files would be cleared (dry run)" in out.getvalue()
+    assert Attachment.objects.filter(id=attachment.id).exists()
+    assert path.exists()
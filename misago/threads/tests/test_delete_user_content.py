@@ -0,0 +1,146 @@
+from unittest.mock import Mock
+
+import pytest
+
+from ...readtracker.models import PostRead
+from ..deletecontent import delete_user_threads_and_posts
+from ..models import Attachment, AttachmentType, Post, PostEdit, PostLike, Thread
+from ..test import like_post, post_poll, post_thread, reply_thread
+
+
+def test_user_threads_are_deleted(default_category, user, other_user):
+    thread = post_thread(default_category, poster=user)
+    reply_thread(thread, poster=other_user)
+    post_poll(thread, user)
+
+    delete_user_threads_and_posts(user)
+
+    with pytest.raises(Thread.DoesNotExist):
+        thread.refresh_from_db()
+    assert not Post.objects.filter(thread_id=thread.id).exists()
+
+
+def test_other_users_threads_are_not_deleted(default_category, user, other_user):
+    thread = post_thread(default_category, poster=other_user)
+    delete_user_threads_and_posts(user)
+    thread.refresh_from_db()
+
+
+def test_user_posts_are_deleted_and_threads_are_synchronized(
+    default_category, user, other_user
+):
+    thread = post_thread(default_category, poster=other_user)
+    reply = reply_thread(thread, poster=other_user)
+    user_post = reply_thread(thread, poster=user)
+    thread.synchronize()
+    thread.save()
+
+    delete_user_threads_and_posts(user)
+
+    with pytest.raises(Post.DoesNotExist):
+        user_post.refresh_from_db()
+
+    thread.refresh_from_db()
+    assert thread.replies == 1
+    assert thread.last_post == reply
+
+
+def test_thread_left_without_posts_is_deleted(default_category, user, other_user):
+    thread = post_thread(default_category, poster=other_user)
+    Post.objects.filter(thread=thread).update(poster=user)
+
+    delete_user_threads_and_posts(user)
+
+    with pytest.raises(Thread.DoesNotExist):
+        thread.refresh_from_db()
+
+
+def test_categories_are_synchronized(default_category, user, other_user):
+    thread = post_thread(default_category, poster=other_user)
+    post_thread(default_category, poster=user)
+    reply_thread(thread, poster=user)
+    default_category.synchronize()
+    default_category.save()
+
+    delete_user_threads_and_posts(user)
+
+    default_category.refresh_from_db()
+    assert default_category.threads == 1
+    assert default_category.posts == 1
+    assert default_category.last_thread == thread
+
+
+def test_deleted_posts_likes_edits_and_reads_are_deleted(
+    default_category, user, other_user
+):
+    thread = post_thread(default_category, poster=other_user)
+    post = reply_thread(thread, poster=user)
+    like_post(post, other_user)
+    PostEdit.objects.create(
+        category=default_category,
+        thread=thread,
+        post=post,
+        editor=other_user,
+        editor_name=other_user.username,
+        editor_slug=other_user.slug,
+        edited_from="old",
+        edited_to="new",
+    )
+    PostRead.objects.create(
+        user=other_user, category=default_category, thread=thread, post=post
+    )
+
+    delete_user_threads_and_posts(user)
+
+    assert not PostLike.objects.filter(post_id=post.id).exists()
+    assert not PostEdit.objects.filter(post_id=post.id).exists()
+    assert not PostRead.objects.filter(post_id=post.id).exists()
+
+
+def test_deleted_posts_attachments_are_deleted(default_category, user, other_user):
+    thread = post_thread(default_category, poster=other_user)
+    post = reply_thread(thread, poster=user)
+    attachment = Attachment.objects.create(
+        secret=Attachment.generate_new_secret(),
+        filetype=AttachmentType.objects.order_by("id").last(),
+        post=post,
+        uploader=user,
+        uploader_name=user.username,
+        uploader_slug=user.slug,
+        filename="test.txt",
+    )
+
+    delete_user_threads_and_posts(user)
+
+    with pytest.raises(Attachment.DoesNotExist):
+        attachment.refresh_from_db()
+
+
+def test_user_is_removed_from_other_posts_last_likes(
+    default_category, user, other_user
+):
+    thread = post_thread(default_category, poster=other_user)
+    post = reply_thread(thread, poster=other_user)
+    like_post(post, other_user)
+    like_post(post, user)
+
+    delete_user_threads_and_posts(user)
+
+    post.refresh_from_db()
+    assert post.last_likes == [{"id": other_user.id, "username": other_user.username}]
+
+
+def test_content_is_deleted_in_batches_with_progress_reported(
+    default_category, user, other_user
+):
+    thread = post_thread(default_category, poster=other_user)
+    for _ in range(3):
+        post_thread(default_category, poster=user)
+        reply_thread(thread, poster=user)
+
+    progress = Mock()
+    result = delete_user_threads_and_posts(user, batch_size=2, progress=progress)
+
+    assert result == (3, 6)
+    assert progress.call_count == 4
+    progress.assert_called_with(3, 6)
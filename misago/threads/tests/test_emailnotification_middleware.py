@@ -1,9 +1,12 @@
 from datetime import timedelta
+from unittest.mock import Mock, patch
 
 from django.core import mail
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.encoding import smart_str
+from django.utils.translation import get_language
 
 from ...conf.test import override_dynamic_settings
 from .. import test
@@ -189,3 +192,37 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
 
         last_post = self.thread.post_set.order_by("id").last()
         self.assertIn(last_post.get_absolute_url(), message)
+
+    @override_settings(MISAGO_DEFER_NOTIFICATIONS=True)
+    @patch_category_acl({"can_reply_threads": True})
+    def test_notifications_are_deferred_to_task(self):
+        """notifications task is queued after posting transaction commits"""
+        self.other_user.subscription_set.create(
+            thread=self.thread,
+            category=self.category,
+            last_read_on=timezone.now(),
+            send_email=True,
+        )
+
+        notify_task = Mock()
+        with patch(
+            "misago.threads.api.postingendpoint.emailnotification.transaction.on_commit"
+        ) as on_commit:
+            with patch(
+                "misago.threads.api.postingendpoint.emailnotification."
+                "notify_subscribers_on_reply",
+                notify_task,
+            ):
+                response = self.client.post(
+                    self.api_link, data={"post": "This is test response!"}
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(mail.outbox), 0)
+                notify_task.delay.assert_not_called()
+
+                on_commit.call_args[0][0]()
+
+        last_post = self.thread.post_set.order_by("id").last()
+        notify_task.delay.assert_called_once_with(
+            last_post.id, self.thread.last_post_on.isoformat(), get_language()
+        )
@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+from ...acl.objectacl import add_acl_to_obj
+from ...categories.models import Category
+from ..models import Post, Thread
+from ..permissions import exclude_invisible_posts, exclude_invisible_threads
+
+
+def get_categories():
+    return list(Category.objects.all_categories())
+
+
+def test_invisible_threads_are_excluded(
+    user_acl, thread, hidden_thread, unapproved_thread
+):
+    queryset = exclude_invisible_threads(user_acl, get_categories(), Thread.objects)
+    assert list(queryset) == [thread]
+
+
+def test_invisible_posts_are_excluded(user_acl, thread, unapproved_thread):
+    queryset = exclude_invisible_posts(user_acl, get_categories(), Post.objects)
+    assert list(queryset) == [thread.first_post]
+
+
+def test_threads_visibility_is_checked_with_categories_ids_array(user_acl):
+    queryset = exclude_invisible_threads(user_acl, get_categories(), Thread.objects)
+    assert "= ANY(" in str(queryset.query)
+
+
+def test_posts_visibility_is_checked_with_categories_ids_array(user_acl):
+    queryset = exclude_invisible_posts(user_acl, get_categories(), Post.objects)
+    assert "= ANY(" in str(queryset.query)
+
+
+def test_categories_visibility_is_memoized_for_acl(user_acl):
+    with patch(
+        "misago.threads.permissions.threads.add_acl_to_obj", wraps=add_acl_to_obj
+    ) as add_acl:
+        exclude_invisible_threads(user_acl, get_categories(), Thread.objects)
+        assert add_acl.call_count
+
+        add_acl.reset_mock()
+        exclude_invisible_threads(user_acl, get_categories(), Thread.objects)
+        add_acl.assert_not_called()
+
+
+def test_categories_visibility_is_not_memoized_for_modified_acl(user_acl):
+    user_acl["is_modified"] = True
+
+    with patch(
+        "misago.threads.permissions.threads.add_acl_to_obj", wraps=add_acl_to_obj
+    ) as add_acl:
+        exclude_invisible_threads(user_acl, get_categories(), Thread.objects)
+        add_acl.reset_mock()
+        exclude_invisible_threads(user_acl, get_categories(), Thread.objects)
+        assert add_acl.call_count
@@ -1,9 +1,11 @@
 from datetime import timedelta
 
 import pytest
+from django.test import override_settings
 from django.utils import timezone
 
 from ...conf.test import override_dynamic_settings
+from ...core.ratelimit import RateLimit
 from ..api.postingendpoint import PostingEndpoint, PostingInterrupt
 from ..api.postingendpoint.floodprotection import FloodProtectionMiddleware
 from ..test import post_thread
@@ -11,6 +13,8 @@ from ..test import post_thread
 default_acl = {"can_omit_flood_protection": False}
 can_omit_flood_acl = {"can_omit_flood_protection": True}
 
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
 
 def test_middleware_lets_users_first_post_through(dynamic_settings, user):
     user.update_fields = []
@@ -89,14 +93,14 @@ def test_middleware_is_not_used_if_user_edits_post(dynamic_settings, user):
     assert not middleware.use_this_middleware()
 
 
+@override_settings(CACHES=LOCMEM_CACHE)
 @override_dynamic_settings(hourly_post_limit=3)
-def test_middleware_interrupts_posting_if_hourly_limit_was_met(
-    default_category, dynamic_settings, user
-):
+def test_middleware_interrupts_posting_if_hourly_limit_was_met(dynamic_settings, user):
     user.update_fields = []
 
+    hourly_limit = RateLimit("hourly_posts", 3, 3600)
     for _ in range(3):
-        post_thread(default_category, poster=user)
+        assert hourly_limit.hit(user.id)
 
     middleware = FloodProtectionMiddleware(
         mode=PostingEndpoint.START,
@@ -106,8 +110,9 @@ def test_middleware_interrupts_posting_if_hourly_limit_was_met(
     )
     assert middleware.use_this_middleware()
 
-    with pytest.raises(PostingInterrupt):
+    with pytest.raises(PostingInterrupt) as excinfo:
         middleware.interrupt_posting(None)
+    assert excinfo.value.message == "Your account has exceed an hourly post limit."
 
 
 @override_dynamic_settings(hourly_post_limit=0)
@@ -148,14 +153,14 @@ def test_middleware_lets_post_through_if_hourly_limit_was_disabled(
     middleware.interrupt_posting(None)
 
 
+@override_settings(CACHES=LOCMEM_CACHE)
 @override_dynamic_settings(daily_post_limit=3)
-def test_middleware_interrupts_posting_if_daily_limit_was_met(
-    default_category, dynamic_settings, user
-):
+def test_middleware_interrupts_posting_if_daily_limit_was_met(dynamic_settings, user):
     user.update_fields = []
 
+    daily_limit = RateLimit("daily_posts", 3, 86400)
     for _ in range(3):
-        post_thread(default_category, poster=user)
+        assert daily_limit.hit(user.id)
 
     middleware = FloodProtectionMiddleware(
         mode=PostingEndpoint.START,
@@ -165,6 +170,43 @@ def test_middleware_interrupts_posting_if_daily_limit_was_met(
     )
     assert middleware.use_this_middleware()
 
+    with pytest.raises(PostingInterrupt) as excinfo:
+        middleware.interrupt_posting(None)
+    assert excinfo.value.message == "Your account has exceed a daily post limit."
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+@override_dynamic_settings(hourly_post_limit=1, daily_post_limit=5)
+def test_middleware_counts_posts_to_limits(dynamic_settings, user):
+    user.update_fields = []
+
+    middleware = FloodProtectionMiddleware(
+        mode=PostingEndpoint.START,
+        settings=dynamic_settings,
+        user=user,
+        user_acl=default_acl,
+    )
+    middleware.interrupt_posting(None)
+
+    assert not RateLimit("hourly_posts", 1, 3600).hit(user.id)
+    assert RateLimit("daily_posts", 2, 86400).hit(user.id)
+    assert not RateLimit("daily_posts", 2, 86400).hit(user.id)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_middleware_interrupts_simultaneous_posts(dynamic_settings, user):
+    user.update_fields = []
+
+    middleware = FloodProtectionMiddleware(
+        mode=PostingEndpoint.START,
+        settings=dynamic_settings,
+        user=user,
+        user_acl=default_acl,
+    )
+    middleware.interrupt_posting(None)
+
+    # Other request loaded user before last_posted_on was saved
+    user.last_posted_on = None
     with pytest.raises(PostingInterrupt):
         middleware.interrupt_posting(None)
 
@@ -0,0 +1,138 @@
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
+from ...cache.versions import get_cache_versions
+from ...users.bans import ban_user
+from ...users.models import BanCache
+from ...users.online.buffer import record_click
+from ..postercards import (
+    add_poster_cards_to_posts,
+    delete_poster_card,
+    get_cache_key,
+    get_poster_cards,
+)
+from ..serializers import PostSerializer, PosterSerializer
+from ..test import post_thread, reply_thread
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def get_request(user, cache_versions):
+    return Mock(
+        user=user,
+        user_acl={"can_see_hidden_users": False},
+        cache_versions=cache_versions,
+    )
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_poster_cards_are_read_from_cache(user, cache_versions):
+    get_poster_cards([user.id], cache_versions)
+
+    cards = get_poster_cards([user.id], cache_versions)
+    assert cards[user.id]["user"] == user
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_cached_poster_cards_are_fetched_without_database_queries(
+    user, cache_versions, django_assert_num_queries
+):
+    get_poster_cards([user.id], cache_versions)
+
+    with django_assert_num_queries(0):
+        get_poster_cards([user.id], cache_versions)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_poster_card_is_deleted_when_user_is_saved(user):
+    cache_versions = get_cache_versions()
+    get_poster_cards([user.id], cache_versions)
+
+    user.title = "Changed"
+    user.save()
+
+    cards = get_poster_cards([user.id], cache_versions)
+    assert cards[user.id]["user"].title == "Changed"
+    assert cards[user.id]["serialized"]["title"] == "Changed"
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_poster_card_is_deleted_again_after_transaction_commits(user, cache_versions):
+    with patch("misago.threads.postercards.transaction.on_commit") as on_commit:
+        delete_poster_card(user.id, cache_versions)
+
+    # Card was rebuilt from data before change by other request
+    get_poster_cards([user.id], cache_versions)
+    on_commit.call_args[0][0]()
+
+    assert cache.get(get_cache_key(user.id, cache_versions)) is None
+
+
+def test_poster_card_is_serialized_same_as_poster(
+    default_category, user, cache_versions
+):
+    thread = post_thread(default_category, poster=user)
+    post = reply_thread(thread, poster=user)
+    request = get_request(user, cache_versions)
+
+    add_poster_cards_to_posts(request, [post])
+    serialized_card = PosterSerializer(post.poster).data
+
+    del post.poster.serialized_card
+    assert dict(serialized_card) == dict(PosterSerializer(post.poster).data)
+
+
+def test_posts_posters_are_set_from_cards(default_category, user, other_user):
+    thread = post_thread(default_category, poster=user)
+    posts = [
+        reply_thread(thread, poster=user),
+        reply_thread(thread, poster=other_user),
+        reply_thread(thread, poster="Guest"),
+    ]
+    request = get_request(user, {"acl": "abcdefgh", "bans": "abcdefgh"})
+
+    add_poster_cards_to_posts(request, posts)
+
+    assert posts[0].poster == user
+    assert posts[1].poster == other_user
+    assert posts[2].poster is None
+
+    data = PostSerializer(posts, many=True, context={"user": user}).data
+    assert data[0]["poster"]["id"] == user.id
+    assert data[0]["poster"]["status"]["is_offline"]
+    assert data[2]["poster"] is None
+
+
+def test_poster_ban_status_is_set_without_writing_ban_cache(
+    default_category, user, other_user, cache_versions
+):
+    ban_user(other_user)
+
+    thread = post_thread(default_category, poster=user)
+    post = reply_thread(thread, poster=other_user)
+    request = get_request(user, cache_versions)
+
+    add_poster_cards_to_posts(request, [post])
+
+    assert post.poster.status["is_banned"]
+    assert not BanCache.objects.exists()
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60, CACHES=LOCMEM_CACHE)
+def test_poster_presence_is_read_from_cached_last_clicks(
+    default_category, user, other_user, cache_versions
+):
+    last_click = timezone.now()
+    record_click(other_user.id, last_click)
+
+    thread = post_thread(default_category, poster=user)
+    post = reply_thread(thread, poster=other_user)
+    request = get_request(user, cache_versions)
+
+    add_poster_cards_to_posts(request, [post])
+
+    assert post.poster.status["is_online"]
+    assert post.poster.status["last_click"] == last_click
@@ -0,0 +1,116 @@
+from itertools import product
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from ..paginator import KeysetPostsPaginator, PostsPaginator
+from ..postspages import can_use_posts_pages, get_posts_pages
+from ..test import post_thread, reply_thread
+
+
+@pytest.fixture(autouse=True)
+def cache(mocker):
+    return mocker.patch(
+        "misago.threads.postspages.cache", LocMemCache("posts-pages", {})
+    )
+
+
+@pytest.fixture
+def long_thread(default_category):
+    thread = post_thread(default_category)
+    for _ in range(20):
+        reply_thread(thread)
+    thread.refresh_from_db()
+    return thread
+
+
+def get_pages_ids(paginator):
+    return [
+        [post.id for post in paginator.page(i).object_list]
+        for i in paginator.page_range
+    ]
+
+
+def test_keyset_paginator_returns_same_pages_as_offset_paginator(long_thread):
+    queryset = long_thread.post_set.order_by("id")
+    for per_page, orphans in product(range(2, 8), range(0, 4)):
+        posts_pages = get_posts_pages(long_thread, per_page, orphans)
+        paginator = KeysetPostsPaginator(queryset, per_page, orphans, pages=posts_pages)
+        offset_paginator = PostsPaginator(queryset, per_page, orphans)
+
+        assert paginator.count == offset_paginator.count
+        assert paginator.num_pages == offset_paginator.num_pages
+        assert get_pages_ids(paginator) == get_pages_ids(offset_paginator)
+
+
+def test_keyset_paginator_handles_thread_without_posts(default_category):
+    thread = post_thread(default_category)
+    thread.post_set.all().delete()
+
+    queryset = thread.post_set.order_by("id")
+    posts_pages = get_posts_pages(thread, 5, 2)
+    paginator = KeysetPostsPaginator(queryset, 5, 2, pages=posts_pages)
+    assert list(paginator.page(1).object_list) == []
+
+
+def test_post_page_is_last_page_post_is_displayed_on(long_thread):
+    posts = list(long_thread.post_set.order_by("id"))
+    for per_page, orphans in product(range(2, 8), range(0, 4)):
+        posts_pages = get_posts_pages(long_thread, per_page, orphans)
+        offset_paginator = PostsPaginator(posts, per_page, orphans)
+        pages_ids = get_pages_ids(offset_paginator)
+
+        for post in posts:
+            pages = [i for i, page in enumerate(pages_ids, 1) if post.id in page]
+            expected_page = pages[-1]
+            assert posts_pages.get_post_page(post) == expected_page
+
+
+def test_event_page_is_page_with_post_preceding_it(long_thread):
+    posts = list(long_thread.post_set.order_by("id"))
+    event = reply_thread(long_thread, is_event=True)
+    event.id = posts[5].id + 1
+
+    posts_pages = get_posts_pages(long_thread, 5, 0)
+    assert posts_pages.get_post_page(event) == posts_pages.get_post_page(posts[5])
+
+
+def test_new_replies_are_added_to_cached_pages(long_thread):
+    get_posts_pages(long_thread, 5, 0)
+
+    reply = reply_thread(long_thread)
+    long_thread.refresh_from_db()
+
+    posts_pages = get_posts_pages(long_thread, 5, 0)
+    assert posts_pages.count == 22
+    assert posts_pages.last_id == reply.id
+
+
+def test_cached_pages_are_reused(django_assert_num_queries, long_thread):
+    get_posts_pages(long_thread, 5, 0)
+    with django_assert_num_queries(1):
+        get_posts_pages(long_thread, 5, 0)
+
+
+def test_pages_are_rebuilt_if_posts_count_changed(long_thread):
+    get_posts_pages(long_thread, 5, 0)
+
+    long_thread.post_set.order_by("id").last().delete()
+    long_thread.replies -= 1
+
+    posts_pages = get_posts_pages(long_thread, 5, 0)
+    assert posts_pages.count == 20
+
+
+def test_pages_are_cleared_when_thread_is_synchronized(cache, long_thread):
+    get_posts_pages(long_thread, 5, 0)
+    assert cache.get("misago_posts_pages_%s" % long_thread.id)
+
+    long_thread.synchronize()
+    assert not cache.get("misago_posts_pages_%s" % long_thread.id)
+
+
+def test_pages_are_not_used_for_thread_with_unapproved_posts(long_thread):
+    assert can_use_posts_pages(long_thread)
+    reply_thread(long_thread, is_unapproved=True)
+    assert not can_use_posts_pages(long_thread)
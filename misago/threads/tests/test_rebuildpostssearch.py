@@ -0,0 +1,78 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from ..management.commands import rebuildpostssearch
+from ..models import Post
+from ..test import reply_thread
+
+
+def call_rebuild_command(**options):
+    out = StringIO()
+    call_command(rebuildpostssearch.Command(), stdout=out, **options)
+    return out.getvalue().splitlines()[-1].strip()
+
+
+def test_command_works_when_there_are_no_posts(db):
+    assert call_rebuild_command() == "No posts were found"
+
+
+def test_command_rebuilds_posts_search(thread):
+    reply = reply_thread(thread, message="Lorem ipsum dolor met")
+    Post.objects.update(search_document="", search_vector="")
+
+    command_output = call_rebuild_command(batch_size=1)
+    assert command_output.startswith("Rebuild search for 2 posts in ")
+    assert command_output.endswith(" posts/s)")
+
+    reply.refresh_from_db()
+    assert reply.search_document == "Lorem ipsum dolor met"
+    assert Post.objects.filter(search_vector="lorem").get() == reply
+
+
+def test_command_rebuilds_first_post_search_with_thread_title(thread):
+    Post.objects.update(search_document="", search_vector="")
+    call_rebuild_command()
+
+    thread.first_post.refresh_from_db()
+    assert thread.title in thread.first_post.search_document
+
+
+def test_command_skips_batches_completed_in_checkpoint(tmpdir, thread):
+    reply = reply_thread(thread, message="Lorem ipsum dolor met")
+    Post.objects.update(search_document="")
+
+    checkpoint = tmpdir.join("checkpoint.json")
+    checkpoint.write(json.dumps({"batch_size": 1, "completed_batches": [reply.id]}))
+
+    command_output = call_rebuild_command(batch_size=1, checkpoint=str(checkpoint))
+    assert command_output.startswith("Rebuild search for 1 posts in ")
+
+    reply.refresh_from_db()
+    assert reply.search_document == ""
+
+
+def test_command_removes_checkpoint_after_rebuild(tmpdir, thread):
+    checkpoint = tmpdir.join("checkpoint.json")
+    call_rebuild_command(checkpoint=str(checkpoint))
+    assert not checkpoint.exists()
+
+
+def test_command_fails_for_checkpoint_with_different_batch_size(tmpdir, thread):
+    checkpoint = tmpdir.join("checkpoint.json")
+    checkpoint.write(json.dumps({"batch_size": 10, "completed_batches": []}))
+
+    with pytest.raises(CommandError):
+        call_rebuild_command(batch_size=1, checkpoint=str(checkpoint))
+
+
+def test_batches_are_aligned_to_batch_size(thread):
+    for _ in range(3):
+        reply_thread(thread)
+
+    first_id = Post.objects.order_by("id").first().id
+    batches = rebuildpostssearch.get_batches(2)
+    assert batches[-1] == (first_id // 2 * 2, first_id // 2 * 2 + 2)
+    assert all(start_id % 2 == 0 for start_id, _ in batches)
@@ -0,0 +1,124 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.utils import timezone
+
+from ...acl import useracl
+from ...conf.test import override_dynamic_settings
+from ...core import mail as core_mail
+from ...users.test import create_test_user
+from .. import tasks
+from ..tasks import notify_subscribers_on_reply
+from ..test import post_thread, reply_thread
+
+
+def subscribe_user(user, thread, send_email=True):
+    return user.subscription_set.create(
+        thread=thread,
+        category=thread.category,
+        last_read_on=thread.last_post_on,
+        send_email=send_email,
+    )
+
+
+def post_reply(thread, poster):
+    previous_last_post_on = thread.last_post_on
+    reply = reply_thread(
+        thread, poster=poster, posted_on=previous_last_post_on + timedelta(minutes=1)
+    )
+    return reply, previous_last_post_on
+
+
+@override_dynamic_settings(forum_address="http://test.com/")
+def test_subscribers_are_notified_about_reply(user, other_user, thread):
+    subscribe_user(other_user, thread)
+    reply, previous_last_post_on = post_reply(thread, user)
+
+    assert notify_subscribers_on_reply(reply.id, previous_last_post_on) == 1
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [other_user.email]
+    assert user.username in mail.outbox[0].subject
+    assert reply.get_absolute_url() in mail.outbox[0].body
+
+
+def test_poster_is_not_notified_about_own_reply(user, thread):
+    subscribe_user(user, thread)
+    reply, previous_last_post_on = post_reply(thread, user)
+
+    assert notify_subscribers_on_reply(reply.id, previous_last_post_on) == 0
+    assert not mail.outbox
+
+
+def test_subscriber_without_email_subscription_is_not_notified(
+    user, other_user, thread
+):
+    subscribe_user(other_user, thread, send_email=False)
+    reply, previous_last_post_on = post_reply(thread, user)
+
+    assert notify_subscribers_on_reply(reply.id, previous_last_post_on) == 0
+    assert not mail.outbox
+
+
+def test_task_accepts_serialized_previous_last_post_date(user, other_user, thread):
+    subscribe_user(other_user, thread)
+    reply, previous_last_post_on = post_reply(thread, user)
+
+    notify_subscribers_on_reply(reply.id, previous_last_post_on.isoformat())
+    assert len(mail.outbox) == 1
+
+
+def test_task_does_nothing_for_deleted_post(user, other_user, thread):
+    subscribe_user(other_user, thread)
+    reply, previous_last_post_on = post_reply(thread, user)
+    reply_id = reply.id
+    reply.delete()
+
+    assert notify_subscribers_on_reply(reply_id, previous_last_post_on) == 0
+    assert not mail.outbox
+
+
+def test_subscribers_acl_is_built_once_for_every_acl_key(user, thread):
+    for i in range(3):
+        subscriber = create_test_user("User%s" % i, "user%s@example.com" % i)
+        subscribe_user(subscriber, thread)
+
+    reply, previous_last_post_on = post_reply(thread, user)
+
+    with patch(
+        "misago.threads.tasks.useracl.get_user_acl", wraps=useracl.get_user_acl
+    ) as get_user_acl:
+        notify_subscribers_on_reply(reply.id, previous_last_post_on)
+
+    assert get_user_acl.call_count == 1
+    assert len(mail.outbox) == 3
+
+
+def test_notifications_are_sent_in_batches(user, thread):
+    for i in range(5):
+        subscriber = create_test_user("User%s" % i, "user%s@example.com" % i)
+        subscribe_user(subscriber, thread)
+
+    reply, previous_last_post_on = post_reply(thread, user)
+
+    with patch.object(tasks, "MESSAGES_BATCH_SIZE", 2):
+        with patch(
+            "misago.threads.tasks.send_messages", wraps=core_mail.send_messages
+        ) as send_messages:
+            assert notify_subscribers_on_reply(reply.id, previous_last_post_on) == 5
+
+    assert send_messages.call_count == 3
+    assert len(mail.outbox) == 5
+
+
+def test_thread_starter_receives_different_subject(user, other_user, default_category):
+    thread = post_thread(
+        default_category,
+        poster=other_user,
+        started_on=timezone.now() - timedelta(hours=1),
+    )
+    subscribe_user(other_user, thread)
+    reply, previous_last_post_on = post_reply(thread, user)
+
+    notify_subscribers_on_reply(reply.id, previous_last_post_on)
+    assert "your thread" in mail.outbox[0].subject
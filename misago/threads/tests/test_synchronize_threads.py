@@ -0,0 +1,89 @@
+from ..models import Thread
+from ..synchronize import SYNCHRONIZED_FIELDS, synchronize_threads
+from ..test import post_poll, post_thread, reply_thread
+
+
+def get_synchronized_state(thread):
+    thread = Thread.objects.get(id=thread.id)
+    thread.synchronize()
+    return get_thread_state(thread)
+
+
+def get_thread_state(thread):
+    state = {}
+    for field in SYNCHRONIZED_FIELDS:
+        field_name = Thread._meta.get_field(field).attname
+        state[field_name] = getattr(thread, field_name)
+    return state
+
+
+def create_threads(category, user):
+    threads = []
+
+    thread = post_thread(category)
+    reply_thread(thread, poster=user)
+    reply_thread(thread, is_hidden=True, has_reports=True, has_open_reports=True)
+    threads.append(thread)
+
+    thread = post_thread(category, is_unapproved=True)
+    reply_thread(thread, is_unapproved=True)
+    threads.append(thread)
+
+    thread = post_thread(category, poster=user)
+    reply_thread(thread, has_reports=True)
+    reply_thread(thread, is_event=True)
+    reply_thread(thread, is_unapproved=True)
+    post_poll(thread, user)
+    threads.append(thread)
+
+    thread = post_thread(category)
+    reply_thread(thread, is_event=True)
+    reply_thread(thread)
+    threads.append(thread)
+
+    return threads
+
+
+def test_synchronize_threads_produces_same_results_as_model_method(
+    default_category, user
+):
+    threads = create_threads(default_category, user)
+    expected_states = [get_synchronized_state(thread) for thread in threads]
+
+    Thread.objects.filter(id__in=[thread.id for thread in threads]).update(
+        replies=42,
+        has_reported_posts=False,
+        has_open_reports=True,
+        has_unapproved_posts=False,
+        has_hidden_posts=False,
+        has_events=False,
+        has_poll=False,
+        is_hidden=True,
+    )
+
+    synchronize_threads(list(Thread.objects.filter(id__in=[t.id for t in threads])))
+
+    for thread, expected_state in zip(threads, expected_states):
+        thread = Thread.objects.get(id=thread.id)
+        assert get_thread_state(thread) == expected_state
+
+
+def test_synchronize_threads_uses_fixed_number_of_queries(
+    default_category, user, django_assert_num_queries
+):
+    create_threads(default_category, user)
+    create_threads(default_category, user)
+    threads = list(Thread.objects.all())
+
+    with django_assert_num_queries(4):
+        assert len(synchronize_threads(threads)) == len(threads)
+
+
+def test_synchronize_threads_skips_threads_without_posts(default_category):
+    thread = post_thread(default_category)
+    thread.post_set.all().delete()
+    assert synchronize_threads([thread]) == []
+
+
+def test_synchronize_threads_handles_empty_list(db):
+    assert synchronize_threads([]) == []
@@ -1,11 +1,15 @@
+from datetime import timedelta
 from io import StringIO
 
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
+from django.utils import timezone
 
 from .. import test
 from ...categories.models import Category
 from ..management.commands import synchronizethreads
+from ..models import Thread
 
 
 class SynchronizeThreadsTests(TestCase):
@@ -40,3 +44,58 @@ class SynchronizeThreadsTests(TestCase):
 
         command_output = out.getvalue().splitlines()[-1].strip()
         self.assertEqual(command_output, "Synchronized 10 threads")
+
+    def test_threads_sync_since(self):
+        """command synchronizes only threads active since given date"""
+        category = Category.objects.all_categories()[:1][0]
+
+        old_thread = test.post_thread(
+            category, started_on=timezone.now() - timedelta(days=10)
+        )
+        old_thread.replies = 5
+        old_thread.save()
+
+        new_thread = test.post_thread(category)
+        test.reply_thread(new_thread)
+        new_thread.replies = 5
+        new_thread.save()
+
+        command = synchronizethreads.Command()
+
+        out = StringIO()
+        since = (timezone.now() - timedelta(days=2)).strftime("%Y-%m-%d")
+        call_command(command, since=since, batch_size=1, stdout=out)
+
+        self.assertEqual(Thread.objects.get(id=old_thread.id).replies, 5)
+        self.assertEqual(Thread.objects.get(id=new_thread.id).replies, 1)
+
+        command_output = out.getvalue().splitlines()[-1].strip()
+        self.assertEqual(command_output, "Synchronized 1 threads")
+
+    def test_threads_sync_since_skips_threads_with_old_last_post(self):
+        """command skips threads with old last post but recently edited posts"""
+        category = Category.objects.all_categories()[:1][0]
+
+        old_thread = test.post_thread(
+            category, started_on=timezone.now() - timedelta(days=10)
+        )
+        old_thread.first_post.updated_on = timezone.now()
+        old_thread.first_post.save()
+        old_thread.replies = 5
+        old_thread.save()
+
+        command = synchronizethreads.Command()
+
+        out = StringIO()
+        since = (timezone.now() - timedelta(days=2)).strftime("%Y-%m-%d")
+        call_command(command, since=since, stdout=out)
+
+        self.assertEqual(Thread.objects.get(id=old_thread.id).replies, 5)
+
+        command_output = out.getvalue().strip()
+        self.assertEqual(command_output, "No threads were found")
+
+    def test_threads_sync_invalid_since(self):
+        """command raises error for invalid since date"""
+        with self.assertRaises(CommandError):
+            call_command(synchronizethreads.Command(), since="lorem", stdout=StringIO())
@@ -229,7 +229,7 @@ class ThreadMergeApiTests(ThreadsApiTestCase):
     @patch_other_category_acl({"can_merge_threads": True})
     @patch_category_acl({"can_merge_threads": True})
     def test_merge_threads_kept_reads(self):
-        """api keeps both threads readtrackers after merge"""
+        """api merges both threads readtrackers"""
         other_thread = test.post_thread(self.other_category)
 
         poststracker.save_read(self.user, self.thread.first_post)
@@ -248,15 +248,9 @@ class ThreadMergeApiTests(ThreadsApiTestCase):
             },
         )
 
-        # posts reads are kept
-        postreads = self.user.postread_set.filter(post__is_event=False).order_by("id")
-
-        self.assertEqual(
-            list(postreads.values_list("post_id", flat=True)),
-            [self.thread.first_post_id, other_thread.first_post_id],
-        )
-        self.assertEqual(postreads.filter(thread=other_thread).count(), 2)
-        self.assertEqual(postreads.filter(category=self.other_category).count(), 2)
+        # threads reads are merged
+        self.assertEqual(self.user.threadread_set.count(), 1)
+        self.user.threadread_set.get(thread=other_thread, category=self.other_category)
 
     @patch_other_category_acl({"can_merge_threads": True})
     @patch_category_acl({"can_merge_threads": True})
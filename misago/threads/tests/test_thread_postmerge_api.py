@@ -619,7 +619,7 @@ class ThreadPostMergeApiTestCase(AuthenticatedUserTestCase):
 
     @patch_category_acl({"can_merge_posts": True})
     def test_merge_remove_reads(self):
-        """two posts merge removes read tracker from post"""
+        """two posts merge keeps thread's read tracker"""
         post_a = test.reply_thread(self.thread, poster=self.user, message="Battęry")
         post_b = test.reply_thread(self.thread, poster=self.user, message="Hórse")
 
@@ -633,5 +633,5 @@ class ThreadPostMergeApiTestCase(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        # both post's were removed from readtracker
-        self.assertEqual(self.user.postread_set.count(), 0)
+        # thread's read watermark is kept
+        self.user.threadread_set.get(thread=self.thread, read_until=post_b.posted_on)
@@ -503,7 +503,7 @@ class ThreadPostMoveApiTestCase(AuthenticatedUserTestCase):
     @patch_other_category_acl({"can_reply_threads": True})
     @patch_category_acl({"can_move_posts": True})
     def test_move_posts_reads(self):
-        """api moves posts reads together with posts"""
+        """api keeps thread reads in place when posts are moved"""
         other_thread = test.post_thread(self.other_category)
 
         posts = (test.reply_thread(self.thread), test.reply_thread(self.thread))
@@ -529,11 +529,11 @@ class ThreadPostMoveApiTestCase(AuthenticatedUserTestCase):
 
         other_thread = Thread.objects.get(pk=other_thread.pk)
 
-        # postreads were removed
-        postreads = self.user.postread_set.order_by("id")
+        # threadreads were not moved
+        threadreads = self.user.threadread_set.order_by("id")
 
-        postreads_threads = list(postreads.values_list("thread_id", flat=True))
-        self.assertEqual(postreads_threads, [self.thread.pk])
+        threadreads_threads = list(threadreads.values_list("thread_id", flat=True))
+        self.assertEqual(threadreads_threads, [self.thread.pk])
 
-        postreads_categories = list(postreads.values_list("category_id", flat=True))
-        self.assertEqual(postreads_categories, [self.category.pk])
+        threadreads_categories = list(threadreads.values_list("category_id", flat=True))
+        self.assertEqual(threadreads_categories, [self.category.pk])
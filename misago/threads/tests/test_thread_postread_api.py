@@ -30,16 +30,38 @@ class PostReadApiTests(ThreadsApiTestCase):
 
     def test_read_post(self):
         """api marks post as read"""
-        response = self.client.post(self.api_link)
+        response = self.client.post(
+            reverse(
+                "misago:api:thread-post-read",
+                kwargs={"thread_pk": self.thread.pk, "pk": self.thread.first_post.pk},
+            )
+        )
         self.assertEqual(response.status_code, 200)
 
-        self.assertEqual(self.user.postread_set.count(), 1)
-        self.user.postread_set.get(post=self.post)
+        self.assertEqual(self.user.threadread_set.count(), 1)
+        self.user.threadread_set.get(
+            thread=self.thread, read_until=self.thread.first_post.posted_on
+        )
 
-        # one post read, first post is still unread
+        # first post read, second post is still unread
         self.assertFalse(response.json()["thread_is_read"])
 
         # read second post
+        response = self.client.post(self.api_link)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.user.threadread_set.count(), 1)
+        self.user.threadread_set.get(thread=self.thread, read_until=self.post.posted_on)
+
+        # both posts are read
+        self.assertTrue(response.json()["thread_is_read"])
+
+    def test_read_older_post(self):
+        """api doesn't move read watermark back when older post is read"""
+        response = self.client.post(self.api_link)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["thread_is_read"])
+
         response = self.client.post(
             reverse(
                 "misago:api:thread-post-read",
@@ -47,13 +69,10 @@ class PostReadApiTests(ThreadsApiTestCase):
             )
         )
         self.assertEqual(response.status_code, 200)
-
-        self.assertEqual(self.user.postread_set.count(), 2)
-        self.user.postread_set.get(post=self.thread.first_post)
-
-        # both posts are read
         self.assertTrue(response.json()["thread_is_read"])
 
+        self.user.threadread_set.get(thread=self.thread, read_until=self.post.posted_on)
+
     def test_read_subscribed_thread_post(self):
         """api marks post as read and updates subscription"""
         self.thread.subscription_set.create(
@@ -68,3 +87,125 @@ class PostReadApiTests(ThreadsApiTestCase):
 
         subscription = self.thread.subscription_set.order_by("id").last()
         self.assertEqual(subscription.last_read_on, self.post.posted_on)
+
+
+class PostsReadApiTests(ThreadsApiTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.posts = [
+            test.reply_thread(self.thread, posted_on=timezone.now()) for _ in range(3)
+        ]
+
+        self.api_link = reverse(
+            "misago:api:thread-post-read", kwargs={"thread_pk": self.thread.pk}
+        )
+
+    def test_read_anonymous(self):
+        """api validates if reading user is authenticated"""
+        self.logout_user()
+
+        response = self.client.post(self.api_link, {"posts": [self.posts[0].pk]})
+        self.assertEqual(response.status_code, 403)
+
+    def test_read_no_data(self):
+        """api validates if posts to read were specified"""
+        response = self.client.post(self.api_link, {}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {"non_field_errors": ["You have to specify posts that were read."]},
+        )
+        self.assertEqual(self.user.threadread_set.count(), 0)
+
+    def test_read_invalid_posts(self):
+        """api validates posts ids"""
+        response = self.client.post(
+            self.api_link, {"posts": ["invalid"]}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.user.threadread_set.count(), 0)
+
+    def test_read_too_many_posts(self):
+        """api validates number of posts read at single time"""
+        response = self.client.post(
+            self.api_link,
+            {"posts": list(range(1, 100))},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {"posts": ["No more than 24 posts can be read at a single time."]},
+        )
+
+    def test_read_posts(self):
+        """api moves watermark to newest of read posts"""
+        response = self.client.post(
+            self.api_link,
+            {"posts": [self.thread.first_post.pk, self.posts[1].pk]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["thread_is_read"])
+
+        self.assertEqual(self.user.threadread_set.count(), 1)
+        self.user.threadread_set.get(
+            thread=self.thread, read_until=self.posts[1].posted_on
+        )
+
+    def test_read_posts_from_beacon(self):
+        """api accepts multipart data sent by browser with beacon"""
+        response = self.client.post(
+            self.api_link, {"posts": [self.thread.first_post.pk, self.posts[1].pk]}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.user.threadread_set.get(
+            thread=self.thread, read_until=self.posts[1].posted_on
+        )
+
+    def test_read_posts_until(self):
+        """api moves watermark to post read until"""
+        response = self.client.post(
+            self.api_link, {"until": self.posts[2].pk}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["thread_is_read"])
+
+        self.user.threadread_set.get(
+            thread=self.thread, read_until=self.posts[2].posted_on
+        )
+
+    def test_read_other_thread_posts(self):
+        """api ignores posts from other threads"""
+        other_thread = test.post_thread(self.category)
+
+        response = self.client.post(
+            self.api_link,
+            {"posts": [other_thread.first_post.pk]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["thread_is_read"])
+        self.assertEqual(self.user.threadread_set.count(), 0)
+
+    def test_read_subscribed_thread_posts(self):
+        """api updates subscription once"""
+        self.thread.subscription_set.create(
+            user=self.user,
+            thread=self.thread,
+            category=self.thread.category,
+            last_read_on=self.thread.first_post.posted_on,
+        )
+
+        response = self.client.post(
+            self.api_link,
+            {"posts": [post.pk for post in self.posts]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["thread_is_read"])
+
+        subscription = self.thread.subscription_set.get()
+        self.assertEqual(subscription.last_read_on, self.posts[2].posted_on)
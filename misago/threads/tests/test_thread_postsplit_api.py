@@ -713,11 +713,5 @@ class ThreadPostSplitApiTestCase(AuthenticatedUserTestCase):
         # posts were moved to new thread
         self.assertEqual(split_thread.post_set.filter(pk__in=self.posts).count(), 2)
 
-        # postreads were removed
-        postreads = self.user.postread_set.filter(post__is_event=False).order_by("id")
-
-        postreads_threads = list(postreads.values_list("thread_id", flat=True))
-        self.assertEqual(postreads_threads, [self.thread.pk])
-
-        postreads_categories = list(postreads.values_list("category_id", flat=True))
-        self.assertEqual(postreads_categories, [self.category.pk])
+        # threadreads were not moved
+        self.user.threadread_set.get(thread=self.thread, category=self.category)
@@ -0,0 +1,251 @@
+from types import SimpleNamespace
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse, set_script_prefix
+
+from ..threadtypes.privatethread import PrivateThread
+from ..threadtypes.thread import Thread
+from ..threadtypes.urltemplates import URLTemplate
+
+ARGS_VALUES = {
+    "pk": 42,
+    "thread_pk": 1337,
+    "post": 7,
+    "page": 3,
+    "slug": "thread-slug-2019",
+}
+
+category = SimpleNamespace(
+    pk=5, slug="category", level=1, last_thread_id=12, last_thread_slug="last-thread"
+)
+root_category = SimpleNamespace(pk=1, slug="root", level=0)
+thread = SimpleNamespace(pk=12, slug="test-thread")
+post = SimpleNamespace(pk=31, thread_id=thread.pk, thread=thread)
+poll = SimpleNamespace(pk=4, thread_id=thread.pk)
+
+url_templates = [
+    value
+    for thread_type in (Thread, PrivateThread)
+    for value in vars(thread_type).values()
+    if isinstance(value, URLTemplate)
+]
+
+
+@pytest.fixture
+def script_prefix():
+    set_script_prefix("/forum/")
+    yield "/forum/"
+    set_script_prefix("/")
+
+
+@pytest.mark.parametrize("template", url_templates, ids=lambda t: t.viewname)
+def test_url_template_is_formatted_to_reversed_url(template):
+    kwargs = {arg: ARGS_VALUES[arg] for arg in template.args}
+    assert template.format(**kwargs) == template.reverse(**kwargs)
+
+
+@pytest.mark.parametrize("template", url_templates, ids=lambda t: t.viewname)
+def test_url_template_is_formatted_with_script_prefix(script_prefix, template):
+    kwargs = {arg: ARGS_VALUES[arg] for arg in template.args}
+    url = template.format(**kwargs)
+    assert url.startswith(script_prefix)
+    assert url == template.reverse(**kwargs)
+
+
+def test_url_template_is_compiled_once(mocker):
+    template = URLTemplate("misago:thread", "slug", "pk")
+    compile_template = mocker.spy(template, "compile")
+
+    template.format(slug="thread", pk=1)
+    template.format(slug="other-thread", pk=2)
+
+    assert compile_template.call_count == 1
+
+
+def test_url_template_is_cleared_when_root_urlconf_changes():
+    template = URLTemplate("misago:thread", "slug", "pk")
+    template.format(slug="thread", pk=1)
+    assert template.template
+
+    with override_settings(ROOT_URLCONF="misago.core.testproject.urls"):
+        assert template.template is None
+
+
+def test_thread_type_urls_are_same_as_reversed():
+    thread_type = Thread()
+
+    assert thread_type.get_category_absolute_url(category) == reverse(
+        "misago:category", kwargs={"pk": category.pk, "slug": category.slug}
+    )
+    assert thread_type.get_category_absolute_url(root_category) == reverse(
+        "misago:threads"
+    )
+
+    category_thread = {"slug": category.last_thread_slug, "pk": category.last_thread_id}
+    assert thread_type.get_category_last_thread_url(category) == reverse(
+        "misago:thread", kwargs=category_thread
+    )
+    assert thread_type.get_category_last_thread_new_url(category) == reverse(
+        "misago:thread-new", kwargs=category_thread
+    )
+    assert thread_type.get_category_last_post_url(category) == reverse(
+        "misago:thread-last", kwargs=category_thread
+    )
+
+    thread_kwargs = {"slug": thread.slug, "pk": thread.pk}
+    assert thread_type.get_thread_absolute_url(thread) == reverse(
+        "misago:thread", kwargs=thread_kwargs
+    )
+    assert thread_type.get_thread_absolute_url(thread, 2) == reverse(
+        "misago:thread", kwargs={"page": 2, **thread_kwargs}
+    )
+    assert thread_type.get_thread_last_post_url(thread) == reverse(
+        "misago:thread-last", kwargs=thread_kwargs
+    )
+    assert thread_type.get_thread_new_post_url(thread) == reverse(
+        "misago:thread-new", kwargs=thread_kwargs
+    )
+    assert thread_type.get_thread_best_answer_url(thread) == reverse(
+        "misago:thread-best-answer", kwargs=thread_kwargs
+    )
+    assert thread_type.get_thread_unapproved_post_url(thread) == reverse(
+        "misago:thread-unapproved", kwargs=thread_kwargs
+    )
+    assert thread_type.get_post_absolute_url(post) == reverse(
+        "misago:thread-post", kwargs={"post": post.pk, **thread_kwargs}
+    )
+
+
+def test_thread_type_api_urls_are_same_as_reversed():
+    thread_type = Thread()
+
+    assert thread_type.get_thread_api_url(thread) == reverse(
+        "misago:api:thread-detail", kwargs={"pk": thread.pk}
+    )
+    assert thread_type.get_thread_merge_api_url(thread) == reverse(
+        "misago:api:thread-merge", kwargs={"pk": thread.pk}
+    )
+
+    thread_kwargs = {"thread_pk": thread.pk}
+    assert thread_type.get_thread_editor_api_url(thread) == reverse(
+        "misago:api:thread-post-editor", kwargs=thread_kwargs
+    )
+    assert thread_type.get_thread_poll_api_url(thread) == reverse(
+        "misago:api:thread-poll-list", kwargs=thread_kwargs
+    )
+    assert thread_type.get_thread_posts_api_url(thread) == reverse(
+        "misago:api:thread-post-list", kwargs=thread_kwargs
+    )
+    assert thread_type.get_post_merge_api_url(thread) == reverse(
+        "misago:api:thread-post-merge", kwargs=thread_kwargs
+    )
+    assert thread_type.get_post_move_api_url(thread) == reverse(
+        "misago:api:thread-post-move", kwargs=thread_kwargs
+    )
+    assert thread_type.get_post_split_api_url(thread) == reverse(
+        "misago:api:thread-post-split", kwargs=thread_kwargs
+    )
+    assert thread_type.get_posts_read_api_url(thread) == reverse(
+        "misago:api:thread-post-read", kwargs=thread_kwargs
+    )
+
+    poll_kwargs = {"thread_pk": thread.pk, "pk": poll.pk}
+    assert thread_type.get_poll_api_url(poll) == reverse(
+        "misago:api:thread-poll-detail", kwargs=poll_kwargs
+    )
+    assert thread_type.get_poll_votes_api_url(poll) == reverse(
+        "misago:api:thread-poll-votes", kwargs=poll_kwargs
+    )
+
+    post_kwargs = {"thread_pk": thread.pk, "pk": post.pk}
+    assert thread_type.get_post_api_url(post) == reverse(
+        "misago:api:thread-post-detail", kwargs=post_kwargs
+    )
+    assert thread_type.get_post_likes_api_url(post) == reverse(
+        "misago:api:thread-post-likes", kwargs=post_kwargs
+    )
+    assert thread_type.get_post_editor_api_url(post) == reverse(
+        "misago:api:thread-post-editor", kwargs=post_kwargs
+    )
+    assert thread_type.get_post_edits_api_url(post) == reverse(
+        "misago:api:thread-post-edits", kwargs=post_kwargs
+    )
+    assert thread_type.get_post_read_api_url(post) == reverse(
+        "misago:api:thread-post-read", kwargs=post_kwargs
+    )
+
+
+def test_private_thread_type_urls_are_same_as_reversed():
+    thread_type = PrivateThread()
+
+    assert thread_type.get_category_absolute_url(category) == reverse(
+        "misago:private-threads"
+    )
+
+    category_thread = {"slug": category.last_thread_slug, "pk": category.last_thread_id}
+    assert thread_type.get_category_last_thread_url(category) == reverse(
+        "misago:private-thread", kwargs=category_thread
+    )
+    assert thread_type.get_category_last_thread_new_url(category) == reverse(
+        "misago:private-thread-new", kwargs=category_thread
+    )
+    assert thread_type.get_category_last_post_url(category) == reverse(
+        "misago:private-thread-last", kwargs=category_thread
+    )
+
+    thread_kwargs = {"slug": thread.slug, "pk": thread.pk}
+    assert thread_type.get_thread_absolute_url(thread) == reverse(
+        "misago:private-thread", kwargs=thread_kwargs
+    )
+    assert thread_type.get_thread_absolute_url(thread, 2) == reverse(
+        "misago:private-thread", kwargs={"page": 2, **thread_kwargs}
+    )
+    assert thread_type.get_thread_last_post_url(thread) == reverse(
+        "misago:private-thread-last", kwargs=thread_kwargs
+    )
+    assert thread_type.get_thread_new_post_url(thread) == reverse(
+        "misago:private-thread-new", kwargs=thread_kwargs
+    )
+    assert thread_type.get_post_absolute_url(post) == reverse(
+        "misago:private-thread-post", kwargs={"post": post.pk, **thread_kwargs}
+    )
+
+
+def test_private_thread_type_api_urls_are_same_as_reversed():
+    thread_type = PrivateThread()
+
+    assert thread_type.get_thread_api_url(thread) == reverse(
+        "misago:api:private-thread-detail", kwargs={"pk": thread.pk}
+    )
+
+    thread_kwargs = {"thread_pk": thread.pk}
+    assert thread_type.get_thread_editor_api_url(thread) == reverse(
+        "misago:api:private-thread-post-editor", kwargs=thread_kwargs
+    )
+    assert thread_type.get_thread_posts_api_url(thread) == reverse(
+        "misago:api:private-thread-post-list", kwargs=thread_kwargs
+    )
+    assert thread_type.get_post_merge_api_url(thread) == reverse(
+        "misago:api:private-thread-post-merge", kwargs=thread_kwargs
+    )
+    assert thread_type.get_posts_read_api_url(thread) == reverse(
+        "misago:api:private-thread-post-read", kwargs=thread_kwargs
+    )
+
+    post_kwargs = {"thread_pk": thread.pk, "pk": post.pk}
+    assert thread_type.get_post_api_url(post) == reverse(
+        "misago:api:private-thread-post-detail", kwargs=post_kwargs
+    )
+    assert thread_type.get_post_likes_api_url(post) == reverse(
+        "misago:api:private-thread-post-likes", kwargs=post_kwargs
+    )
+    assert thread_type.get_post_editor_api_url(post) == reverse(
+        "misago:api:private-thread-post-editor", kwargs=post_kwargs
+    )
+    assert thread_type.get_post_edits_api_url(post) == reverse(
+        "misago:api:private-thread-post-edits", kwargs=post_kwargs
+    )
+    assert thread_type.get_post_read_api_url(post) == reverse(
+        "misago:api:private-thread-post-read", kwargs=post_kwargs
+    )
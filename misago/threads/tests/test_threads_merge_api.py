@@ -671,15 +671,9 @@ class ThreadsMergeApiTests(ThreadsApiTestCase):
         # are old threads gone?
         self.assertEqual([t.pk for t in Thread.objects.all()], [new_thread.pk])
 
-        # posts reads are kept
-        postreads = self.user.postread_set.filter(post__is_event=False).order_by("id")
-
-        self.assertEqual(
-            list(postreads.values_list("post_id", flat=True)),
-            [self.thread.first_post_id, thread.first_post_id],
-        )
-        self.assertEqual(postreads.filter(thread=new_thread).count(), 2)
-        self.assertEqual(postreads.filter(category=self.category).count(), 2)
+        # threads reads are merged
+        self.assertEqual(self.user.threadread_set.count(), 1)
+        self.user.threadread_set.get(thread=new_thread, category=self.category)
 
         # subscriptions are kept
         self.assertEqual(self.user.subscription_set.count(), 1)
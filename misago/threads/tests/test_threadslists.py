@@ -31,7 +31,7 @@ def patch_categories_acl(category_acl=None, base_acl=None):
 
         # copy first category's acl to other categories to make base for overrides
         for category in Category.objects.all_categories():
-            user_acl["categories"][category.id] = first_category_acl
+            user_acl["categories"][category.id] = first_category_acl.copy()
 
         if base_acl:
             user_acl.update(base_acl)
@@ -1281,6 +1281,7 @@ def patch_category_see_all_threads_acl():
         category = Category.objects.get(slug="first-category")
         category_acl = user_acl["categories"][category.id].copy()
         category_acl.update({"can_see_all_threads": 0})
+        user_acl["categories"] = dict(user_acl["categories"])
         user_acl["categories"][category.id] = category_acl
 
     return patch_user_acl(patch_acl)
@@ -18,7 +18,7 @@ cache_versions = get_cache_versions()
 def patch_category_acl(new_acl=None):
     def patch_acl(_, user_acl):
         category = Category.objects.get(slug="first-category")
-        category_acl = user_acl["categories"][category.id]
+        category_acl = user_acl["categories"][category.id].copy()
 
         # reset category ACL to single predictable state
         category_acl.update(
@@ -41,6 +41,9 @@ def patch_category_acl(new_acl=None):
         if new_acl:
             category_acl.update(new_acl)
 
+        user_acl["categories"] = dict(user_acl["categories"])
+        user_acl["categories"][category.id] = category_acl
+
     return patch_user_acl(patch_acl)
 
 
@@ -0,0 +1,134 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from ..anonymize import anonymize_last_likes
+from ..models import Post
+from ..tasks import propagate_username_change
+from ..test import like_post, post_thread, reply_thread
+from ..usernames import update_usernames
+
+User = get_user_model()
+
+
+def test_usernames_are_updated_on_user_content(default_category, user, other_user):
+    thread = post_thread(default_category, poster=user)
+    post = reply_thread(thread, poster=user)
+    other_post = reply_thread(thread, poster=other_user)
+    like = like_post(other_post, user)
+
+    update_usernames(user.id, "Renamed", "renamed")
+
+    thread.refresh_from_db()
+    assert thread.starter_name == "Renamed"
+    assert thread.starter_slug == "renamed"
+
+    post.refresh_from_db()
+    assert post.poster_name == "Renamed"
+
+    other_post.refresh_from_db()
+    assert other_post.poster_name == other_user.username
+
+    like.refresh_from_db()
+    assert like.liker_name == "Renamed"
+    assert like.liker_slug == "renamed"
+
+
+def test_usernames_are_updated_in_batches(default_category, user):
+    thread = post_thread(default_category, poster=user)
+    for _ in range(5):
+        reply_thread(thread, poster=user)
+
+    update_usernames(user.id, "Renamed", "renamed", batch_size=2)
+
+    posts = Post.objects.filter(thread=thread)
+    assert posts.count() == 6
+    assert set(posts.values_list("poster_name", flat=True)) == {"Renamed"}
+
+
+def test_propagate_username_change_task_updates_usernames(default_category, user):
+    thread = post_thread(default_category, poster=user)
+    User.objects.filter(id=user.id).update(username="Renamed", slug="renamed")
+    propagate_username_change(user.id)
+
+    thread.refresh_from_db()
+    assert thread.starter_name == "Renamed"
+    assert thread.starter_slug == "renamed"
+
+
+def test_propagate_username_change_task_uses_current_username(default_category, user):
+    thread = post_thread(default_category, poster=user)
+    User.objects.filter(id=user.id).update(username="Renamed", slug="renamed")
+    propagate_username_change(user.id)
+
+    # Task of earlier rename that runs late doesn't restore old name
+    User.objects.filter(id=user.id).update(username="Renamed2", slug="renamed2")
+    propagate_username_change(user.id)
+    propagate_username_change(user.id)
+
+    thread.refresh_from_db()
+    assert thread.starter_name == "Renamed2"
+
+
+def test_propagate_username_change_task_skips_deleted_user(db):
+    propagate_username_change(1000)
+
+
+def test_username_change_updates_usernames_in_request(default_category, user):
+    thread = post_thread(default_category, poster=user)
+    user.set_username("Renamed")
+
+    thread.refresh_from_db()
+    assert thread.starter_name == "Renamed"
+
+
+@override_settings(MISAGO_DEFER_USERNAME_CHANGES=True)
+def test_username_change_is_deferred_to_task(default_category, user):
+    thread = post_thread(default_category, poster=user)
+
+    with patch("misago.threads.signals.transaction.on_commit") as on_commit:
+        with patch("misago.threads.signals.propagate_username_change") as task:
+            user.set_username("Renamed")
+
+            thread.refresh_from_db()
+            assert thread.starter_name != "Renamed"
+            task.delay.assert_not_called()
+
+            on_commit.call_args[0][0]()
+            task.delay.assert_called_once_with(user.id)
+
+
+def test_user_last_likes_are_anonymized_with_order_kept(
+    default_category, user, other_user
+):
+    thread = post_thread(default_category)
+    posts = [reply_thread(thread) for _ in range(3)]
+    for post in posts:
+        like_post(post, other_user)
+        like_post(post, user)
+        like_post(post, username="Guest")
+
+    user.username = "Deleted"
+    anonymize_last_likes(user, batch_size=1)
+
+    for post in posts:
+        post.refresh_from_db()
+        assert post.last_likes == [
+            {"id": None, "username": "Guest"},
+            {"id": None, "username": "Deleted"},
+            {"id": other_user.id, "username": other_user.username},
+        ]
+
+
+def test_anonymizing_last_likes_skips_posts_not_liked_by_user(
+    default_category, user, other_user
+):
+    thread = post_thread(default_category)
+    post = reply_thread(thread)
+    like_post(post, other_user)
+
+    anonymize_last_likes(user)
+
+    post.refresh_from_db()
+    assert post.last_likes == [{"id": other_user.id, "username": other_user.username}]
@@ -63,6 +63,9 @@ class ThreadType:
     def get_post_split_api_url(self, thread):
         return None
 
+    def get_posts_read_api_url(self, thread):
+        return None
+
     def get_post_absolute_url(self, post):
         return None
 
@@ -1,108 +1,113 @@
-from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from . import ThreadType
+from .urltemplates import URLTemplate
 from ...categories import PRIVATE_THREADS_ROOT_NAME
 
 
 class PrivateThread(ThreadType):
     root_name = PRIVATE_THREADS_ROOT_NAME
 
+    threads_url = URLTemplate("misago:private-threads")
+    thread_url = URLTemplate("misago:private-thread", "slug", "pk")
+    thread_page_url = URLTemplate("misago:private-thread", "slug", "pk", "page")
+    thread_last_url = URLTemplate("misago:private-thread-last", "slug", "pk")
+    thread_new_url = URLTemplate("misago:private-thread-new", "slug", "pk")
+    thread_post_url = URLTemplate("misago:private-thread-post", "slug", "pk", "post")
+
+    thread_api_url = URLTemplate("misago:api:private-thread-detail", "pk")
+    thread_editor_api_url = URLTemplate(
+        "misago:api:private-thread-post-editor", "thread_pk"
+    )
+    thread_posts_api_url = URLTemplate(
+        "misago:api:private-thread-post-list", "thread_pk"
+    )
+    post_merge_api_url = URLTemplate(
+        "misago:api:private-thread-post-merge", "thread_pk"
+    )
+    posts_read_api_url = URLTemplate("misago:api:private-thread-post-read", "thread_pk")
+    post_api_url = URLTemplate(
+        "misago:api:private-thread-post-detail", "thread_pk", "pk"
+    )
+    post_likes_api_url = URLTemplate(
+        "misago:api:private-thread-post-likes", "thread_pk", "pk"
+    )
+    post_editor_api_url = URLTemplate(
+        "misago:api:private-thread-post-editor", "thread_pk", "pk"
+    )
+    post_edits_api_url = URLTemplate(
+        "misago:api:private-thread-post-edits", "thread_pk", "pk"
+    )
+    post_read_api_url = URLTemplate(
+        "misago:api:private-thread-post-read", "thread_pk", "pk"
+    )
+
     def get_category_name(self, category):
         return _("Private threads")
 
     def get_category_absolute_url(self, category):
-        return reverse("misago:private-threads")
+        return self.threads_url.format()
 
     def get_category_last_thread_url(self, category):
-        return reverse(
-            "misago:private-thread",
-            kwargs={"slug": category.last_thread_slug, "pk": category.last_thread_id},
+        return self.thread_url.format(
+            slug=category.last_thread_slug, pk=category.last_thread_id
         )
 
     def get_category_last_thread_new_url(self, category):
-        return reverse(
-            "misago:private-thread-new",
-            kwargs={"slug": category.last_thread_slug, "pk": category.last_thread_id},
+        return self.thread_new_url.format(
+            slug=category.last_thread_slug, pk=category.last_thread_id
         )
 
     def get_category_last_post_url(self, category):
-        return reverse(
-            "misago:private-thread-last",
-            kwargs={"slug": category.last_thread_slug, "pk": category.last_thread_id},
+        return self.thread_last_url.format(
+            slug=category.last_thread_slug, pk=category.last_thread_id
         )
 
     def get_thread_absolute_url(self, thread, page=1):
         if page > 1:
-            return reverse(
-                "misago:private-thread",
-                kwargs={"slug": thread.slug, "pk": thread.pk, "page": page},
+            return self.thread_page_url.format(
+                slug=thread.slug, pk=thread.pk, page=page
             )
 
-        return reverse(
-            "misago:private-thread", kwargs={"slug": thread.slug, "pk": thread.pk}
-        )
+        return self.thread_url.format(slug=thread.slug, pk=thread.pk)
 
     def get_thread_last_post_url(self, thread):
-        return reverse(
-            "misago:private-thread-last", kwargs={"slug": thread.slug, "pk": thread.pk}
-        )
+        return self.thread_last_url.format(slug=thread.slug, pk=thread.pk)
 
     def get_thread_new_post_url(self, thread):
-        return reverse(
-            "misago:private-thread-new", kwargs={"slug": thread.slug, "pk": thread.pk}
-        )
+        return self.thread_new_url.format(slug=thread.slug, pk=thread.pk)
 
     def get_thread_api_url(self, thread):
-        return reverse("misago:api:private-thread-detail", kwargs={"pk": thread.pk})
+        return self.thread_api_url.format(pk=thread.pk)
 
     def get_thread_editor_api_url(self, thread):
-        return reverse(
-            "misago:api:private-thread-post-editor", kwargs={"thread_pk": thread.pk}
-        )
+        return self.thread_editor_api_url.format(thread_pk=thread.pk)
 
     def get_thread_posts_api_url(self, thread):
-        return reverse(
-            "misago:api:private-thread-post-list", kwargs={"thread_pk": thread.pk}
-        )
+        return self.thread_posts_api_url.format(thread_pk=thread.pk)
 
     def get_post_merge_api_url(self, thread):
-        return reverse(
-            "misago:api:private-thread-post-merge", kwargs={"thread_pk": thread.pk}
-        )
+        return self.post_merge_api_url.format(thread_pk=thread.pk)
+
+    def get_posts_read_api_url(self, thread):
+        return self.posts_read_api_url.format(thread_pk=thread.pk)
 
     def get_post_absolute_url(self, post):
-        return reverse(
-            "misago:private-thread-post",
-            kwargs={"slug": post.thread.slug, "pk": post.thread.pk, "post": post.pk},
+        return self.thread_post_url.format(
+            slug=post.thread.slug, pk=post.thread.pk, post=post.pk
         )
 
     def get_post_api_url(self, post):
-        return reverse(
-            "misago:api:private-thread-post-detail",
-            kwargs={"thread_pk": post.thread_id, "pk": post.pk},
-        )
+        return self.post_api_url.format(thread_pk=post.thread_id, pk=post.pk)
 
     def get_post_likes_api_url(self, post):
-        return reverse(
-            "misago:api:private-thread-post-likes",
-            kwargs={"thread_pk": post.thread_id, "pk": post.pk},
-        )
+        return self.post_likes_api_url.format(thread_pk=post.thread_id, pk=post.pk)
 
     def get_post_editor_api_url(self, post):
-        return reverse(
-            "misago:api:private-thread-post-editor",
-            kwargs={"thread_pk": post.thread_id, "pk": post.pk},
-        )
+        return self.post_editor_api_url.format(thread_pk=post.thread_id, pk=post.pk)
 
     def get_post_edits_api_url(self, post):
-        return reverse(
-            "misago:api:private-thread-post-edits",
-            kwargs={"thread_pk": post.thread_id, "pk": post.pk},
-        )
+        return self.post_edits_api_url.format(thread_pk=post.thread_id, pk=post.pk)
 
     def get_post_read_api_url(self, post):
-        return reverse(
-            "misago:api:private-thread-post-read",
-            kwargs={"thread_pk": post.thread_id, "pk": post.pk},
-        )
+        return self.post_read_api_url.format(thread_pk=post.thread_id, pk=post.pk)
@@ -1,13 +1,42 @@
-from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from . import ThreadType
+from .urltemplates import URLTemplate
 from ...categories import THREADS_ROOT_NAME
 
 
 class Thread(ThreadType):
     root_name = THREADS_ROOT_NAME
 
+    threads_url = URLTemplate("misago:threads")
+    category_url = URLTemplate("misago:category", "slug", "pk")
+    thread_url = URLTemplate("misago:thread", "slug", "pk")
+    thread_page_url = URLTemplate("misago:thread", "slug", "pk", "page")
+    thread_last_url = URLTemplate("misago:thread-last", "slug", "pk")
+    thread_new_url = URLTemplate("misago:thread-new", "slug", "pk")
+    thread_best_answer_url = URLTemplate("misago:thread-best-answer", "slug", "pk")
+    thread_unapproved_url = URLTemplate("misago:thread-unapproved", "slug", "pk")
+    thread_post_url = URLTemplate("misago:thread-post", "slug", "pk", "post")
+
+    thread_api_url = URLTemplate("misago:api:thread-detail", "pk")
+    thread_merge_api_url = URLTemplate("misago:api:thread-merge", "pk")
+    thread_editor_api_url = URLTemplate("misago:api:thread-post-editor", "thread_pk")
+    thread_poll_api_url = URLTemplate("misago:api:thread-poll-list", "thread_pk")
+    thread_posts_api_url = URLTemplate("misago:api:thread-post-list", "thread_pk")
+    post_merge_api_url = URLTemplate("misago:api:thread-post-merge", "thread_pk")
+    post_move_api_url = URLTemplate("misago:api:thread-post-move", "thread_pk")
+    post_split_api_url = URLTemplate("misago:api:thread-post-split", "thread_pk")
+    posts_read_api_url = URLTemplate("misago:api:thread-post-read", "thread_pk")
+    poll_api_url = URLTemplate("misago:api:thread-poll-detail", "thread_pk", "pk")
+    poll_votes_api_url = URLTemplate("misago:api:thread-poll-votes", "thread_pk", "pk")
+    post_api_url = URLTemplate("misago:api:thread-post-detail", "thread_pk", "pk")
+    post_likes_api_url = URLTemplate("misago:api:thread-post-likes", "thread_pk", "pk")
+    post_editor_api_url = URLTemplate(
+        "misago:api:thread-post-editor", "thread_pk", "pk"
+    )
+    post_edits_api_url = URLTemplate("misago:api:thread-post-edits", "thread_pk", "pk")
+    post_read_api_url = URLTemplate("misago:api:thread-post-read", "thread_pk", "pk")
+
     def get_category_name(self, category):
         if category.level:
             return category.name
@@ -15,127 +44,94 @@ class Thread(ThreadType):
 
     def get_category_absolute_url(self, category):
         if category.level:
-            return reverse(
-                "misago:category", kwargs={"pk": category.pk, "slug": category.slug}
-            )
+            return self.category_url.format(slug=category.slug, pk=category.pk)
 
-        return reverse("misago:threads")
+        return self.threads_url.format()
 
     def get_category_last_thread_url(self, category):
-        return reverse(
-            "misago:thread",
-            kwargs={"slug": category.last_thread_slug, "pk": category.last_thread_id},
+        return self.thread_url.format(
+            slug=category.last_thread_slug, pk=category.last_thread_id
         )
 
     def get_category_last_thread_new_url(self, category):
-        return reverse(
-            "misago:thread-new",
-            kwargs={"slug": category.last_thread_slug, "pk": category.last_thread_id},
+        return self.thread_new_url.format(
+            slug=category.last_thread_slug, pk=category.last_thread_id
         )
 
     def get_category_last_post_url(self, category):
-        return reverse(
-            "misago:thread-last",
-            kwargs={"slug": category.last_thread_slug, "pk": category.last_thread_id},
+        return self.thread_last_url.format(
+            slug=category.last_thread_slug, pk=category.last_thread_id
         )
 
     def get_thread_absolute_url(self, thread, page=1):
         if page > 1:
-            return reverse(
-                "misago:thread",
-                kwargs={"slug": thread.slug, "pk": thread.pk, "page": page},
+            return self.thread_page_url.format(
+                slug=thread.slug, pk=thread.pk, page=page
             )
 
-        return reverse("misago:thread", kwargs={"slug": thread.slug, "pk": thread.pk})
+        return self.thread_url.format(slug=thread.slug, pk=thread.pk)
 
     def get_thread_last_post_url(self, thread):
-        return reverse(
-            "misago:thread-last", kwargs={"slug": thread.slug, "pk": thread.pk}
-        )
+        return self.thread_last_url.format(slug=thread.slug, pk=thread.pk)
 
     def get_thread_new_post_url(self, thread):
-        return reverse(
-            "misago:thread-new", kwargs={"slug": thread.slug, "pk": thread.pk}
-        )
+        return self.thread_new_url.format(slug=thread.slug, pk=thread.pk)
 
     def get_thread_best_answer_url(self, thread):
-        return reverse(
-            "misago:thread-best-answer", kwargs={"slug": thread.slug, "pk": thread.pk}
-        )
+        return self.thread_best_answer_url.format(slug=thread.slug, pk=thread.pk)
 
     def get_thread_unapproved_post_url(self, thread):
-        return reverse(
-            "misago:thread-unapproved", kwargs={"slug": thread.slug, "pk": thread.pk}
-        )
+        return self.thread_unapproved_url.format(slug=thread.slug, pk=thread.pk)
 
     def get_thread_api_url(self, thread):
-        return reverse("misago:api:thread-detail", kwargs={"pk": thread.pk})
+        return self.thread_api_url.format(pk=thread.pk)
 
     def get_thread_editor_api_url(self, thread):
-        return reverse("misago:api:thread-post-editor", kwargs={"thread_pk": thread.pk})
+        return self.thread_editor_api_url.format(thread_pk=thread.pk)
 
     def get_thread_merge_api_url(self, thread):
-        return reverse("misago:api:thread-merge", kwargs={"pk": thread.pk})
+        return self.thread_merge_api_url.format(pk=thread.pk)
 
     def get_thread_poll_api_url(self, thread):
-        return reverse("misago:api:thread-poll-list", kwargs={"thread_pk": thread.pk})
+        return self.thread_poll_api_url.format(thread_pk=thread.pk)
 
     def get_thread_posts_api_url(self, thread):
-        return reverse("misago:api:thread-post-list", kwargs={"thread_pk": thread.pk})
+        return self.thread_posts_api_url.format(thread_pk=thread.pk)
 
     def get_poll_api_url(self, poll):
-        return reverse(
-            "misago:api:thread-poll-detail",
-            kwargs={"thread_pk": poll.thread_id, "pk": poll.pk},
-        )
+        return self.poll_api_url.format(thread_pk=poll.thread_id, pk=poll.pk)
 
     def get_poll_votes_api_url(self, poll):
-        return reverse(
-            "misago:api:thread-poll-votes",
-            kwargs={"thread_pk": poll.thread_id, "pk": poll.pk},
-        )
+        return self.poll_votes_api_url.format(thread_pk=poll.thread_id, pk=poll.pk)
 
     def get_post_merge_api_url(self, thread):
-        return reverse("misago:api:thread-post-merge", kwargs={"thread_pk": thread.pk})
+        return self.post_merge_api_url.format(thread_pk=thread.pk)
 
     def get_post_move_api_url(self, thread):
-        return reverse("misago:api:thread-post-move", kwargs={"thread_pk": thread.pk})
+        return self.post_move_api_url.format(thread_pk=thread.pk)
 
     def get_post_split_api_url(self, thread):
-        return reverse("misago:api:thread-post-split", kwargs={"thread_pk": thread.pk})
+        return self.post_split_api_url.format(thread_pk=thread.pk)
+
+    def get_posts_read_api_url(self, thread):
+        return self.posts_read_api_url.format(thread_pk=thread.pk)
 
     def get_post_absolute_url(self, post):
-        return reverse(
-            "misago:thread-post",
-            kwargs={"slug": post.thread.slug, "pk": post.thread.pk, "post": post.pk},
+        return self.thread_post_url.format(
+            slug=post.thread.slug, pk=post.thread.pk, post=post.pk
         )
 
     def get_post_api_url(self, post):
-        return reverse(
-            "misago:api:thread-post-detail",
-            kwargs={"thread_pk": post.thread_id, "pk": post.pk},
-        )
+        return self.post_api_url.format(thread_pk=post.thread_id, pk=post.pk)
 
     def get_post_likes_api_url(self, post):
-        return reverse(
-            "misago:api:thread-post-likes",
-            kwargs={"thread_pk": post.thread_id, "pk": post.pk},
-        )
+        return self.post_likes_api_url.format(thread_pk=post.thread_id, pk=post.pk)
 
     def get_post_editor_api_url(self, post):
-        return reverse(
-            "misago:api:thread-post-editor",
-            kwargs={"thread_pk": post.thread_id, "pk": post.pk},
-        )
+        return self.post_editor_api_url.format(thread_pk=post.thread_id, pk=post.pk)
 
     def get_post_edits_api_url(self, post):
-        return reverse(
-            "misago:api:thread-post-edits",
-            kwargs={"thread_pk": post.thread_id, "pk": post.pk},
-        )
+        return self.post_edits_api_url.format(thread_pk=post.thread_id, pk=post.pk)
 
     def get_post_read_api_url(self, post):
-        return reverse(
-            "misago:api:thread-post-read",
-            kwargs={"thread_pk": post.thread_id, "pk": post.pk},
-        )
+        return self.post_read_api_url.format(thread_pk=post.thread_id, pk=post.pk)
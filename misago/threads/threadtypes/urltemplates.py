@@ -0,0 +1,64 @@
+"""
+URLs of threads types compiled into format templates
+
+Reversing URL through Django's resolver is expensive, and thread types build
+many URLs for every serialized thread, post or category. URL template is
+reversed once with placeholders for its arguments, and later URLs are made by
+formatting this template with script prefix and arguments values.
+
+Arguments values are not quoted, so templates are only used for ids and slugs.
+"""
+from weakref import WeakSet
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_script_prefix, reverse
+
+PLACEHOLDER = "9173"
+PLACEHOLDER_DIGITS = 12
+
+_templates = WeakSet()
+
+
+class URLTemplate:
+    def __init__(self, viewname, *args):
+        self.viewname = viewname
+        self.args = args
+        self.template = None
+
+        _templates.add(self)
+
+    def format(self, **kwargs):
+        if self.template is None:
+            self.template = self.compile()
+        return get_script_prefix() + self.template.format_map(kwargs)
+
+    def reverse(self, **kwargs):
+        return reverse(self.viewname, kwargs=kwargs or None)
+
+    def compile(self):
+        placeholders = {arg: get_placeholder(i) for i, arg in enumerate(self.args)}
+        url = self.reverse(**placeholders)[len(get_script_prefix()) :]
+        template = url.replace("{", "{{").replace("}", "}}")
+        for arg, placeholder in placeholders.items():
+            if template.count(placeholder) != 1:
+                raise ValueError(
+                    "'%s' argument can't be compiled in '%s' URL template"
+                    % (arg, self.viewname)
+                )
+            template = template.replace(placeholder, "{%s}" % arg)
+        return template
+
+    def clear(self):
+        self.template = None
+
+
+def get_placeholder(index):
+    return PLACEHOLDER + str(index).zfill(PLACEHOLDER_DIGITS - len(PLACEHOLDER))
+
+
+@receiver(setting_changed)
+def clear_url_templates(*, setting, **kwargs):
+    if setting == "ROOT_URLCONF":
+        for template in _templates:
+            template.clear()
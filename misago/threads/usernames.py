@@ -0,0 +1,41 @@
+from ..core.pgutils import chunk_ids_ranges
+from .models import Attachment, Poll, PollVote, Post, PostEdit, PostLike, Thread
+
+# Size of ids range updated by single query
+UPDATE_BATCH_SIZE = 5000
+
+# Model, user field, name field and slug field of every denormalized username
+DENORMALIZED_USERNAMES = (
+    (Thread, "starter", "starter_name", "starter_slug"),
+    (Thread, "last_poster", "last_poster_name", "last_poster_slug"),
+    (
+        Thread,
+        "best_answer_marked_by",
+        "best_answer_marked_by_name",
+        "best_answer_marked_by_slug",
+    ),
+    (Post, "poster", "poster_name", None),
+    (Post, "last_editor", "last_editor_name", "last_editor_slug"),
+    (PostEdit, "editor", "editor_name", "editor_slug"),
+    (PostLike, "liker", "liker_name", "liker_slug"),
+    (Attachment, "uploader", "uploader_name", "uploader_slug"),
+    (Poll, "poster", "poster_name", "poster_slug"),
+    (PollVote, "voter", "voter_name", "voter_slug"),
+)
+
+
+def update_usernames(user_id, username, slug, batch_size=UPDATE_BATCH_SIZE):
+    """
+    Updates user's name and slug denormalized on threads content
+
+    Rows are updated in ranges of ids, so single query never locks more than
+    batch_size rows.
+    """
+    for model, user_field, name_field, slug_field in DENORMALIZED_USERNAMES:
+        queryset = model.objects.filter(**{"%s_id" % user_field: user_id})
+        values = {name_field: username}
+        if slug_field:
+            values[slug_field] = slug
+
+        for start_id, end_id in chunk_ids_ranges(queryset, batch_size):
+            queryset.filter(id__gte=start_id, id__lt=end_id).update(**values)
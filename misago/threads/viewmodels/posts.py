@@ -1,9 +1,13 @@
+from functools import partial
+
 from ...acl.objectacl import add_acl_to_obj
 from ...core.shortcuts import paginate, pagination_dict
 from ...readtracker.poststracker import make_read_aware
-from ...users.online.utils import make_users_status_aware
-from ..paginator import PostsPaginator
+from ..contentcache import add_cached_content_to_posts
+from ..paginator import KeysetPostsPaginator, PostsPaginator
 from ..permissions import exclude_invisible_posts
+from ..postercards import add_poster_cards_to_posts
+from ..postspages import can_use_posts_pages, get_posts_pages
 from ..serializers import PostSerializer
 from ..utils import add_likes_to_posts
 
@@ -21,22 +25,24 @@ class ViewModel:
 
         posts_limit = request.settings.posts_per_page
         posts_orphans = request.settings.posts_per_page_orphans
+        if can_use_posts_pages(thread_model):
+            posts_pages = get_posts_pages(thread_model, posts_limit, posts_orphans)
+            paginator_class = partial(KeysetPostsPaginator, pages=posts_pages)
+        else:
+            paginator_class = PostsPaginator
+
         list_page = paginate(
-            posts_queryset, page, posts_limit, posts_orphans, paginator=PostsPaginator
+            posts_queryset, page, posts_limit, posts_orphans, paginator=paginator_class
         )
         paginator = pagination_dict(list_page)
 
         posts = list(list_page.object_list)
-        posters = []
 
         for post in posts:
             post.category = thread.category
             post.thread = thread_model
 
-            if post.poster:
-                posters.append(post.poster)
-
-        make_users_status_aware(request, posters)
+        add_cached_content_to_posts(posts)
 
         if thread.category.acl["can_see_posts_likes"]:
             add_likes_to_posts(request.user, posts)
@@ -51,13 +57,21 @@ class ViewModel:
                 last_post = posts[-1]
 
             events_limit = request.settings.events_per_page
-            posts += self.get_events_queryset(
+            events = self.get_events_queryset(
                 request, thread_model, events_limit, first_post, last_post
             )
 
+            for event in events:
+                event.category = thread.category
+                event.thread = thread_model
+
+            posts += events
+
             # sort both by pk
             posts.sort(key=lambda p: p.pk)
 
+        add_poster_cards_to_posts(request, posts)
+
         # make posts and events ACL and reads aware
         add_acl_to_obj(request.user_acl, posts)
         make_read_aware(request, posts)
@@ -68,29 +82,13 @@ class ViewModel:
         self.paginator = paginator
 
     def get_posts_queryset(self, request, thread):
-        queryset = (
-            thread.post_set.select_related(
-                "category",
-                "poster",
-                "poster__rank",
-                "poster__ban_cache",
-                "poster__online_tracker",
-            )
-            .filter(is_event=False)
-            .order_by("id")
-        )
+        queryset = thread.post_set.filter(is_event=False).order_by("id")
         return exclude_invisible_posts(request.user_acl, thread.category, queryset)
 
     def get_events_queryset(
         self, request, thread, limit, first_post=None, last_post=None
     ):
-        queryset = thread.post_set.select_related(
-            "category",
-            "poster",
-            "poster__rank",
-            "poster__ban_cache",
-            "poster__online_tracker",
-        ).filter(is_event=True)
+        queryset = thread.post_set.filter(is_event=True)
 
         if first_post:
             queryset = queryset.filter(pk__gt=first_post.pk)
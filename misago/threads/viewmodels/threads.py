@@ -9,6 +9,7 @@ from ...acl.objectacl import add_acl_to_obj
 from ...core.cursorpagination import get_page
 from ...readtracker import threadstracker
 from ...readtracker.cutoffdate import get_cutoff_date
+from ...readtracker.watermarks import exclude_read_posts
 from ..models import Post, Thread
 from ..participants import make_participants_aware
 from ..permissions import exclude_invisible_posts, exclude_invisible_threads
@@ -212,19 +213,15 @@ def filter_read_threads_queryset(request, categories, list_type, queryset):
     visible_posts = Post.objects.filter(posted_on__gt=cutoff_date)
     visible_posts = exclude_invisible_posts(request.user_acl, categories, visible_posts)
 
-    queryset = queryset.filter(id__in=visible_posts.distinct().values("thread"))
+    unread_posts = exclude_read_posts(request.user, visible_posts)
+    queryset = queryset.filter(id__in=unread_posts.values("thread"))
 
-    read_posts = visible_posts.filter(id__in=request.user.postread_set.values("post"))
+    read_threads = request.user.threadread_set.filter(read_until__gt=cutoff_date)
 
     if list_type == "new":
-        # new threads have no entry in reads table
-        return queryset.exclude(id__in=read_posts.distinct().values("thread"))
+        # new threads have no watermark in reads table
+        return queryset.exclude(id__in=read_threads.values("thread"))
 
     if list_type == "unread":
         # unread threads were read in past but have new posts
-        unread_posts = visible_posts.exclude(
-            id__in=request.user.postread_set.values("post")
-        )
-        queryset = queryset.filter(id__in=read_posts.distinct().values("thread"))
-        queryset = queryset.filter(id__in=unread_posts.distinct().values("thread"))
-        return queryset
+        return queryset.filter(id__in=read_threads.values("thread"))
@@ -8,7 +8,9 @@ from django.views import View
 
 from ...conf import settings
 from ...readtracker.cutoffdate import get_cutoff_date
+from ...readtracker.watermarks import exclude_read_posts
 from ..permissions import exclude_invisible_posts
+from ..postspages import can_use_posts_pages, get_posts_pages
 from ..viewmodels import ForumThread, PrivateThread
 
 
@@ -26,7 +28,15 @@ class GotoView(View):
         target_post = self.get_target_post(
             request.user, thread, posts_queryset.order_by("id"), **kwargs
         )
-        target_page = self.compute_post_page(target_post, posts_queryset)
+        if can_use_posts_pages(thread):
+            posts_pages = get_posts_pages(
+                thread,
+                request.settings.posts_per_page,
+                request.settings.posts_per_page_orphans,
+            )
+            target_page = posts_pages.get_post_page(target_post)
+        else:
+            target_page = self.compute_post_page(target_post, posts_queryset)
 
         return self.get_redirect(thread, target_post, target_page)
 
@@ -92,10 +102,9 @@ class GetFirstUnreadPostMixin:
         if user.is_authenticated:
             cutoff_date = get_cutoff_date(self.request.settings, user)
             expired_posts = Q(posted_on__lt=cutoff_date)
-            read_posts = Q(id__in=user.postread_set.values("post"))
 
             first_unread = (
-                posts_queryset.exclude(expired_posts | read_posts)
+                exclude_read_posts(user, posts_queryset.exclude(expired_posts))
                 .order_by("id")
                 .first()
             )
@@ -4,6 +4,9 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from ...conf import settings
+from ..search import find_users_by_slug
+
+MAX_SUGGESTIONS = 10
 
 User = get_user_model()
 
@@ -14,11 +17,10 @@ def mention_suggestions(request):
 
     query = request.query_params.get("q", "").lower().strip()[:100]
     if query:
-        queryset = User.objects.filter(slug__startswith=query, is_active=True).order_by(
-            "slug"
-        )[:10]
+        queryset = User.objects.filter(is_active=True)
+        users = find_users_by_slug(queryset, query, MAX_SUGGESTIONS, MAX_SUGGESTIONS)
 
-        for user in queryset:
+        for user in users:
             try:
                 avatar = user.avatars[-1]["url"]
             except IndexError:
@@ -0,0 +1,194 @@
+"""
+Indexed matcher for checking values against bans list
+
+Matcher is built once for every version of bans cache, stored in shared cache
+and kept in process memory, so checking value doesn't query database and takes
+similar time no matter how long bans list is.
+"""
+import re
+from ipaddress import ip_address, ip_network
+from threading import Lock
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..cache.versions import get_cache_versions
+from . import BANS_CACHE
+from .models import Ban
+
+MATCHER_CACHE_KEY = "misago_bans_matcher_%s"
+
+BAN_FIELDS = (
+    "id",
+    "check_type",
+    "registration_only",
+    "banned_value",
+    "user_message",
+    "staff_message",
+    "expires_on",
+)
+
+_lock = Lock()
+_matcher = None
+
+
+class BansMatcher:
+    """
+    Bans are indexed by their type and banned value:
+
+    - values without wildcards are indexed by value.
+    - values with single wildcard at end or start are indexed by prefix or
+      suffix, and value's prefixes or suffixes are looked up in index.
+    - IP bans in CIDR notation are indexed by network address and prefix
+      length.
+    - other wildcard values are checked using regular expression compiled for
+      every distinct value.
+    """
+
+    def __init__(self, bans):
+        self.bans = {}
+        self.exact = {}
+        self.prefixes = {}
+        self.suffixes = {}
+        self.networks = {}
+        self.patterns = {}
+
+        for ban in bans:
+            self.add_ban(ban)
+
+    def add_ban(self, ban):
+        self.bans[ban["id"]] = ban
+
+        check_type = ban["check_type"]
+        value = ban["banned_value"].lower()
+        wildcards = value.count("*")
+
+        if not wildcards:
+            network = get_ip_network(value) if check_type == Ban.IP else None
+            if network:
+                index = self.networks.setdefault(network.prefixlen, {})
+                index_key = (network.version, int(network.network_address))
+                index.setdefault(index_key, []).append(ban["id"])
+            else:
+                index = self.exact.setdefault(check_type, {})
+                index.setdefault(value, []).append(ban["id"])
+        elif wildcards == 1 and value.endswith("*"):
+            index = self.prefixes.setdefault(check_type, {})
+            index.setdefault(value[:-1], []).append(ban["id"])
+        elif wildcards == 1 and value.startswith("*"):
+            index = self.suffixes.setdefault(check_type, {})
+            index.setdefault(value[1:], []).append(ban["id"])
+        else:
+            index = self.patterns.setdefault(check_type, {})
+            if value not in index:
+                regex = re.escape(value).replace(r"\*", r"(.*?)")
+                index[value] = (re.compile("^%s$" % regex), [])
+            index[value][1].append(ban["id"])
+
+    def match(self, username=None, email=None, ip=None, registration_only=False):
+        """Returns dict with newest ban matching any of values or None"""
+        candidates = set()
+        if username:
+            candidates.update(self.find_bans(Ban.USERNAME, username.lower()))
+        if email:
+            candidates.update(self.find_bans(Ban.EMAIL, email.lower()))
+        if ip:
+            candidates.update(self.find_bans(Ban.IP, ip.lower()))
+            candidates.update(self.find_network_bans(ip))
+
+        now = timezone.now()
+        for ban_id in sorted(candidates, reverse=True):
+            ban = self.bans[ban_id]
+            if ban["registration_only"] and not registration_only:
+                continue
+            if ban["expires_on"] and ban["expires_on"] < now:
+                continue
+            return ban
+
+        return None
+
+    def find_bans(self, check_type, value):
+        found = []
+
+        exact = self.exact.get(check_type)
+        if exact:
+            found += exact.get(value, [])
+
+        prefixes = self.prefixes.get(check_type)
+        if prefixes:
+            for i in range(len(value) + 1):
+                found += prefixes.get(value[:i], [])
+
+        suffixes = self.suffixes.get(check_type)
+        if suffixes:
+            for i in range(len(value) + 1):
+                found += suffixes.get(value[i:], [])
+
+        patterns = self.patterns.get(check_type)
+        if patterns:
+            for regex, bans_ids in patterns.values():
+                if regex.search(value):
+                    found += bans_ids
+
+        return found
+
+    def find_network_bans(self, ip):
+        if not self.networks:
+            return []
+
+        try:
+            address = ip_address(ip)
+        except ValueError:
+            return []
+
+        found = []
+        address_int = int(address)
+        for prefixlen, index in self.networks.items():
+            if prefixlen > address.max_prefixlen:
+                continue
+            mask = ~((1 << (address.max_prefixlen - prefixlen)) - 1)
+            found += index.get((address.version, address_int & mask), [])
+        return found
+
+
+def get_ip_network(value):
+    if "/" not in value:
+        return None
+
+    try:
+        return ip_network(value, strict=False)
+    except ValueError:
+        return None
+
+
+def get_bans_matcher():
+    global _matcher  # pylint: disable=global-statement
+
+    version = get_cache_versions()[BANS_CACHE]
+
+    matcher = _matcher
+    if matcher and matcher[0] == version:
+        return matcher[1]
+
+    with _lock:
+        if _matcher and _matcher[0] == version:
+            return _matcher[1]
+
+        cache_key = MATCHER_CACHE_KEY % version
+        bans_matcher = cache.get(cache_key)
+        if bans_matcher is None:
+            bans_matcher = build_bans_matcher()
+            cache.set(cache_key, bans_matcher)
+
+        _matcher = (version, bans_matcher)
+        return bans_matcher
+
+
+def build_bans_matcher():
+    queryset = Ban.objects.filter(is_checked=True).values(*BAN_FIELDS)
+    return BansMatcher(queryset.iterator())
+
+
+def clear_bans_matcher():
+    global _matcher  # pylint: disable=global-statement
+    _matcher = None
@@ -0,0 +1,118 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...banmatcher import BansMatcher
+from ...models import Ban
+
+
+class Command(BaseCommand):
+    help = "Benchmarks checking values against bans list"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "bans", help="number of bans to check", nargs="?", type=int, default=100000
+        )
+        parser.add_argument(
+            "--lookups", help="number of values to look up", type=int, default=1000
+        )
+        parser.add_argument(
+            "--linear-lookups",
+            help="number of values to look up in linear scan",
+            type=int,
+            default=10,
+        )
+
+    def handle(self, *args, **options):
+        bans = get_benchmark_bans(options["bans"])
+        values = get_benchmark_values(options["bans"], options["lookups"])
+
+        self.stdout.write("Checking values against %s bans...\n" % len(bans))
+
+        start_time = time.perf_counter()
+        matcher = BansMatcher(bans)
+        build_time = time.perf_counter() - start_time
+        self.stdout.write("Matcher built in %.2f s" % build_time)
+
+        start_time = time.perf_counter()
+        for value in values:
+            matcher.match(**value)
+        indexed_time = (time.perf_counter() - start_time) / len(values)
+        self.stdout.write("Indexed matcher: %.4f ms/lookup" % (indexed_time * 1000))
+
+        bans_models = [Ban(**ban) for ban in sorted(bans, key=lambda b: -b["id"])]
+        linear_values = values[: options["linear_lookups"]]
+
+        start_time = time.perf_counter()
+        for value in linear_values:
+            match_linear(bans_models, **value)
+        linear_time = (time.perf_counter() - start_time) / len(linear_values)
+        self.stdout.write("Linear scan: %.4f ms/lookup" % (linear_time * 1000))
+
+        self.stdout.write("Speedup: %.2fx" % (linear_time / indexed_time))
+
+
+def get_benchmark_bans(count):
+    bans = []
+    for i in range(1, count + 1):
+        check_type, banned_value = get_benchmark_ban_value(i)
+        bans.append(
+            {
+                "id": i,
+                "check_type": check_type,
+                "registration_only": i % 10 == 0,
+                "banned_value": banned_value,
+                "user_message": None,
+                "staff_message": None,
+                "expires_on": None,
+            }
+        )
+    return bans
+
+
+def get_benchmark_ban_value(i):
+    variant = i % 8
+    if variant == 0:
+        return Ban.USERNAME, "user%s" % i
+    if variant == 1:
+        return Ban.USERNAME, "spammer%s*" % i
+    if variant == 2:
+        return Ban.EMAIL, "user%s@example.com" % i
+    if variant == 3:
+        return Ban.EMAIL, "*@spam%s.com" % i
+    if variant == 4:
+        return Ban.IP, "10.%s.%s.%s" % (i // 65536 % 256, i // 256 % 256, i % 256)
+    if variant == 5:
+        return Ban.IP, "172.%s.%s.*" % (i // 256 % 256, i % 256)
+    if variant == 6:
+        return Ban.IP, "192.%s.%s.0/24" % (i // 256 % 256, i % 256)
+    return Ban.USERNAME, "*bot%s*" % (i % 50)
+
+
+def get_benchmark_values(bans, count):
+    values = []
+    for _ in range(count):
+        i = random.randint(1, bans * 2)
+        values.append(
+            {
+                "username": "spammer%sxyz" % i,
+                "email": "user%s@spam%s.com" % (i, i),
+                "ip": "172.%s.%s.1" % (i // 256 % 256, i % 256),
+            }
+        )
+    return values
+
+
+def match_linear(bans, username=None, email=None, ip=None):
+    """Checks values against bans one by one, like bans checking did before"""
+    for ban in bans:
+        if ban.registration_only or ban.is_expired:
+            continue
+        if ban.check_type == Ban.USERNAME and username and ban.check_value(username):
+            return ban
+        if ban.check_type == Ban.EMAIL and email and ban.check_value(email):
+            return ban
+        if ban.check_type == Ban.IP and ip and ban.check_value(ip):
+            return ban
+    return None
@@ -0,0 +1,109 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from ...search import search_users
+
+User = get_user_model()
+
+SLUG_INDEX = "misago_user_slug_trgm"
+
+
+class Command(BaseCommand):
+    help = "Benchmarks searching users by substrings of their names"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "users",
+            help="number of users to search",
+            nargs="?",
+            type=int,
+            default=1000000,
+        )
+        parser.add_argument(
+            "--searches", help="number of searches to run", type=int, default=20
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write("Creating %s users...\n" % options["users"])
+
+            start_time = time.perf_counter()
+            create_benchmark_users(options["users"])
+            create_time = time.perf_counter() - start_time
+            self.stdout.write("Users created in %.2f s" % create_time)
+
+            queries = get_benchmark_queries(options["searches"])
+
+            index_time = self.run_benchmark(queries)
+            self.stdout.write("Trigram index: %.4f ms/search" % (index_time * 1000))
+
+            with connection.cursor() as cursor:
+                cursor.execute("DROP INDEX %s" % connection.ops.quote_name(SLUG_INDEX))
+
+            scan_time = self.run_benchmark(queries)
+            self.stdout.write("Sequential scan: %.4f ms/search" % (scan_time * 1000))
+
+            self.stdout.write("Speedup: %.2fx" % (scan_time / index_time))
+
+            # Benchmark users and dropped index are rolled back
+            transaction.set_rollback(True)
+
+    def run_benchmark(self, queries):
+        start_time = time.perf_counter()
+        for query in queries:
+            search_users(username=query, search_disabled=True)
+        return (time.perf_counter() - start_time) / len(queries)
+
+
+def create_benchmark_users(count):
+    """Copies template user with generated names using single query"""
+    template = User.objects.create_user("Benchmark", "benchmark@example.com")
+
+    columns = []
+    values = []
+    for field in User._meta.concrete_fields:
+        if field.primary_key:
+            continue
+
+        column = connection.ops.quote_name(field.column)
+        columns.append(column)
+
+        if field.name in ("username", "slug"):
+            values.append("'user' || SUBSTR(MD5(i::text), 1, 12)")
+        elif field.name == "email":
+            values.append("'user' || i || '@example.com'")
+        elif field.name == "email_hash":
+            values.append("MD5('user' || i || '@example.com')")
+        else:
+            values.append("u.%s" % column)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+                INSERT INTO %(table)s (%(columns)s)
+                SELECT %(values)s
+                FROM %(table)s u, GENERATE_SERIES(1, %%s) i
+                WHERE u.id = %%s
+            """
+            % {
+                "table": connection.ops.quote_name(User._meta.db_table),
+                "columns": ", ".join(columns),
+                "values": ", ".join(values),
+            },
+            [count, template.id],
+        )
+        cursor.execute("ANALYZE %s" % connection.ops.quote_name(User._meta.db_table))
+
+
+def get_benchmark_queries(count):
+    """Returns parts of random users names, that aren't their prefixes"""
+    slugs = list(User.objects.order_by("?").values_list("slug", flat=True)[:count])
+    queries = []
+    for slug in slugs:
+        start = random.randint(1, len(slug) - 4)
+        queries.append(slug[start : start + 4])
+    return queries
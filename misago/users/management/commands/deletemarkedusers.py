@@ -15,6 +15,15 @@ class Command(BaseCommand):
         "Leaves their content behind, but anonymises it."
     )
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--with-content",
+            action="store_true",
+            dest="with_content",
+            default=False,
+            help="Deletes users threads and posts instead of anonymising them.",
+        )
+
     def handle(self, *args, **options):
         users_deleted = 0
         settings = get_dynamic_settings()
@@ -23,8 +32,19 @@ class Command(BaseCommand):
 
         for user in chunk_queryset(queryset):
             if can_delete_own_account(settings, user, user):
+                if options["with_content"]:
+                    self.delete_user_content(user)
                 user.delete(anonymous_username=settings.anonymous_username)
                 record_user_deleted_by_self()
                 users_deleted += 1
 
         self.stdout.write("Deleted users: %s" % users_deleted)
+
+    def delete_user_content(self, user):
+        def show_progress(deleted_threads, deleted_posts):
+            self.stdout.write(
+                "Deleting %s content: %s threads and %s posts deleted"
+                % (user.username, deleted_threads, deleted_posts)
+            )
+
+        user.delete_content(progress=show_progress)
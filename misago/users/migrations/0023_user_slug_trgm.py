@@ -0,0 +1,22 @@
+# Generated by Django 2.2.12 on 2026-10-18 19:27
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("misago_users", "0022_deleteduser")]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["slug"],
+                name="misago_user_slug_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
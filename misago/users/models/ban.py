@@ -1,4 +1,5 @@
 import re
+from ipaddress import ip_address, ip_network
 
 from django.conf import settings
 from django.db import IntegrityError, models
@@ -23,41 +24,12 @@ class BansManager(models.Manager):
         invalidate_cache(BANS_CACHE)
 
     def get_ban(self, username=None, email=None, ip=None, registration_only=False):
-        checks = []
-
-        if username:
-            username = username.lower()
-            checks.append(self.model.USERNAME)
-        if email:
-            email = email.lower()
-            checks.append(self.model.EMAIL)
-        if ip:
-            checks.append(self.model.IP)
-
-        queryset = self.filter(is_checked=True)
-        if not registration_only:
-            queryset = self.filter(registration_only=False)
-
-        if len(checks) == 1:
-            queryset = queryset.filter(check_type=checks[0])
-        elif checks:
-            queryset = queryset.filter(check_type__in=checks)
-
-        for ban in queryset.order_by("-id").iterator():
-            if ban.is_expired:
-                continue
-            elif (
-                ban.check_type == self.model.USERNAME
-                and username
-                and ban.check_value(username)
-            ):
-                return ban
-            elif (
-                ban.check_type == self.model.EMAIL and email and ban.check_value(email)
-            ):
-                return ban
-            elif ban.check_type == self.model.IP and ip and ban.check_value(ip):
-                return ban
+        from ..banmatcher import get_bans_matcher
+
+        ban = get_bans_matcher().match(username, email, ip, registration_only)
+        if ban:
+            field_names = list(ban)
+            return self.model.from_db(self.db, field_names, list(ban.values()))
 
         raise Ban.DoesNotExist("specified values are not banned")
 
@@ -89,7 +61,15 @@ class Ban(models.Model):
         self.banned_value = self.banned_value.lower()
         self.is_checked = not self.is_expired
 
-        return super().save(*args, **kwargs)
+        super().save(*args, **kwargs)
+
+        # Bans matcher is rebuilt for new version of bans cache
+        invalidate_cache(BANS_CACHE)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_cache(BANS_CACHE)
+        return result
 
     def get_serialized_message(self):
         from ..serializers import BanMessageSerializer
@@ -107,6 +87,12 @@ class Ban(models.Model):
         return False
 
     def check_value(self, value):
+        if self.check_type == self.IP and "/" in self.banned_value:
+            try:
+                network = ip_network(self.banned_value, strict=False)
+                return ip_address(value) in network
+            except ValueError:
+                pass
         if "*" in self.banned_value:
             regex = re.escape(self.banned_value).replace(r"\*", r"(.*?)")
             return re.search("^%s$" % regex, value, re.IGNORECASE) is not None
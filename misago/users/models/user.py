@@ -5,6 +5,7 @@ from django.contrib.auth.models import AnonymousUser as DjangoAnonymousUser
 from django.contrib.auth.models import PermissionsMixin
 from django.contrib.auth.models import UserManager as BaseUserManager
 from django.contrib.postgres.fields import ArrayField, HStoreField, JSONField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.mail import send_mail
 from django.db import models
 from django.db.models import Q
@@ -240,6 +241,11 @@ class User(AbstractBaseUser, PermissionsMixin):
                 fields=["is_deleting_account"],
                 condition=Q(is_deleting_account=True),
             ),
+            GinIndex(
+                name="misago_user_slug_trgm",
+                fields=["slug"],
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
     def clean(self):
@@ -264,10 +270,10 @@ class User(AbstractBaseUser, PermissionsMixin):
 
         return super().delete(*args, **kwargs)
 
-    def delete_content(self):
+    def delete_content(self, progress=None):
         from ..signals import delete_user_content
 
-        delete_user_content.send(sender=self)
+        delete_user_content.send(sender=self, progress=progress)
 
     def mark_for_delete(self):
         self.is_active = False
@@ -0,0 +1,163 @@
+import atexit
+import logging
+from threading import Lock, Timer
+from time import monotonic
+
+from django.core.cache import cache
+from django.db import connections
+
+from ...conf import settings
+from ..models import Online
+from .utils import ACTIVITY_CUTOFF
+
+LAST_CLICK_CACHE_KEY = "misago_online_last_click_%s"
+
+logger = logging.getLogger("misago.users.online")
+
+_lock = Lock()
+_buffer = {}
+_last_flush = monotonic()
+_flush_timer = None
+
+
+def record_click(user_id, last_click):
+    """Records user's last click, writing it to database in bulk on interval.
+
+    Last click is stored in shared cache, so other processes can see it before
+    it's written, and in process-local buffer that is flushed to database once
+    every MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL seconds. Multiple clicks of same
+    user are coalesced into single update.
+
+    Buffer is flushed by next click after interval, or by timer thread if
+    process receives no more clicks, and when process exits. Clicks that
+    failed to flush are kept in buffer and retried on next flush.
+    """
+    interval = settings.MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL
+    if not interval:
+        Online.objects.filter(user_id=user_id).update(last_click=last_click)
+        return
+
+    # Clicks older than activity cutoff don't affect user's online status
+    cache.set(
+        LAST_CLICK_CACHE_KEY % user_id,
+        last_click,
+        int(ACTIVITY_CUTOFF.total_seconds()),
+    )
+
+    with _lock:
+        _buffer[user_id] = last_click
+        flush_due = monotonic() - _last_flush >= interval
+        if not flush_due:
+            start_flush_timer(interval)
+
+    if flush_due:
+        try:
+            flush_clicks()
+        except Exception:  # pylint: disable=broad-except
+            # Don't fail user's request because of online tracker
+            logger.exception("Failed to flush online tracker clicks")
+            with _lock:
+                start_flush_timer(interval)
+
+
+def start_flush_timer(interval):
+    global _flush_timer  # pylint: disable=global-statement
+
+    if not _flush_timer:
+        _flush_timer = Timer(interval, flush_clicks_from_timer)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+
+def flush_clicks_from_timer():
+    global _flush_timer  # pylint: disable=global-statement
+
+    with _lock:
+        _flush_timer = None
+
+    try:
+        flush_clicks()
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Failed to flush online tracker clicks")
+        with _lock:
+            start_flush_timer(settings.MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL)
+    finally:
+        # Timer's thread is not request's thread, close connection it opened
+        connections.close_all()
+
+
+def flush_clicks():
+    global _last_flush  # pylint: disable=global-statement
+
+    with _lock:
+        clicks = _buffer.copy()
+        _buffer.clear()
+        _last_flush = monotonic()
+
+    if clicks:
+        # Update rows in same order in all processes to avoid deadlocks
+        trackers = [
+            Online(user_id=user_id, last_click=clicks[user_id])
+            for user_id in sorted(clicks)
+        ]
+        try:
+            Online.objects.bulk_update(trackers, ["last_click"])
+        except Exception:
+            restore_clicks(clicks)
+            raise
+
+    return len(clicks)
+
+
+def restore_clicks(clicks):
+    with _lock:
+        for user_id, last_click in clicks.items():
+            # Keep newer click if user clicked again while buffer was flushed
+            if user_id not in _buffer or _buffer[user_id] < last_click:
+                _buffer[user_id] = last_click
+
+
+def discard_click(user_id):
+    with _lock:
+        _buffer.pop(user_id, None)
+    cache.delete(LAST_CLICK_CACHE_KEY % user_id)
+
+
+def clear_clicks_buffer():
+    global _flush_timer  # pylint: disable=global-statement
+
+    with _lock:
+        _buffer.clear()
+        if _flush_timer:
+            _flush_timer.cancel()
+            _flush_timer = None
+
+
+def get_last_clicks(users_ids):
+    """Returns dict of users ids and their last clicks that were not flushed yet"""
+    users_ids = set(users_ids)
+    if not users_ids or not settings.MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL:
+        return {}
+
+    cache_keys = {LAST_CLICK_CACHE_KEY % user_id: user_id for user_id in users_ids}
+    last_clicks = {
+        cache_keys[key]: last_click
+        for key, last_click in cache.get_many(cache_keys.keys()).items()
+    }
+
+    with _lock:
+        for user_id in users_ids.intersection(_buffer):
+            last_click = _buffer[user_id]
+            if user_id not in last_clicks or last_clicks[user_id] < last_click:
+                last_clicks[user_id] = last_click
+
+    return last_clicks
+
+
+@atexit.register
+def flush_clicks_on_exit():
+    # Clicks of process that is shut down or recycled would be lost otherwise
+    try:
+        flush_clicks()
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Failed to flush online tracker clicks on exit")
@@ -2,6 +2,7 @@ from django.utils import timezone
 from rest_framework.request import Request
 
 from ..models import Online
+from .buffer import discard_click, get_last_clicks, record_click
 
 
 def mute_tracker(request):
@@ -18,10 +19,15 @@ def start_tracking(request, user):
 def update_tracker(request, tracker):
     tracker.last_click = timezone.now()
 
-    tracker.save(update_fields=["last_click"])
+    record_click(tracker.user_id, tracker.last_click)
 
 
 def stop_tracking(request, tracker):
+    last_click = get_last_clicks([tracker.user_id]).get(tracker.user_id)
+    if last_click and last_click > tracker.last_click:
+        tracker.last_click = last_click
+    discard_click(tracker.user_id)
+
     user = tracker.user
     user.last_login = tracker.last_click
     user.save(update_fields=["last_login"])
@@ -2,6 +2,8 @@ from datetime import timedelta
 
 from django.utils import timezone
 
+from ...conf import settings
+from ..banmatcher import get_bans_matcher
 from ..bans import get_user_ban
 from ..models import BanCache, Online
 
@@ -22,40 +24,85 @@ def make_users_status_aware(request, users, fetch_state=False):
         for online_tracker in Online.objects.filter(user__in=users_dict.keys()):
             users_dict[online_tracker.user_id].online_tracker = online_tracker
 
+    # Update trackers with clicks that weren't written to database yet
+    from .buffer import get_last_clicks  # buffer module depends on this one
+
+    for user_id, last_click in get_last_clicks(users_dict.keys()).items():
+        online_tracker = getattr(users_dict[user_id], "online_tracker", None)
+        if online_tracker and online_tracker.last_click < last_click:
+            online_tracker.last_click = last_click
+
     # Fill user states
     for user in users:
         user.status = get_user_status(request, user)
 
 
+def make_users_status_aware_from_cache(request, users):
+    """
+    Sets status on users without reading their ban caches and online trackers
+
+    Bans are checked using bans matcher kept in memory, and users presence is
+    read from last clicks stored in shared cache. Online trackers are queried
+    only if last clicks are written to database immediately.
+    """
+    from .buffer import get_last_clicks  # buffer module depends on this one
+
+    users_ids = {user.pk for user in users}
+    if settings.MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL:
+        last_clicks = get_last_clicks(users_ids)
+    else:
+        last_clicks = dict(
+            Online.objects.filter(user__in=users_ids).values_list(
+                "user_id", "last_click"
+            )
+        )
+
+    bans_matcher = get_bans_matcher()
+    for user in users:
+        user_ban = bans_matcher.match(username=user.username, email=user.email)
+        user.status = build_user_status(
+            request,
+            user,
+            bool(user_ban),
+            user_ban["expires_on"] if user_ban else None,
+            last_clicks.get(user.pk),
+        )
+
+
 def get_user_status(request, user):
+    user_ban = get_user_ban(user, request.cache_versions)
+
+    try:
+        online_tracker = user.online_tracker
+    except Online.DoesNotExist:
+        online_tracker = None
+
+    return build_user_status(
+        request,
+        user,
+        bool(user_ban),
+        user_ban.expires_on if user_ban else None,
+        online_tracker.last_click if online_tracker else None,
+    )
+
+
+def build_user_status(request, user, is_banned, banned_until, last_click):
     user_status = {
-        "is_banned": False,
+        "is_banned": is_banned,
         "is_hidden": user.is_hiding_presence,
         "is_online_hidden": False,
         "is_offline_hidden": False,
         "is_online": False,
         "is_offline": False,
-        "banned_until": None,
+        "banned_until": banned_until,
         "last_click": user.last_login or user.joined_on,
     }
 
-    user_ban = get_user_ban(user, request.cache_versions)
-    if user_ban:
-        user_status["is_banned"] = True
-        user_status["banned_until"] = user_ban.expires_on
-
-    try:
-        online_tracker = user.online_tracker
-        is_hidden = (
-            user.is_hiding_presence and not request.user_acl["can_see_hidden_users"]
-        )
-
-        if online_tracker and not is_hidden:
-            if online_tracker.last_click >= timezone.now() - ACTIVITY_CUTOFF:
-                user_status["is_online"] = True
-                user_status["last_click"] = online_tracker.last_click
-    except Online.DoesNotExist:
-        pass
+    is_hidden = user.is_hiding_presence and not request.user_acl["can_see_hidden_users"]
+    if last_click and not is_hidden:
+        if last_click >= timezone.now() - ACTIVITY_CUTOFF:
+            user_status["is_online"] = True
+            user_status["last_click"] = last_click
 
     if user_status["is_hidden"]:
         if request.user_acl["can_see_hidden_users"]:
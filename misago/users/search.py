@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import TrigramSimilarity
 from django.core.exceptions import PermissionDenied
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy
@@ -9,6 +10,8 @@ from .serializers import UserCardSerializer
 HEAD_RESULTS = 8
 TAIL_RESULTS = 8
 
+MIN_TRIGRAM_SEARCH_LENGTH = 3
+
 User = get_user_model()
 
 
@@ -36,23 +39,42 @@ class SearchUsers(SearchProvider):
 
 
 def search_users(**filters):
-    queryset = User.objects.order_by("slug").select_related(
-        "rank", "ban_cache", "online_tracker"
-    )
+    queryset = User.objects.select_related("rank", "ban_cache", "online_tracker")
 
     if not filters.get("search_disabled", False):
         queryset = queryset.filter(is_active=True)
 
     username = filters.get("username").lower()
+    return find_users_by_slug(
+        queryset, username, HEAD_RESULTS, HEAD_RESULTS + TAIL_RESULTS
+    )
+
+
+def find_users_by_slug(queryset, slug, head_results, limit):
+    """
+    Returns users which slugs start with searched slug, followed by users which
+    slugs contain it, ranked by their similarity to searched slug.
+
+    Substring matches are found using trigram index on users slugs, which only
+    narrows results down for slugs longer than two characters. Substring matches
+    for shorter slugs are not ranked and stop at the limit.
+    """
+    results = list(
+        queryset.filter(slug__startswith=slug).order_by("slug")[:head_results]
+    )
 
-    results = []
+    tail_results = limit - len(results)
+    if tail_results <= 0:
+        return results
 
-    # lets grab head and tail results:
-    results += list(queryset.filter(slug__startswith=username)[:HEAD_RESULTS])
-    results += list(
-        queryset.filter(slug__contains=username).exclude(
-            pk__in=[r.pk for r in results]
-        )[:TAIL_RESULTS]
+    tail_queryset = queryset.filter(slug__contains=slug).exclude(
+        pk__in=[r.pk for r in results]
     )
+    if len(slug) >= MIN_TRIGRAM_SEARCH_LENGTH:
+        tail_queryset = tail_queryset.annotate(
+            similarity=TrigramSimilarity("slug", slug)
+        ).order_by("-similarity", "slug")
+    else:
+        tail_queryset = tail_queryset.order_by("slug")
 
-    return results
+    return results + list(tail_queryset[:tail_results])
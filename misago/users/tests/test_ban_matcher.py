@@ -0,0 +1,130 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from ..banmatcher import BansMatcher, get_bans_matcher
+from ..management.commands import benchmarkbans
+from ..models import Ban
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def create_ban(ban_id, banned_value, check_type=Ban.USERNAME, **kwargs):
+    ban = {
+        "id": ban_id,
+        "check_type": check_type,
+        "registration_only": False,
+        "banned_value": banned_value,
+        "user_message": None,
+        "staff_message": None,
+        "expires_on": None,
+    }
+    ban.update(kwargs)
+    return ban
+
+
+def match_id(matcher, **values):
+    ban = matcher.match(**values)
+    return ban["id"] if ban else None
+
+
+def test_matcher_matches_exact_value():
+    matcher = BansMatcher([create_ban(1, "bob")])
+    assert match_id(matcher, username="Bob") == 1
+    assert match_id(matcher, username="bobby") is None
+
+
+def test_matcher_matches_value_prefix():
+    matcher = BansMatcher([create_ban(1, "spam*")])
+    assert match_id(matcher, username="spammer") == 1
+    assert match_id(matcher, username="spam") == 1
+    assert match_id(matcher, username="nospam") is None
+
+
+def test_matcher_matches_value_suffix():
+    matcher = BansMatcher([create_ban(1, "*@spam.com", Ban.EMAIL)])
+    assert match_id(matcher, email="bob@spam.com") == 1
+    assert match_id(matcher, email="bob@spam.com.org") is None
+
+
+def test_matcher_matches_value_with_multiple_wildcards():
+    matcher = BansMatcher([create_ban(1, "*bot*"), create_ban(2, "a*b*c")])
+    assert match_id(matcher, username="spambot3") == 1
+    assert match_id(matcher, username="axxbxxc") == 2
+    assert match_id(matcher, username="axxbxx") is None
+
+
+def test_matcher_matches_ip_wildcard_and_network():
+    matcher = BansMatcher(
+        [
+            create_ban(1, "127.0.*", Ban.IP),
+            create_ban(2, "10.0.0.0/8", Ban.IP),
+            create_ban(3, "2001:db8::/32", Ban.IP),
+        ]
+    )
+    assert match_id(matcher, ip="127.0.0.1") == 1
+    assert match_id(matcher, ip="10.20.30.40") == 2
+    assert match_id(matcher, ip="2001:db8::1") == 3
+    assert match_id(matcher, ip="11.0.0.1") is None
+    assert match_id(matcher, ip="2001:db9::1") is None
+
+
+def test_matcher_checks_only_values_of_ban_type():
+    matcher = BansMatcher([create_ban(1, "bob", Ban.EMAIL)])
+    assert match_id(matcher, username="bob") is None
+
+
+def test_matcher_returns_newest_matching_ban():
+    matcher = BansMatcher([create_ban(1, "bob*"), create_ban(2, "bob")])
+    assert match_id(matcher, username="bob") == 2
+
+
+def test_matcher_skips_expired_bans():
+    expired_on = timezone.now() - timedelta(days=1)
+    matcher = BansMatcher(
+        [create_ban(1, "bob*"), create_ban(2, "bob", expires_on=expired_on)]
+    )
+    assert match_id(matcher, username="bob") == 1
+
+
+def test_matcher_skips_registration_only_bans_if_not_registering():
+    matcher = BansMatcher([create_ban(1, "bob", registration_only=True)])
+    assert match_id(matcher, username="bob") is None
+    assert match_id(matcher, username="bob", registration_only=True) == 1
+
+
+def test_matcher_is_reused_until_bans_are_changed(db, django_assert_num_queries):
+    Ban.objects.create(banned_value="bob")
+    get_bans_matcher()
+
+    with django_assert_num_queries(0):
+        assert match_id(get_bans_matcher(), username="bob")
+
+    Ban.objects.create(banned_value="alice")
+    assert match_id(get_bans_matcher(), username="alice")
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_matcher_is_stored_in_shared_cache(db, mocker):
+    Ban.objects.create(banned_value="bob")
+    get_bans_matcher()
+
+    mocker.patch("misago.users.banmatcher._matcher", None)
+    build_bans_matcher = mocker.patch("misago.users.banmatcher.build_bans_matcher")
+    assert match_id(get_bans_matcher(), username="bob")
+    build_bans_matcher.assert_not_called()
+
+
+def test_ban_model_checks_ip_network():
+    ban = Ban(check_type=Ban.IP, banned_value="10.0.0.0/8")
+    assert ban.check_value("10.1.2.3")
+    assert not ban.check_value("11.1.2.3")
+
+
+def test_benchmark_command_compares_matcher_with_linear_scan():
+    stdout = StringIO()
+    call_command(benchmarkbans.Command(), 500, lookups=10, stdout=stdout)
+    assert "Speedup:" in stdout.getvalue()
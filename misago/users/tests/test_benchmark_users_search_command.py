@@ -0,0 +1,25 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from ..management.commands import benchmarkuserssearch
+
+User = get_user_model()
+
+
+def test_management_command_benchmarks_users_search(db):
+    stdout = StringIO()
+    call_command(benchmarkuserssearch.Command(), 20, searches=2, stdout=stdout)
+    assert "Speedup:" in stdout.getvalue()
+
+
+def test_management_command_rolls_benchmark_users_back(db):
+    call_command(benchmarkuserssearch.Command(), 20, searches=2, stdout=StringIO())
+    assert not User.objects.exists()
+
+
+def test_benchmark_users_are_created_with_unique_names(db):
+    benchmarkuserssearch.create_benchmark_users(20)
+    assert User.objects.values("slug").distinct().count() == 21
+    assert User.objects.values("email_hash").distinct().count() == 21
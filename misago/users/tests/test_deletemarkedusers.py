@@ -4,7 +4,10 @@ from django.contrib.auth import get_user_model
 from django.core.management import call_command
 from django.test import TestCase
 
+from ...categories.models import Category
 from ...conf.test import override_dynamic_settings
+from ...threads.models import Thread
+from ...threads.test import post_thread
 from ..management.commands import deletemarkedusers
 from ..models import DeletedUser
 from ..test import create_test_user
@@ -87,3 +90,20 @@ class DeleteMarkedUsersTests(TestCase):
         self.assertEqual(command_output, "Deleted users: 0")
 
         self.user.refresh_from_db()
+
+    def test_delete_with_content(self):
+        """command deletes user content if its requested"""
+        category = Category.objects.get(slug="first-category")
+        thread = post_thread(category, poster=self.user)
+
+        out = StringIO()
+        call_command(deletemarkedusers.Command(), "--with-content", stdout=out)
+        command_output = out.getvalue().splitlines()
+
+        self.assertEqual(
+            command_output[0], "Deleting User content: 1 threads and 1 posts deleted",
+        )
+        self.assertEqual(command_output[-1], "Deleted users: 1")
+
+        with self.assertRaises(Thread.DoesNotExist):
+            thread.refresh_from_db()
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from ..search import find_users_by_slug, search_users
+from ..test import create_test_user
+
+User = get_user_model()
+
+
+def get_slugs(users):
+    return [user.slug for user in users]
+
+
+def test_users_with_slug_prefix_are_returned_before_substring_matches(db):
+    create_test_user("Tombob", "tombob@example.com")
+    create_test_user("Bobtom", "bobtom@example.com")
+    create_test_user("Bob", "bob@example.com")
+
+    results = find_users_by_slug(User.objects.all(), "bob", 5, 10)
+    assert get_slugs(results) == ["bob", "bobtom", "tombob"]
+
+
+def test_substring_matches_are_ranked_by_similarity(db):
+    create_test_user("Aaaaabobaaaa", "a@example.com")
+    create_test_user("Tombob", "tombob@example.com")
+
+    results = find_users_by_slug(User.objects.all(), "bob", 5, 10)
+    assert get_slugs(results) == ["tombob", "aaaaabobaaaa"]
+
+
+def test_results_are_limited(db):
+    for i in range(4):
+        create_test_user("Bob%s" % i, "bob%s@example.com" % i)
+        create_test_user("Tombob%s" % i, "tombob%s@example.com" % i)
+
+    results = find_users_by_slug(User.objects.all(), "bob", 2, 3)
+    assert get_slugs(results) == ["bob0", "bob1", "bob2"]
+
+
+def test_short_slug_substring_matches_are_ordered_by_slug(db):
+    create_test_user("Tombob", "tombob@example.com")
+    create_test_user("Bob", "bob@example.com")
+    create_test_user("Abob", "abob@example.com")
+
+    results = find_users_by_slug(User.objects.all(), "bo", 5, 10)
+    assert get_slugs(results) == ["bob", "abob", "tombob"]
+
+
+def test_short_slug_substring_matches_are_limited(db):
+    create_test_user("Bob", "bob@example.com")
+    create_test_user("Abob", "abob@example.com")
+    create_test_user("Tombob", "tombob@example.com")
+
+    results = find_users_by_slug(User.objects.all(), "b", 5, 2)
+    assert get_slugs(results) == ["bob", "abob"]
+
+
+def test_search_users_excludes_inactive_users(db):
+    create_test_user("Bob", "bob@example.com", is_active=False)
+
+    assert search_users(username="Bob") == []
+    assert get_slugs(search_users(username="Bob", search_disabled=True)) == ["bob"]
+
+
+def test_mention_suggestions_include_substring_matches(db, client):
+    create_test_user("Tombob", "tombob@example.com")
+    create_test_user("Bob", "bob@example.com")
+
+    response = client.get(reverse("misago:api:mention-suggestions") + "?q=bob")
+    assert [u["username"] for u in response.json()] == ["Bob", "Tombob"]
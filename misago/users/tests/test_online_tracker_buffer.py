@@ -0,0 +1,224 @@
+from datetime import timedelta
+from time import monotonic
+from unittest.mock import Mock
+
+import pytest
+from django.db import DatabaseError
+from django.test import override_settings
+from django.utils import timezone
+
+from ..models import Online
+from ..online.buffer import (
+    flush_clicks,
+    flush_clicks_from_timer,
+    flush_clicks_on_exit,
+    get_last_clicks,
+    record_click,
+)
+from ..online.tracker import stop_tracking, update_tracker
+from ..online.utils import make_users_status_aware
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=0)
+def test_click_is_written_to_database_if_buffer_is_disabled(user):
+    last_click = timezone.now() + timedelta(seconds=5)
+    record_click(user.id, last_click)
+
+    assert Online.objects.get(user=user).last_click == last_click
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_click_is_not_written_to_database_before_flush_interval(
+    user, django_assert_num_queries
+):
+    old_last_click = Online.objects.get(user=user).last_click
+
+    with django_assert_num_queries(0):
+        record_click(user.id, timezone.now() + timedelta(seconds=5))
+
+    assert Online.objects.get(user=user).last_click == old_last_click
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_buffered_clicks_are_written_to_database_after_flush_interval(
+    mocker, user, other_user, django_assert_num_queries
+):
+    user_click = timezone.now() + timedelta(seconds=5)
+    record_click(user.id, user_click)
+
+    mocker.patch("misago.users.online.buffer._last_flush", monotonic() - 100)
+
+    other_user_click = timezone.now() + timedelta(seconds=10)
+    with django_assert_num_queries(1):
+        record_click(other_user.id, other_user_click)
+
+    assert Online.objects.get(user=user).last_click == user_click
+    assert Online.objects.get(user=other_user).last_click == other_user_click
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_click_failing_to_flush_is_kept_in_buffer(mocker, user, other_user):
+    timer = mocker.patch("misago.users.online.buffer.Timer")
+    mocker.patch.object(
+        Online.objects, "bulk_update", side_effect=DatabaseError("Database error")
+    )
+
+    user_click = timezone.now() + timedelta(seconds=5)
+    record_click(user.id, user_click)
+
+    mocker.patch("misago.users.online.buffer._last_flush", monotonic() - 100)
+
+    other_user_click = timezone.now() + timedelta(seconds=10)
+    record_click(other_user.id, other_user_click)
+
+    assert get_last_clicks([user.id, other_user.id]) == {
+        user.id: user_click,
+        other_user.id: other_user_click,
+    }
+    timer.return_value.start.assert_called_once()
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_failed_flush_keeps_newer_click_in_buffer(mocker, user):
+    mocker.patch("misago.users.online.buffer.Timer")
+    last_click = timezone.now() + timedelta(seconds=10)
+
+    def click_during_flush(*args, **kwargs):
+        record_click(user.id, last_click)
+        raise DatabaseError("Database error")
+
+    mocker.patch.object(Online.objects, "bulk_update", side_effect=click_during_flush)
+
+    record_click(user.id, timezone.now() + timedelta(seconds=5))
+    with pytest.raises(DatabaseError):
+        flush_clicks()
+
+    assert get_last_clicks([user.id]) == {user.id: last_click}
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_buffered_click_starts_flush_timer_once(mocker, user, other_user):
+    timer = mocker.patch("misago.users.online.buffer.Timer")
+
+    record_click(user.id, timezone.now())
+    record_click(other_user.id, timezone.now())
+
+    timer.assert_called_once_with(60, flush_clicks_from_timer)
+    timer.return_value.start.assert_called_once()
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_flush_timer_writes_buffered_clicks_to_database(mocker, user):
+    mocker.patch("misago.users.online.buffer.Timer")
+    close_all = mocker.patch("misago.users.online.buffer.connections.close_all")
+
+    last_click = timezone.now() + timedelta(seconds=5)
+    record_click(user.id, last_click)
+    flush_clicks_from_timer()
+
+    assert Online.objects.get(user=user).last_click == last_click
+    close_all.assert_called_once()
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_flush_timer_is_started_again_after_flush(mocker, user):
+    timer = mocker.patch("misago.users.online.buffer.Timer")
+    mocker.patch("misago.users.online.buffer.connections.close_all")
+
+    record_click(user.id, timezone.now())
+    flush_clicks_from_timer()
+    record_click(user.id, timezone.now())
+
+    assert timer.call_count == 2
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_buffered_clicks_are_written_to_database_on_exit(mocker, user):
+    mocker.patch("misago.users.online.buffer.Timer")
+
+    last_click = timezone.now() + timedelta(seconds=5)
+    record_click(user.id, last_click)
+    flush_clicks_on_exit()
+
+    assert Online.objects.get(user=user).last_click == last_click
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_user_clicks_are_coalesced_into_single_update(user):
+    first_click = timezone.now() + timedelta(seconds=5)
+    last_click = timezone.now() + timedelta(seconds=10)
+
+    record_click(user.id, first_click)
+    record_click(user.id, last_click)
+
+    assert flush_clicks() == 1
+    assert Online.objects.get(user=user).last_click == last_click
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_flush_does_nothing_for_empty_buffer(db, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert flush_clicks() == 0
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_last_clicks_are_read_from_process_buffer(user, other_user):
+    last_click = timezone.now()
+    record_click(user.id, last_click)
+
+    assert get_last_clicks([user.id, other_user.id]) == {user.id: last_click}
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60, CACHES=LOCMEM_CACHE)
+def test_last_clicks_are_read_from_shared_cache(user):
+    last_click = timezone.now()
+    record_click(user.id, last_click)
+    flush_clicks()
+
+    assert get_last_clicks([user.id]) == {user.id: last_click}
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_users_status_uses_buffered_last_click(user, other_user):
+    tracker = Online.objects.get(user=other_user)
+    tracker.last_click = timezone.now() - timedelta(minutes=10)
+    tracker.save()
+
+    last_click = timezone.now()
+    record_click(other_user.id, last_click)
+
+    request = Mock(
+        user=user,
+        user_acl={"can_see_hidden_users": False},
+        cache_versions={"bans": "abcdefgh"},
+    )
+
+    make_users_status_aware(request, [other_user], fetch_state=True)
+    assert other_user.status["is_online"]
+    assert other_user.status["last_click"] == last_click
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_updating_tracker_buffers_click(user, django_assert_num_queries):
+    tracker = Online.objects.get(user=user)
+    with django_assert_num_queries(0):
+        update_tracker(Mock(), tracker)
+
+    assert get_last_clicks([user.id]) == {user.id: tracker.last_click}
+
+
+@override_settings(MISAGO_ONLINE_TRACKER_FLUSH_INTERVAL=60)
+def test_stopping_tracking_uses_buffered_click_and_discards_it(user):
+    tracker = Online.objects.select_related("user").get(user=user)
+
+    last_click = timezone.now() + timedelta(seconds=5)
+    record_click(user.id, last_click)
+
+    stop_tracking(Mock(), tracker)
+
+    user.refresh_from_db()
+    assert user.last_login == last_click
+    assert get_last_clicks([user.id]) == {}
+    assert not Online.objects.filter(user=user).exists()
@@ -4,6 +4,7 @@ from django.http import Http404
 from ...acl.objectacl import add_acl_to_obj
 from ...core.cursorpagination import get_page
 from ...core.shortcuts import paginate, pagination_dict
+from ...threads.contentcache import add_cached_content_to_posts
 from ...threads.permissions import exclude_invisible_threads
 from ...threads.serializers import FeedSerializer
 from ...threads.utils import add_categories_to_items
@@ -44,6 +45,7 @@ class UserThreads:
 
         add_acl_to_obj(request.user_acl, threads)
         add_acl_to_obj(request.user_acl, posts)
+        add_cached_content_to_posts(posts)
 
         self._user = request.user
 